@@ -7,7 +7,7 @@ from alembic import context
 
 # Import your models here
 from app.core.database import Base
-from app.models import user, team, game, prediction, user_tip, analytics, content, player
+from app.models import user, team, game, prediction, user_tip, analytics, content, player, team_stats, backfill, tip_snapshot
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
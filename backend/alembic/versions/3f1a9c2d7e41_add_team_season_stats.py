@@ -0,0 +1,57 @@
+"""add team season stats
+
+Revision ID: 3f1a9c2d7e41
+Revises: c8d6c58eb895
+Create Date: 2025-08-04 09:12:31.502114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7e41'
+down_revision: Union[str, None] = 'c8d6c58eb895'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('team_season_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('draws', sa.Integer(), nullable=False),
+    sa.Column('points_for', sa.Integer(), nullable=False),
+    sa.Column('points_against', sa.Integer(), nullable=False),
+    sa.Column('home_games', sa.Integer(), nullable=False),
+    sa.Column('home_wins', sa.Integer(), nullable=False),
+    sa.Column('home_points_for', sa.Integer(), nullable=False),
+    sa.Column('home_points_against', sa.Integer(), nullable=False),
+    sa.Column('away_games', sa.Integer(), nullable=False),
+    sa.Column('away_wins', sa.Integer(), nullable=False),
+    sa.Column('away_points_for', sa.Integer(), nullable=False),
+    sa.Column('away_points_against', sa.Integer(), nullable=False),
+    sa.Column('recent_form', sa.String(length=5), nullable=False),
+    sa.Column('last_game_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('team_id', 'season', name='uq_team_season_stats_team_season')
+    )
+    op.create_index(op.f('ix_team_season_stats_id'), 'team_season_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_team_season_stats_season'), 'team_season_stats', ['season'], unique=False)
+    op.create_index(op.f('ix_team_season_stats_team_id'), 'team_season_stats', ['team_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_team_season_stats_team_id'), table_name='team_season_stats')
+    op.drop_index(op.f('ix_team_season_stats_season'), table_name='team_season_stats')
+    op.drop_index(op.f('ix_team_season_stats_id'), table_name='team_season_stats')
+    op.drop_table('team_season_stats')
@@ -0,0 +1,30 @@
+"""unique player game stats
+
+Revision ID: 5d7e2a9c4b18
+Revises: 9b2e4d7a1c05
+Create Date: 2025-08-08 10:41:52.613907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e2a9c4b18'
+down_revision: Union[str, None] = '9b2e4d7a1c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Earlier scrapes could insert the same player twice for a game; keep the first row
+    op.execute(
+        "DELETE FROM player_game_stats WHERE id NOT IN ("
+        "SELECT MIN(id) FROM player_game_stats GROUP BY game_id, player_id)"
+    )
+    op.create_unique_constraint('uq_player_game_stats_game_player', 'player_game_stats', ['game_id', 'player_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_player_game_stats_game_player', 'player_game_stats', type_='unique')
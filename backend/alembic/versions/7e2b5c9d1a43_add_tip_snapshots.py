@@ -0,0 +1,46 @@
+"""add tip snapshots
+
+Revision ID: 7e2b5c9d1a43
+Revises: a4c81f3e6d27
+Create Date: 2025-08-14 09:41:27.512863
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2b5c9d1a43'
+down_revision: Union[str, None] = 'a4c81f3e6d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tip_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('scope_key', sa.String(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=True),
+    sa.Column('round_number', sa.Integer(), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('document', sa.Text(), nullable=False),
+    sa.Column('games_count', sa.Integer(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('scope', 'scope_key', 'version', name='uq_tip_snapshots_scope_key_version')
+    )
+    op.create_index(op.f('ix_tip_snapshots_id'), 'tip_snapshots', ['id'], unique=False)
+    op.create_index(op.f('ix_tip_snapshots_scope'), 'tip_snapshots', ['scope'], unique=False)
+    op.create_index(op.f('ix_tip_snapshots_scope_key'), 'tip_snapshots', ['scope_key'], unique=False)
+    op.create_index(op.f('ix_tip_snapshots_built_at'), 'tip_snapshots', ['built_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tip_snapshots_built_at'), table_name='tip_snapshots')
+    op.drop_index(op.f('ix_tip_snapshots_scope_key'), table_name='tip_snapshots')
+    op.drop_index(op.f('ix_tip_snapshots_scope'), table_name='tip_snapshots')
+    op.drop_index(op.f('ix_tip_snapshots_id'), table_name='tip_snapshots')
+    op.drop_table('tip_snapshots')
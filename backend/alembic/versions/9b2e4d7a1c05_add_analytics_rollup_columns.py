@@ -0,0 +1,73 @@
+"""add analytics rollup columns
+
+Revision ID: 9b2e4d7a1c05
+Revises: 3f1a9c2d7e41
+Create Date: 2025-08-06 14:03:17.228410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e4d7a1c05'
+down_revision: Union[str, None] = '3f1a9c2d7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('analytics', sa.Column('season', sa.Integer(), nullable=True))
+    op.add_column('analytics', sa.Column('high_confidence_total', sa.Integer(), nullable=True))
+    op.add_column('analytics', sa.Column('high_confidence_correct', sa.Integer(), nullable=True))
+    op.add_column('analytics', sa.Column('medium_confidence_total', sa.Integer(), nullable=True))
+    op.add_column('analytics', sa.Column('medium_confidence_correct', sa.Integer(), nullable=True))
+    op.add_column('analytics', sa.Column('low_confidence_total', sa.Integer(), nullable=True))
+    op.add_column('analytics', sa.Column('low_confidence_correct', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_analytics_season'), 'analytics', ['season'], unique=False)
+
+    # Only duplicates of a (period_type, period_start, model_version) key block the
+    # constraint; keep the newest row of each (NULL keys never conflict)
+    op.execute(
+        "DELETE FROM analytics "
+        "WHERE period_type IS NOT NULL AND period_start IS NOT NULL AND model_version IS NOT NULL "
+        "AND id NOT IN (SELECT MAX(id) FROM analytics GROUP BY period_type, period_start, model_version)"
+    )
+
+    analytics = sa.table(
+        'analytics',
+        sa.column('id', sa.Integer),
+        sa.column('period_type', sa.String),
+        sa.column('period_start', sa.DateTime),
+        sa.column('season', sa.Integer),
+        sa.column('updated_at', sa.DateTime)
+    )
+    bind = op.get_bind()
+    season_rows = bind.execute(
+        sa.select(analytics.c.id, analytics.c.period_start)
+        .where(analytics.c.period_type == 'season', analytics.c.period_start.isnot(None))
+    ).all()
+    for row_id, period_start in season_rows:
+        bind.execute(
+            analytics.update().where(analytics.c.id == row_id).values(season=period_start.year)
+        )
+
+    # Kept rows lack the confidence counts; with no rollup watermark the next
+    # refresh_pending rebuilds every bucket from the predictions
+    op.execute(analytics.update().values(updated_at=None))
+
+    op.create_unique_constraint('uq_analytics_period_model', 'analytics', ['period_type', 'period_start', 'model_version'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_analytics_period_model', 'analytics', type_='unique')
+    op.drop_index(op.f('ix_analytics_season'), table_name='analytics')
+    op.drop_column('analytics', 'low_confidence_correct')
+    op.drop_column('analytics', 'low_confidence_total')
+    op.drop_column('analytics', 'medium_confidence_correct')
+    op.drop_column('analytics', 'medium_confidence_total')
+    op.drop_column('analytics', 'high_confidence_correct')
+    op.drop_column('analytics', 'high_confidence_total')
+    op.drop_column('analytics', 'season')
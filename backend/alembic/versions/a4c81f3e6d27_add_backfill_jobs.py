@@ -0,0 +1,69 @@
+"""add backfill jobs
+
+Revision ID: a4c81f3e6d27
+Revises: 5d7e2a9c4b18
+Create Date: 2025-08-11 16:22:08.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c81f3e6d27'
+down_revision: Union[str, None] = '5d7e2a9c4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('backfill_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('start_season', sa.Integer(), nullable=False),
+    sa.Column('end_season', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('units_total', sa.Integer(), nullable=False),
+    sa.Column('units_done', sa.Integer(), nullable=False),
+    sa.Column('units_failed', sa.Integer(), nullable=False),
+    sa.Column('current_season', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('worker_pid', sa.Integer(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_backfill_jobs_id'), 'backfill_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_backfill_jobs_status'), 'backfill_jobs', ['status'], unique=False)
+    op.create_table('backfill_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('unit_key', sa.String(), nullable=False),
+    sa.Column('season', sa.Integer(), nullable=False),
+    sa.Column('round_number', sa.Integer(), nullable=True),
+    sa.Column('game_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['backfill_jobs.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_id', 'unit_key', name='uq_backfill_checkpoints_job_unit')
+    )
+    op.create_index(op.f('ix_backfill_checkpoints_id'), 'backfill_checkpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_backfill_checkpoints_job_id'), 'backfill_checkpoints', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_backfill_checkpoints_job_id'), table_name='backfill_checkpoints')
+    op.drop_index(op.f('ix_backfill_checkpoints_id'), table_name='backfill_checkpoints')
+    op.drop_table('backfill_checkpoints')
+    op.drop_index(op.f('ix_backfill_jobs_status'), table_name='backfill_jobs')
+    op.drop_index(op.f('ix_backfill_jobs_id'), table_name='backfill_jobs')
+    op.drop_table('backfill_jobs')
@@ -0,0 +1,40 @@
+"""add keyset pagination indexes
+
+Revision ID: d3a8f61b2c97
+Revises: 7e2b5c9d1a43
+Create Date: 2025-08-18 11:26:04.913372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8f61b2c97'
+down_revision: Union[str, None] = '7e2b5c9d1a43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows without created_at would sort outside every cursor range; date them from updated_at
+    op.execute("UPDATE users SET created_at = COALESCE(updated_at, '1970-01-01') WHERE created_at IS NULL")
+    op.execute("UPDATE content SET created_at = COALESCE(updated_at, '1970-01-01') WHERE created_at IS NULL")
+    op.execute("UPDATE security_logs SET created_at = '1970-01-01' WHERE created_at IS NULL")
+
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_content_status_created_at_id', 'content', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_content_created_at_id', 'content', ['created_at', 'id'], unique=False)
+    op.create_index('ix_security_logs_created_at_id', 'security_logs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_security_logs_user_created_at_id', 'security_logs', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_security_logs_event_created_at_id', 'security_logs', ['event_type', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_security_logs_event_created_at_id', table_name='security_logs')
+    op.drop_index('ix_security_logs_user_created_at_id', table_name='security_logs')
+    op.drop_index('ix_security_logs_created_at_id', table_name='security_logs')
+    op.drop_index('ix_content_created_at_id', table_name='content')
+    op.drop_index('ix_content_status_created_at_id', table_name='content')
+    op.drop_index('ix_users_created_at_id', table_name='users')
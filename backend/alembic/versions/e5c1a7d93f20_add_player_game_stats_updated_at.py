@@ -0,0 +1,28 @@
+"""add player game stats updated_at
+
+Revision ID: e5c1a7d93f20
+Revises: d3a8f61b2c97
+Create Date: 2025-08-20 10:12:45.301927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c1a7d93f20'
+down_revision: Union[str, None] = 'd3a8f61b2c97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Re-ingesting a game overwrites its rows in place; the columnar store watches this to reload
+    op.add_column('player_game_stats', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE player_game_stats SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column('player_game_stats', 'updated_at')
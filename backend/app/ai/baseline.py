@@ -0,0 +1,290 @@
+import re
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+from app.models.game import Game
+from app.models.team import Team
+from app.models.prediction import Prediction
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 15.0              # Base rating swing per game, scaled by margin of victory
+HOME_ADVANTAGE = 35.0        # Rating points for playing at the home team's own ground
+SEASON_REGRESSION = 0.25     # Fraction pulled back to the mean between seasons
+DEFAULT_MARGIN_PER_POINT = 0.12
+DEFAULT_AVERAGE_SCORE = 85.0
+
+# AFL Tables venue names vs the ground names stored on Team.home_ground
+VENUE_ALIASES = {
+    'mcg': 'mcg',
+    'scg': 'scg',
+    'docklands': 'marvelstadium',
+    'marvelstadium': 'marvelstadium',
+    'etihadstadium': 'marvelstadium',
+    'kardiniapark': 'gmhbastadium',
+    'gmhbastadium': 'gmhbastadium',
+    'perthstadium': 'optusstadium',
+    'optusstadium': 'optusstadium',
+    'carrara': 'metriconstadium',
+    'metriconstadium': 'metriconstadium',
+    'peoplefirststadium': 'metriconstadium',
+    'sydneyshowground': 'giantsstadium',
+    'giantsstadium': 'giantsstadium',
+    'engiestadium': 'giantsstadium',
+    'gabba': 'gabba',
+    'adelaideoval': 'adelaideoval',
+}
+
+
+def normalize_venue(venue: Optional[str]) -> str:
+    """Map a venue name to a canonical key so AFL Tables and team grounds compare equal"""
+    if not venue:
+        return ''
+    key = re.sub(r'[^a-z]', '', venue.lower())
+    return VENUE_ALIASES.get(key, key)
+
+
+class EloPredictor:
+    """Margin-aware Elo model fitted over finished games.
+
+    Ratings are updated one round at a time with NumPy, since no team plays
+    twice in a round; a full season rates in a few milliseconds. Produces
+    the same prediction dict shape as the Gemini path, so it can serve as a
+    fallback or a cheap first pass.
+    """
+
+    model_version = "elo-1.0.0"
+
+    def __init__(self, k_factor: float = K_FACTOR, home_advantage: float = HOME_ADVANTAGE,
+                 season_regression: float = SEASON_REGRESSION):
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.season_regression = season_regression
+
+        self.ratings: Dict[int, float] = {}
+        self.team_names: Dict[int, str] = {}
+        self.home_grounds: Dict[int, str] = {}
+        self.last_season: Optional[int] = None
+        self.margin_per_point = DEFAULT_MARGIN_PER_POINT
+        self.average_score = DEFAULT_AVERAGE_SCORE
+        self.history: Optional[pd.DataFrame] = None
+
+    def fit(self, db: Session, up_to_season: Optional[int] = None) -> "EloPredictor":
+        """Rate every finished game (optionally only up to a season)"""
+        self._load_teams(db)
+        frame = self._load_games(db, up_to_season)
+        self.history = self.rate(frame)
+        return self
+
+    def rate(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Run the rating model over a games frame, returning pre-game ratings and expectations"""
+        frame = frame.sort_values(['season', 'round_number', 'game_date', 'id'], na_position='first')
+        frame = frame.reset_index(drop=True)
+        if frame.empty:
+            self.ratings = {}
+            return frame.assign(home_rating=[], away_rating=[], home_advantage=[], expected_home=[])
+
+        team_ids = np.unique(np.concatenate([frame['home_team_id'].to_numpy(), frame['away_team_id'].to_numpy()]))
+        index = {team_id: i for i, team_id in enumerate(team_ids)}
+        home_idx = frame['home_team_id'].map(index).to_numpy()
+        away_idx = frame['away_team_id'].map(index).to_numpy()
+        margins = (frame['home_score'] - frame['away_score']).to_numpy(dtype=float)
+        advantage = self._home_advantage_vector(frame)
+        seasons = frame['season'].to_numpy()
+
+        keys = frame[['season', 'round_number']].to_numpy()
+        boundaries = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]).any(axis=1)])
+        ends = np.r_[boundaries[1:], len(frame)]
+
+        ratings = np.full(len(team_ids), INITIAL_RATING)
+        home_rating = np.empty(len(frame))
+        away_rating = np.empty(len(frame))
+        expected_home = np.empty(len(frame))
+
+        previous_season = None
+        for start, end in zip(boundaries, ends):
+            if previous_season is not None and seasons[start] != previous_season:
+                ratings = self._regress(ratings)
+            previous_season = seasons[start]
+
+            h = home_idx[start:end]
+            a = away_idx[start:end]
+            rh = ratings[h]
+            ra = ratings[a]
+            expected = self._expected(rh - ra + advantage[start:end])
+
+            margin = margins[start:end]
+            actual = np.where(margin > 0, 1.0, np.where(margin < 0, 0.0, 0.5))
+            delta = self.k_factor * (1.0 + np.log1p(np.abs(margin))) * (actual - expected)
+
+            home_rating[start:end] = rh
+            away_rating[start:end] = ra
+            expected_home[start:end] = expected
+
+            # add.at so a team listed twice in a round (bad data) still gets both updates
+            np.add.at(ratings, h, delta)
+            np.add.at(ratings, a, -delta)
+
+        self.ratings = {int(team_id): float(ratings[i]) for team_id, i in index.items()}
+        self.last_season = int(seasons[-1])
+
+        rated = frame.assign(
+            home_rating=home_rating,
+            away_rating=away_rating,
+            home_advantage=advantage,
+            expected_home=expected_home
+        )
+        self._calibrate(rated)
+        return rated
+
+    def predict_game(self, game: Game) -> Dict:
+        """Predict a single game from current ratings, in the Gemini result format"""
+        home_rating = self._current_rating(game.home_team_id, game.season)
+        away_rating = self._current_rating(game.away_team_id, game.season)
+        advantage = self._venue_advantage(game.venue, game.home_team_id, game.away_team_id)
+
+        diff = home_rating - away_rating + advantage
+        home_probability = float(self._expected(np.array([diff]))[0])
+        margin = diff * self.margin_per_point
+
+        predicted_home_score = int(round(self.average_score + margin / 2))
+        predicted_away_score = int(round(self.average_score - margin / 2))
+        predicted_winner = 'home' if home_probability >= 0.5 else 'away'
+        confidence = max(home_probability, 1 - home_probability)
+
+        home_name = self.team_names.get(game.home_team_id, 'Home')
+        away_name = self.team_names.get(game.away_team_id, 'Away')
+        key_factors = ["Elo rating difference", "Season-to-season rating regression"]
+        key_factors.append("Home ground advantage" if advantage else "Neutral or shared venue")
+
+        return {
+            "predicted_winner": predicted_winner,
+            "predicted_home_score": predicted_home_score,
+            "predicted_away_score": predicted_away_score,
+            "confidence_score": round(confidence, 3),
+            "reasoning": (
+                f"Elo ratings: {home_name} {home_rating:.0f}, {away_name} {away_rating:.0f}"
+                f"{f' (+{advantage:.0f} home ground)' if advantage else ''}. "
+                f"Home win probability {home_probability:.0%}, expected margin {margin:+.0f} points."
+            ),
+            "key_factors": key_factors,
+            "betting_recommendation": predicted_winner if confidence >= 0.65 else "none",
+            "bet_confidence": round(max(0.0, (confidence - 0.5) * 2), 3),
+            "model_version": self.model_version
+        }
+
+    def generate_predictions(self, db: Session, upcoming_games: List[Game]) -> List[Prediction]:
+        """Create Prediction rows for upcoming games (fits first if needed)"""
+        if self.history is None:
+            self.fit(db)
+
+        predictions = []
+        for game in upcoming_games:
+            data = self.predict_game(game)
+            predictions.append(Prediction(
+                game_id=game.id,
+                predicted_winner_id=game.home_team_id if data['predicted_winner'] == 'home' else game.away_team_id,
+                confidence_score=data['confidence_score'],
+                predicted_home_score=data['predicted_home_score'],
+                predicted_away_score=data['predicted_away_score'],
+                reasoning=data['reasoning'],
+                factors_considered=json.dumps(data['key_factors']),
+                recommended_bet=data['betting_recommendation'],
+                bet_confidence=data['bet_confidence'],
+                odds_analysis=json.dumps({}),
+                model_version=self.model_version
+            ))
+        return predictions
+
+    def evaluate(self, season: Optional[int] = None) -> Dict:
+        """Backtest on the fitted history using pre-game ratings (no look-ahead)"""
+        if self.history is None or self.history.empty:
+            return {'games': 0, 'accuracy': 0.0, 'brier_score': 0.0, 'mean_absolute_margin_error': 0.0}
+
+        rated = self.history
+        if season is not None:
+            rated = rated[rated['season'] == season]
+        else:
+            # Skip the first season while ratings are still settling
+            rated = rated[rated['season'] > rated['season'].min()]
+        rated = rated[rated['home_score'] != rated['away_score']]
+        if rated.empty:
+            return {'games': 0, 'accuracy': 0.0, 'brier_score': 0.0, 'mean_absolute_margin_error': 0.0}
+
+        home_won = (rated['home_score'] > rated['away_score']).to_numpy(dtype=float)
+        expected = rated['expected_home'].to_numpy()
+        diff = (rated['home_rating'] - rated['away_rating'] + rated['home_advantage']).to_numpy()
+        margins = (rated['home_score'] - rated['away_score']).to_numpy(dtype=float)
+
+        return {
+            'model_version': self.model_version,
+            'games': int(len(rated)),
+            'accuracy': round(float(((expected >= 0.5) == (home_won == 1.0)).mean()), 4),
+            'brier_score': round(float(((expected - home_won) ** 2).mean()), 4),
+            'mean_absolute_margin_error': round(float(np.abs(diff * self.margin_per_point - margins).mean()), 2)
+        }
+
+    def _load_teams(self, db: Session):
+        teams = db.query(Team.id, Team.name, Team.home_ground).all()
+        self.team_names = {team.id: team.name for team in teams}
+        self.home_grounds = {team.id: normalize_venue(team.home_ground) for team in teams}
+
+    def _load_games(self, db: Session, up_to_season: Optional[int]) -> pd.DataFrame:
+        query = db.query(
+            Game.id, Game.season, Game.round_number, Game.game_date,
+            Game.home_team_id, Game.away_team_id, Game.venue,
+            Game.home_score, Game.away_score
+        ).filter(
+            Game.is_finished == True,
+            Game.home_score.isnot(None),
+            Game.away_score.isnot(None)
+        )
+        if up_to_season is not None:
+            query = query.filter(Game.season <= up_to_season)
+
+        columns = ['id', 'season', 'round_number', 'game_date', 'home_team_id', 'away_team_id',
+                   'venue', 'home_score', 'away_score']
+        frame = pd.DataFrame(query.all(), columns=columns)
+        frame['round_number'] = frame['round_number'].fillna(0)
+        return frame
+
+    def _home_advantage_vector(self, frame: pd.DataFrame) -> np.ndarray:
+        venues = frame['venue'].map(normalize_venue)
+        home_grounds = frame['home_team_id'].map(self.home_grounds).fillna('')
+        away_grounds = frame['away_team_id'].map(self.home_grounds).fillna('')
+        at_home = (venues != '') & (venues == home_grounds) & (venues != away_grounds)
+        return np.where(at_home.to_numpy(), self.home_advantage, 0.0)
+
+    def _venue_advantage(self, venue: Optional[str], home_team_id: int, away_team_id: int) -> float:
+        venue_key = normalize_venue(venue)
+        if venue_key and venue_key == self.home_grounds.get(home_team_id) and venue_key != self.home_grounds.get(away_team_id):
+            return self.home_advantage
+        return 0.0
+
+    def _current_rating(self, team_id: int, season: Optional[int]) -> float:
+        rating = self.ratings.get(team_id, INITIAL_RATING)
+        if season is not None and self.last_season is not None and season > self.last_season:
+            rating = float(self._regress(np.array([rating]))[0])
+        return rating
+
+    def _regress(self, ratings: np.ndarray) -> np.ndarray:
+        return INITIAL_RATING + (1 - self.season_regression) * (ratings - INITIAL_RATING)
+
+    @staticmethod
+    def _expected(diff: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.power(10.0, -diff / 400.0))
+
+    def _calibrate(self, rated: pd.DataFrame):
+        """Fit points-per-rating-point and the average score from the rated history"""
+        self.average_score = float(pd.concat([rated['home_score'], rated['away_score']]).mean())
+
+        settled = rated[rated['season'] > rated['season'].min()]
+        diff = (settled['home_rating'] - settled['away_rating'] + settled['home_advantage']).to_numpy()
+        margins = (settled['home_score'] - settled['away_score']).to_numpy(dtype=float)
+        denominator = float(np.dot(diff, diff))
+        if len(settled) >= 50 and denominator > 0:
+            self.margin_per_point = float(np.dot(diff, margins)) / denominator
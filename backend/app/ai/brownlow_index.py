@@ -0,0 +1,182 @@
+import json
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+# Bump when the shape of the built index changes so old sidecars are rebuilt
+INDEX_VERSION = 1
+SIDECAR_SUFFIX = '.index.pkl'
+
+
+class BrownlowIndex:
+    """Per-season Brownlow vote aggregates keyed by team and player.
+
+    Each ``brownlow_analysis_<season>.json`` is scanned once and reduced to
+    team/player vote totals. The reduced form is persisted as a pickle
+    sidecar next to the JSON and reused until the JSON's mtime or size
+    changes, so process start-up does not re-parse the raw analysis files.
+    """
+
+    def __init__(self, search_dirs: Optional[List[Path]] = None):
+        self.search_dirs = search_dirs or [BACKEND_DIR / "brownlow_web_content", BACKEND_DIR]
+        self._seasons: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+
+    def team_context(self, team_name: str, season: int = 2024) -> Dict:
+        """Return top players and vote leaders for a team in a season"""
+        team = self.season_index(season)['teams'].get(team_name)
+        if not team:
+            return {'top_players': [], 'vote_leaders': [], 'season_performance': {}}
+
+        return {
+            'top_players': list(team['top_players']),
+            'vote_leaders': list(team['vote_leaders']),
+            'season_performance': dict(team['season_performance'])
+        }
+
+    def player_votes(self, player_name: str, season: int = 2024) -> Dict:
+        """Return the vote summary for a player in a season"""
+        return self.season_index(season)['players'].get(player_name, {})
+
+    def season_index(self, season: int) -> Dict:
+        """Get (building or loading if needed) the index for a season"""
+        source = self._find_source(season)
+        if source is None:
+            return _empty_index()
+
+        stat = source.stat()
+        with self._lock:
+            cached = self._seasons.get(season)
+            if cached and cached['source_mtime'] == stat.st_mtime and cached['source_size'] == stat.st_size:
+                return cached['index']
+
+            entry = self._load_sidecar(source, stat)
+            if entry is None:
+                entry = self._build(source, stat)
+                self._write_sidecar(source, entry)
+
+            self._seasons[season] = entry
+            return entry['index']
+
+    def invalidate(self, season: Optional[int] = None):
+        """Drop in-memory indexes so the next lookup re-checks the files"""
+        with self._lock:
+            if season is None:
+                self._seasons.clear()
+            else:
+                self._seasons.pop(season, None)
+
+    def _find_source(self, season: int) -> Optional[Path]:
+        filename = f'brownlow_analysis_{season}.json'
+        for directory in self.search_dirs:
+            path = Path(directory) / filename
+            if path.exists():
+                return path
+        logger.warning(f"Brownlow analysis not found for season {season}")
+        return None
+
+    def _load_sidecar(self, source: Path, stat) -> Optional[Dict]:
+        sidecar = source.with_name(source.name + SIDECAR_SUFFIX)
+        if not sidecar.exists():
+            return None
+
+        try:
+            with open(sidecar, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Brownlow index {sidecar}: {e}")
+            return None
+
+        if (entry.get('version') != INDEX_VERSION
+                or entry.get('source_mtime') != stat.st_mtime
+                or entry.get('source_size') != stat.st_size):
+            return None
+
+        logger.info(f"Loaded Brownlow index: {sidecar.name}")
+        return entry
+
+    def _write_sidecar(self, source: Path, entry: Dict):
+        sidecar = source.with_name(source.name + SIDECAR_SUFFIX)
+        tmp_path = sidecar.with_name(sidecar.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(sidecar)
+        except Exception as e:
+            # A read-only deploy just means we rebuild on each start
+            logger.warning(f"Could not write Brownlow index {sidecar}: {e}")
+
+    def _build(self, source: Path, stat) -> Dict:
+        logger.info(f"Building Brownlow index from {source.name}")
+        try:
+            with open(source, 'r') as f:
+                data = json.load(f)
+            index = build_season_index(data)
+        except Exception as e:
+            logger.error(f"Error building Brownlow index from {source}: {e}")
+            index = _empty_index()
+
+        return {
+            'version': INDEX_VERSION,
+            'source_mtime': stat.st_mtime,
+            'source_size': stat.st_size,
+            'index': index
+        }
+
+
+def build_season_index(data: Dict) -> Dict:
+    """Reduce a Brownlow analysis document to team and player vote totals"""
+    rounds = data.get('analysis', {}).get('rounds', {})
+
+    team_players: Dict[str, Dict[str, int]] = {}
+    team_games: Dict[str, int] = {}
+    players: Dict[str, Dict] = {}
+
+    for games in rounds.values():
+        for game in games:
+            for team_name in (game.get('home_team'), game.get('away_team')):
+                if team_name:
+                    team_games[team_name] = team_games.get(team_name, 0) + 1
+                    team_players.setdefault(team_name, {})
+
+            for vote in game.get('predicted_votes', []):
+                team_name = vote.get('team_name')
+                player_name = vote.get('player_name', '')
+                votes = vote.get('votes', 0)
+                if not team_name:
+                    continue
+
+                player_votes = team_players.setdefault(team_name, {})
+                player_votes[player_name] = player_votes.get(player_name, 0) + votes
+
+                player = players.setdefault(player_name, {'team': team_name, 'votes': 0, 'games_voted': 0})
+                player['votes'] += votes
+                player['games_voted'] += 1
+
+    teams = {}
+    for team_name, player_votes in team_players.items():
+        sorted_players = sorted(player_votes.items(), key=lambda x: x[1], reverse=True)
+        teams[team_name] = {
+            'top_players': sorted_players[:5],
+            'vote_leaders': [p[0] for p in sorted_players[:3]],
+            'season_performance': {
+                'games': team_games.get(team_name, 0),
+                'total_votes': sum(player_votes.values())
+            }
+        }
+
+    return {'teams': teams, 'players': players}
+
+
+def _empty_index() -> Dict:
+    return {'teams': {}, 'players': {}}
+
+
+# Shared across predictor instances
+brownlow_index = BrownlowIndex()
@@ -0,0 +1,100 @@
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCache:
+    """Thread-safe LRU of parsed JSON context files, reloaded when a file's mtime changes"""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def get(self, path: Union[str, Path], loader: Optional[Callable[[Path], Any]] = None) -> Optional[Any]:
+        """Return the parsed contents of a JSON file (or ``loader(path)``), or None if it can't be read"""
+        path = Path(path)
+        key = str(path.resolve())
+
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            logger.warning(f"JSON file not found: {path}")
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['mtime'] == mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['data']
+            self.misses += 1
+            file_lock = self._file_locks.setdefault(key, threading.Lock())
+
+        # Parse outside the main lock; per-file lock stops concurrent duplicate loads
+        with file_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry['mtime'] == mtime:
+                    self._entries.move_to_end(key)
+                    return entry['data']
+
+            try:
+                if loader is not None:
+                    data = loader(path)
+                else:
+                    with open(path, 'r') as f:
+                        data = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading JSON context {path}: {e}")
+                return None
+
+            with self._lock:
+                if key in self._entries:
+                    self.reloads += 1
+                self._entries[key] = {'mtime': mtime, 'data': data}
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self.evictions += 1
+                    logger.debug(f"Evicted JSON context: {evicted}")
+
+            logger.info(f"Loaded JSON context: {path.name}")
+            return data
+
+    def clear(self):
+        """Drop all cached files (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current contents for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+                'files': [Path(key).name for key in self._entries]
+            }
+
+
+# Shared by every AFLPredictor in the process
+context_cache = ContextCache(max_entries=settings.context_cache_max_entries)
@@ -1,26 +1,57 @@
 import google.generativeai as genai
 import json
+import random
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
 import os
 from pathlib import Path
 from app.core.config import settings
+from app.core.response_cache import response_cache
 from app.models.game import Game
 from app.models.team import Team
 from app.models.prediction import Prediction
+from app.ai.team_features import TeamFeatureLoader, RoundFeatures
+from app.ai.brownlow_index import brownlow_index
+from app.ai.context_cache import context_cache
+from app.ai.response_cache import llm_response_cache
+from app.ai.baseline import EloPredictor
+from app.services.analytics_rollup_service import analytics_rollup_service
+from app.services.export_service import export_service, load_ndjson
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _load_finished_games(path: Path) -> Dict:
+    """Completed games of an exported games partition, shaped like the legacy snapshot files"""
+    games = [g for g in load_ndjson(path) if g.get('is_finished') and g.get('home_score') is not None]
+    return {'games': games}
+
 class AFLPredictor:
-    def __init__(self):
-        genai.configure(api_key=settings.gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+    def __init__(self, model=None, max_concurrency: Optional[int] = None,
+                 timeout_seconds: Optional[float] = None, max_retries: Optional[int] = None,
+                 use_cache: bool = True):
+        # Allow a stand-in model (anything with generate_content) for local testing
+        if model is None:
+            genai.configure(api_key=settings.gemini_api_key)
+            model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model = model
+        self.model_name = getattr(model, 'model_name', type(model).__name__)
         self.model_version = "2.0.0"  # Updated version for hybrid approach
         
-        # JSON data paths
+        # Concurrency and resilience settings for Gemini calls
+        self.max_concurrency = max(1, max_concurrency or settings.prediction_max_concurrency)
+        self.timeout_seconds = timeout_seconds or settings.prediction_timeout_seconds
+        self.max_retries = settings.prediction_max_retries if max_retries is None else max_retries
+        self.retry_backoff_seconds = settings.prediction_retry_backoff_seconds
+        
+        # Identical prompts are answered from the shared response cache
+        self.use_cache = use_cache
+        self.response_cache = llm_response_cache
+        
+        # JSON data paths (game snapshots are only used until a games export exists)
         self.data_dir = Path(__file__).parent.parent.parent / "brownlow_web_content"
         self.json_files = {
             'brownlow_2024': 'brownlow_analysis_2024.json',
@@ -32,74 +63,47 @@ class AFLPredictor:
             'games_with_stats': 'afl_2025_games_with_stats_20250725_202121.json'
         }
         
-        # Cache for JSON data
-        self._json_cache = {}
+        # Snapshots may sit in brownlow_web_content/ or the backend root
+        self.search_dirs = [self.data_dir, self.data_dir.parent]
+        
+        # Round-level loader for database team features
+        self.feature_loader = TeamFeatureLoader()
         
     def _load_json_context(self, file_key: str) -> Dict:
-        """Load JSON context data with caching"""
-        if file_key in self._json_cache:
-            return self._json_cache[file_key]
-            
-        try:
-            file_path = self.data_dir / self.json_files.get(file_key)
-            if file_path.exists():
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    self._json_cache[file_key] = data
-                    logger.info(f"Loaded JSON context: {file_key}")
-                    return data
-            else:
-                logger.warning(f"JSON file not found: {file_path}")
-                return {}
-        except Exception as e:
-            logger.error(f"Error loading JSON context {file_key}: {e}")
+        """Load JSON context data through the shared process-wide cache"""
+        filename = self.json_files.get(file_key)
+        if not filename:
             return {}
+        
+        for directory in self.search_dirs:
+            file_path = directory / filename
+            if file_path.exists():
+                return context_cache.get(file_path) or {}
+        
+        logger.warning(f"JSON file not found: {filename}")
+        return {}
+    
+    def _load_games_context(self) -> Dict:
+        """Completed games of the latest exported season that has any, or the legacy snapshot file"""
+        # A new season's fixture is exported before round 1 is played; fall back to the season before
+        partitions = export_service.list_partitions('games')
+        for season in sorted(partitions, reverse=True):
+            games_data = context_cache.get(partitions[season], loader=_load_finished_games)
+            if games_data and games_data['games']:
+                return games_data
+        return self._load_json_context('games_with_stats')
     
     def _get_team_brownlow_context(self, team_name: str, season: int = 2024) -> Dict:
         """Get Brownlow vote context for a team"""
-        brownlow_data = self._load_json_context(f'brownlow_{season}')
-        
-        team_context = {
-            'top_players': [],
-            'vote_leaders': [],
-            'season_performance': {}
-        }
-        
         try:
-            if 'analysis' in brownlow_data and 'rounds' in brownlow_data['analysis']:
-                rounds = brownlow_data['analysis']['rounds']
-                
-                # Collect all games for this team
-                team_games = []
-                for round_key, games in rounds.items():
-                    for game in games:
-                        if game.get('home_team') == team_name or game.get('away_team') == team_name:
-                            team_games.append(game)
-                
-                # Analyze player performance
-                player_votes = {}
-                for game in team_games:
-                    for vote in game.get('predicted_votes', []):
-                        if vote.get('team_name') == team_name:
-                            player_name = vote.get('player_name', '')
-                            votes = vote.get('votes', 0)
-                            if player_name not in player_votes:
-                                player_votes[player_name] = 0
-                            player_votes[player_name] += votes
-                
-                # Get top players
-                sorted_players = sorted(player_votes.items(), key=lambda x: x[1], reverse=True)
-                team_context['top_players'] = sorted_players[:5]
-                team_context['vote_leaders'] = [p[0] for p in sorted_players[:3]]
-                
+            return brownlow_index.team_context(team_name, season)
         except Exception as e:
             logger.error(f"Error processing Brownlow context for {team_name}: {e}")
-            
-        return team_context
+            return {'top_players': [], 'vote_leaders': [], 'season_performance': {}}
     
     def _get_advanced_game_stats(self, home_team: str, away_team: str) -> Dict:
-        """Get advanced statistics from JSON files"""
-        games_data = self._load_json_context('games_with_stats')
+        """Get advanced statistics from the latest games export"""
+        games_data = self._load_games_context()
         
         advanced_stats = {
             'home_team_stats': {},
@@ -186,15 +190,28 @@ class AFLPredictor:
         return stats
     
     def generate_predictions(self, db: Session, upcoming_games: List[Game]) -> List[Prediction]:
-        """Generate predictions for upcoming games"""
-        predictions = []
+        """Generate predictions for upcoming games.
+        
+        Contexts are built serially on the caller's session, then the Gemini
+        calls fan out across a bounded thread pool. Predictions come back in
+        the same order as ``upcoming_games``.
+        """
+        features = self.feature_loader.load(db, upcoming_games)
         
+        prepared = []
         for game in upcoming_games:
             try:
-                prediction = self._predict_single_game(db, game)
-                if prediction:
-                    predictions.append(prediction)
-                    
+                prepared.append((game, self._build_prediction_context(game, features)))
+            except Exception as e:
+                logger.error(f"Error preparing context for game {game.id}: {e}")
+        
+        results = self._call_gemini_batch([context for _, context in prepared])
+        results = self._fill_failures(db, [game for game, _ in prepared], results)
+        
+        predictions = []
+        for (game, _), prediction_result in zip(prepared, results):
+            try:
+                predictions.append(self._create_prediction_object(game, prediction_result))
             except Exception as e:
                 logger.error(f"Error predicting game {game.id}: {e}")
                 
@@ -203,24 +220,12 @@ class AFLPredictor:
     def _predict_single_game(self, db: Session, game: Game) -> Optional[Prediction]:
         """Generate prediction for a single game"""
         try:
-            # Get historical data for both teams
-            home_team_data = self._get_team_historical_data(db, game.home_team_id)
-            away_team_data = self._get_team_historical_data(db, game.away_team_id)
-            
-            # Get head-to-head data
-            h2h_data = self._get_head_to_head_data(db, game.home_team_id, game.away_team_id)
-            
-            # Get recent form data
-            home_recent_form = self._get_recent_form(db, game.home_team_id)
-            away_recent_form = self._get_recent_form(db, game.away_team_id)
-            
-            # Prepare context for AI
-            context = self._prepare_prediction_context(
-                game, home_team_data, away_team_data, h2h_data, home_recent_form, away_recent_form
-            )
+            features = self.feature_loader.load(db, [game])
+            context = self._build_prediction_context(game, features)
             
             # Generate prediction using Gemini
             prediction_result = self._call_gemini_for_prediction(context)
+            prediction_result = self._fill_failures(db, [game], [prediction_result])[0]
             
             # Parse and create prediction object
             prediction = self._create_prediction_object(game, prediction_result)
@@ -231,135 +236,17 @@ class AFLPredictor:
             logger.error(f"Error in single game prediction: {e}")
             return None
     
-    def _get_team_historical_data(self, db: Session, team_id: int) -> Dict:
-        """Get historical performance data for a team"""
-        # Get last 2 seasons of data
-        two_years_ago = datetime.now().year - 2
-        
-        games = db.query(Game).filter(
-            (Game.home_team_id == team_id) | (Game.away_team_id == team_id),
-            Game.season >= two_years_ago,
-            Game.is_finished == True
-        ).all()
-        
-        stats = {
-            'total_games': len(games),
-            'wins': 0,
-            'losses': 0,
-            'draws': 0,
-            'home_games': 0,
-            'away_games': 0,
-            'home_wins': 0,
-            'away_wins': 0,
-            'avg_score_for': 0,
-            'avg_score_against': 0,
-            'recent_games': []
-        }
-        
-        total_score_for = 0
-        total_score_against = 0
-        
-        for game in games:
-            is_home = game.home_team_id == team_id
-            team_score = game.home_score if is_home else game.away_score
-            opponent_score = game.away_score if is_home else game.home_score
-            
-            total_score_for += team_score
-            total_score_against += opponent_score
-            
-            if is_home:
-                stats['home_games'] += 1
-                if team_score > opponent_score:
-                    stats['home_wins'] += 1
-                    stats['wins'] += 1
-                elif team_score < opponent_score:
-                    stats['losses'] += 1
-                else:
-                    stats['draws'] += 1
-            else:
-                stats['away_games'] += 1
-                if team_score > opponent_score:
-                    stats['away_wins'] += 1
-                    stats['wins'] += 1
-                elif team_score < opponent_score:
-                    stats['losses'] += 1
-                else:
-                    stats['draws'] += 1
-            
-            # Add recent games (last 10)
-            if len(stats['recent_games']) < 10:
-                stats['recent_games'].append({
-                    'date': game.game_date,
-                    'opponent': game.away_team.name if is_home else game.home_team.name,
-                    'score_for': team_score,
-                    'score_against': opponent_score,
-                    'result': 'W' if team_score > opponent_score else 'L' if team_score < opponent_score else 'D',
-                    'venue': 'home' if is_home else 'away'
-                })
-        
-        if stats['total_games'] > 0:
-            stats['avg_score_for'] = total_score_for / stats['total_games']
-            stats['avg_score_against'] = total_score_against / stats['total_games']
-        
-        return stats
-    
-    def _get_head_to_head_data(self, db: Session, team1_id: int, team2_id: int) -> Dict:
-        """Get head-to-head statistics between two teams"""
-        games = db.query(Game).filter(
-            Game.is_finished == True,
-            ((Game.home_team_id == team1_id) & (Game.away_team_id == team2_id)) |
-            ((Game.home_team_id == team2_id) & (Game.away_team_id == team1_id))
-        ).order_by(Game.game_date.desc()).limit(10).all()
-        
-        h2h_stats = {
-            'total_games': len(games),
-            'team1_wins': 0,
-            'team2_wins': 0,
-            'draws': 0,
-            'recent_games': []
-        }
-        
-        for game in games:
-            team1_score = game.home_score if game.home_team_id == team1_id else game.away_score
-            team2_score = game.away_score if game.home_team_id == team1_id else game.home_score
-            
-            if team1_score > team2_score:
-                h2h_stats['team1_wins'] += 1
-            elif team2_score > team1_score:
-                h2h_stats['team2_wins'] += 1
-            else:
-                h2h_stats['draws'] += 1
-            
-            h2h_stats['recent_games'].append({
-                'date': game.game_date,
-                'team1_score': team1_score,
-                'team2_score': team2_score,
-                'venue': game.venue
-            })
-        
-        return h2h_stats
-    
-    def _get_recent_form(self, db: Session, team_id: int) -> List[Dict]:
-        """Get recent form for a team (last 5 games)"""
-        recent_games = db.query(Game).filter(
-            (Game.home_team_id == team_id) | (Game.away_team_id == team_id),
-            Game.is_finished == True
-        ).order_by(Game.game_date.desc()).limit(5).all()
-        
-        form = []
-        for game in recent_games:
-            is_home = game.home_team_id == team_id
-            team_score = game.home_score if is_home else game.away_score
-            opponent_score = game.away_score if is_home else game.home_score
-            
-            form.append({
-                'result': 'W' if team_score > opponent_score else 'L' if team_score < opponent_score else 'D',
-                'score_for': team_score,
-                'score_against': opponent_score,
-                'margin': team_score - opponent_score
-            })
-        
-        return form
+    def _build_prediction_context(self, game: Game, features: RoundFeatures) -> str:
+        """Build the AI prompt for a game from preloaded team features"""
+        game_features = features.for_game(game)
+        return self._prepare_prediction_context(
+            game,
+            game_features['home_data'],
+            game_features['away_data'],
+            game_features['h2h_data'],
+            game_features['home_form'],
+            game_features['away_form']
+        )
     
     def _prepare_prediction_context(self, game: Game, home_data: Dict, away_data: Dict, 
                                   h2h_data: Dict, home_form: List, away_form: List) -> str:
@@ -464,38 +351,106 @@ class AFLPredictor:
         
         return context
     
-    def _call_gemini_for_prediction(self, context: str) -> Dict:
-        """Call Google Gemini API for prediction"""
+    def _fill_failures(self, db: Session, games: List[Game], results: List[Optional[Dict]]) -> List[Dict]:
+        """Replace failed Gemini calls with Elo predictions, or a fixed default.
+        
+        The baseline is fitted on the caller's session at most once per call,
+        and only when at least one game actually needs it.
+        """
+        failed = [i for i, result in enumerate(results) if result is None]
+        if not failed:
+            return results
+        
+        # Prefer the statistical baseline over a fixed default
+        baseline = None
         try:
-            response = self.model.generate_content(context)
-            
-            # Extract JSON from response
-            response_text = response.text
-            
-            # Try to find JSON in the response
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != 0:
-                json_str = response_text[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                # Fallback: try to parse the entire response
-                return json.loads(response_text)
-                
+            baseline = EloPredictor().fit(db)
         except Exception as e:
-            logger.error(f"Error calling Gemini API: {e}")
-            # Return default prediction
-            return {
-                "predicted_winner": "home",
-                "predicted_home_score": 100,
-                "predicted_away_score": 90,
-                "confidence_score": 0.5,
-                "reasoning": "Default prediction due to API error",
-                "key_factors": ["Historical data", "Team form", "Venue advantage"],
-                "betting_recommendation": "none",
-                "bet_confidence": 0.3
-            }
+            logger.error(f"Error fitting baseline predictor: {e}")
+        
+        results = list(results)
+        for i in failed:
+            results[i] = self._default_prediction()
+            if baseline is None:
+                continue
+            try:
+                results[i] = baseline.predict_game(games[i])
+                logger.info("Using baseline prediction after Gemini failure")
+            except Exception as e:
+                logger.error(f"Error in baseline prediction for game {games[i].id}: {e}")
+        return results
+    
+    def _call_gemini_batch(self, contexts: List[str]) -> List[Optional[Dict]]:
+        """Run Gemini calls for several contexts with bounded concurrency, preserving order"""
+        if len(contexts) <= 1 or self.max_concurrency == 1:
+            return [self._call_gemini_for_prediction(context) for context in contexts]
+        
+        workers = min(self.max_concurrency, len(contexts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini") as executor:
+            return list(executor.map(self._call_gemini_for_prediction, contexts))
+    
+    def _call_gemini_for_prediction(self, context: str) -> Optional[Dict]:
+        """Call Google Gemini API for prediction, retrying with backoff; None if every attempt fails"""
+        cache_key = None
+        if self.use_cache:
+            cache_key = self.response_cache.make_key(self.model_name, context)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        attempts = self.max_retries + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                prediction_result = self._request_prediction(context)
+                if cache_key:
+                    self.response_cache.set(cache_key, prediction_result, self.model_name)
+                return prediction_result
+            except Exception as e:
+                if attempt >= attempts:
+                    logger.error(f"Error calling Gemini API after {attempt} attempt(s): {e}")
+                    break
+                
+                # Exponential backoff with jitter so parallel retries don't line up
+                delay = self.retry_backoff_seconds * (2 ** (attempt - 1))
+                delay += random.uniform(0, delay / 2)
+                logger.warning(f"Gemini call failed (attempt {attempt}/{attempts}): {e}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+        
+        return None
+    
+    def _default_prediction(self) -> Dict:
+        """Fixed prediction used when neither Gemini nor the baseline produced one"""
+        return {
+            "predicted_winner": "home",
+            "predicted_home_score": 100,
+            "predicted_away_score": 90,
+            "confidence_score": 0.5,
+            "reasoning": "Default prediction due to API error",
+            "key_factors": ["Historical data", "Team form", "Venue advantage"],
+            "betting_recommendation": "none",
+            "bet_confidence": 0.3
+        }
+    
+    def _request_prediction(self, context: str) -> Dict:
+        """Make a single Gemini request and parse the JSON payload; raises on failure"""
+        response = self.model.generate_content(
+            context,
+            request_options={'timeout': self.timeout_seconds}
+        )
+        
+        # Extract JSON from response
+        response_text = response.text
+        
+        # Try to find JSON in the response
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+        
+        if start_idx != -1 and end_idx != 0:
+            json_str = response_text[start_idx:end_idx]
+            return json.loads(json_str)
+        else:
+            # Fallback: try to parse the entire response
+            return json.loads(response_text)
     
     def _create_prediction_object(self, game: Game, prediction_data: Dict) -> Prediction:
         """Create Prediction object from AI response with enhanced fields"""
@@ -531,7 +486,7 @@ class AFLPredictor:
             recommended_bet=prediction_data.get('betting_recommendation', 'none'),
             bet_confidence=prediction_data.get('bet_confidence', 0.0),
             odds_analysis=json.dumps({}),  # Placeholder for odds analysis
-            model_version=self.model_version
+            model_version=prediction_data.get('model_version', self.model_version)
         )
     
     def update_prediction_accuracy(self, db: Session):
@@ -560,5 +515,11 @@ class AFLPredictor:
             else:
                 prediction.is_correct = (prediction.predicted_winner_id == actual_winner_id)
         
+        # Rollup buckets, read before the commit
+        evaluated = [(prediction.prediction_date, prediction.game.season) for prediction in predictions]
         db.commit()
-        logger.info(f"Updated accuracy for {len(predictions)} predictions") 
\ No newline at end of file
+        logger.info(f"Updated accuracy for {len(predictions)} predictions")
+        
+        if predictions:
+            response_cache.invalidate('predictions')
+            analytics_rollup_service.refresh_for_predictions(db, evaluated) 
\ No newline at end of file
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.core.sqlite_store import ClosingConnection, SQLiteFile
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Persistent SQLite cache of parsed LLM responses, keyed by a hash of model, prompt and parameters"""
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 5000,
+                 enabled: bool = True):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._db = SQLiteFile(self.path, schema=(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "cache_key TEXT PRIMARY KEY, "
+            "model_name TEXT, "
+            "response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "last_accessed REAL NOT NULL, "
+            "hit_count INTEGER NOT NULL DEFAULT 0)",
+            "CREATE INDEX IF NOT EXISTS ix_llm_responses_last_accessed ON llm_responses (last_accessed)"
+        ))
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Content address for a request: identical inputs always map to the same key"""
+        payload = json.dumps(
+            {'model': model_name, 'params': params or {}, 'prompt': prompt},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached parsed response, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                response, created_at = row
+                if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE llm_responses SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                    (now, key)
+                )
+                self.hits += 1
+                return json.loads(response)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any, model_name: str = ""):
+        """Store a parsed response and trim the cache to its size cap"""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses "
+                    "(cache_key, model_name, response, created_at, last_accessed, hit_count) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (key, model_name, json.dumps(value, default=str), now, now)
+                )
+                self.writes += 1
+                self._evict(conn)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def clear(self):
+        """Remove every cached response"""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM llm_responses")
+        except Exception as e:
+            logger.warning(f"LLM cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size for monitoring"""
+        entries = 0
+        if self.enabled:
+            try:
+                with self._lock, self._connect() as conn:
+                    entries = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            except Exception as e:
+                logger.warning(f"LLM cache stats failed: {e}")
+
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'writes': self.writes,
+            'errors': self.errors
+        }
+
+    def _connect(self) -> ClosingConnection:
+        return self._db.connect()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired rows, then least-recently-used rows beyond the cap"""
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+        overflow = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM llm_responses WHERE cache_key IN ("
+                "SELECT cache_key FROM llm_responses ORDER BY last_accessed ASC LIMIT ?)",
+                (overflow,)
+            )
+
+
+# Shared by the predictor and content service
+llm_response_cache = LLMResponseCache(
+    path=settings.llm_cache_path,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    max_entries=settings.llm_cache_max_entries,
+    enabled=settings.llm_cache_enabled
+)
@@ -0,0 +1,241 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy.orm import Session, joinedload
+from app.models.game import Game
+from app.services.team_stats_service import team_stats_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seasons that count towards the "historical performance" block of the prompt
+HISTORY_SEASONS = 2
+# How far back to look for head-to-head meetings and recent form
+LOOKBACK_SEASONS = 10
+RECENT_GAMES_LIMIT = 10
+H2H_LIMIT = 10
+FORM_LIMIT = 5
+
+
+class RoundFeatures:
+    """Pre-computed team features for a batch of upcoming games"""
+
+    def __init__(self, historical: Dict[int, Dict], form: Dict[int, List[Dict]],
+                 head_to_head: Dict[Tuple[int, int], Dict]):
+        self.historical = historical
+        self.form = form
+        self.head_to_head = head_to_head
+
+    def for_game(self, game: Game) -> Dict:
+        """Return the feature dicts used to build a single game's prompt"""
+        return {
+            'home_data': self.historical.get(game.home_team_id) or _empty_historical(),
+            'away_data': self.historical.get(game.away_team_id) or _empty_historical(),
+            'h2h_data': self.head_to_head.get((game.home_team_id, game.away_team_id)) or _empty_h2h(),
+            'home_form': self.form.get(game.home_team_id, []),
+            'away_form': self.form.get(game.away_team_id, []),
+        }
+
+
+class TeamFeatureLoader:
+    """Load every finished game for a round's teams once and aggregate in memory"""
+
+    def __init__(self, lookback_seasons: int = LOOKBACK_SEASONS, history_seasons: int = HISTORY_SEASONS):
+        self.lookback_seasons = lookback_seasons
+        self.history_seasons = history_seasons
+
+    def load(self, db: Session, upcoming_games: Iterable[Game]) -> RoundFeatures:
+        """Build features for all upcoming games with a single query"""
+        upcoming_games = list(upcoming_games)
+        team_ids = set()
+        pairings = set()
+        for game in upcoming_games:
+            team_ids.update((game.home_team_id, game.away_team_id))
+            pairings.add((game.home_team_id, game.away_team_id))
+
+        if not team_ids:
+            return RoundFeatures({}, {}, {})
+
+        current_year = datetime.now().year
+        games = db.query(Game).options(
+            joinedload(Game.home_team),
+            joinedload(Game.away_team)
+        ).filter(
+            (Game.home_team_id.in_(team_ids)) | (Game.away_team_id.in_(team_ids)),
+            Game.season >= current_year - self.lookback_seasons,
+            Game.is_finished == True
+        ).order_by(Game.game_date.desc(), Game.id.desc()).all()
+
+        logger.info(f"Loaded {len(games)} finished games for {len(team_ids)} teams")
+
+        # Index games by team (newest first, as returned by the query)
+        games_by_team = defaultdict(list)
+        for game in games:
+            if game.home_team_id in team_ids:
+                games_by_team[game.home_team_id].append(game)
+            if game.away_team_id in team_ids:
+                games_by_team[game.away_team_id].append(game)
+
+        history_start = current_year - self.history_seasons
+        summaries = team_stats_service.get_summaries(db, team_ids, history_start)
+        historical = {}
+        for team_id in team_ids:
+            history_games = [g for g in games_by_team[team_id] if g.season >= history_start]
+            stats = _historical_stats(team_id, history_games)
+            if team_id in summaries:
+                # Prefer the materialized season totals; keep recent games from the loaded rows
+                stats.update(_from_summary(summaries[team_id]))
+            historical[team_id] = stats
+        form = {
+            team_id: _recent_form(team_id, games_by_team[team_id][:FORM_LIMIT])
+            for team_id in team_ids
+        }
+        head_to_head = {}
+        for team1_id, team2_id in pairings:
+            meetings = [
+                g for g in games_by_team[team1_id]
+                if g.home_team_id == team2_id or g.away_team_id == team2_id
+            ][:H2H_LIMIT]
+            head_to_head[(team1_id, team2_id)] = _head_to_head(team1_id, meetings)
+
+        return RoundFeatures(historical, form, head_to_head)
+
+
+def _empty_historical() -> Dict:
+    return {
+        'total_games': 0,
+        'wins': 0,
+        'losses': 0,
+        'draws': 0,
+        'home_games': 0,
+        'away_games': 0,
+        'home_wins': 0,
+        'away_wins': 0,
+        'avg_score_for': 0,
+        'avg_score_against': 0,
+        'recent_games': []
+    }
+
+
+def _from_summary(summary: Dict) -> Dict:
+    """Map summed team_season_stats rows onto the historical stats keys"""
+    return {
+        'total_games': summary['games_played'],
+        'wins': summary['wins'],
+        'losses': summary['losses'],
+        'draws': summary['draws'],
+        'home_games': summary['home_games'],
+        'away_games': summary['away_games'],
+        'home_wins': summary['home_wins'],
+        'away_wins': summary['away_wins'],
+        'avg_score_for': summary['avg_score_for'],
+        'avg_score_against': summary['avg_score_against']
+    }
+
+
+def _empty_h2h() -> Dict:
+    return {
+        'total_games': 0,
+        'team1_wins': 0,
+        'team2_wins': 0,
+        'draws': 0,
+        'recent_games': []
+    }
+
+
+def _result(score_for: int, score_against: int) -> str:
+    return 'W' if score_for > score_against else 'L' if score_for < score_against else 'D'
+
+
+def _historical_stats(team_id: int, games: List[Game]) -> Dict:
+    """Aggregate win/loss and scoring stats for a team"""
+    stats = _empty_historical()
+    stats['total_games'] = len(games)
+
+    total_score_for = 0
+    total_score_against = 0
+
+    for game in games:
+        is_home = game.home_team_id == team_id
+        team_score = (game.home_score if is_home else game.away_score) or 0
+        opponent_score = (game.away_score if is_home else game.home_score) or 0
+        result = _result(team_score, opponent_score)
+
+        total_score_for += team_score
+        total_score_against += opponent_score
+
+        if is_home:
+            stats['home_games'] += 1
+            if result == 'W':
+                stats['home_wins'] += 1
+        else:
+            stats['away_games'] += 1
+            if result == 'W':
+                stats['away_wins'] += 1
+
+        if result == 'W':
+            stats['wins'] += 1
+        elif result == 'L':
+            stats['losses'] += 1
+        else:
+            stats['draws'] += 1
+
+        if len(stats['recent_games']) < RECENT_GAMES_LIMIT:
+            stats['recent_games'].append({
+                'date': game.game_date,
+                'opponent': game.away_team.name if is_home else game.home_team.name,
+                'score_for': team_score,
+                'score_against': opponent_score,
+                'result': result,
+                'venue': 'home' if is_home else 'away'
+            })
+
+    if stats['total_games'] > 0:
+        stats['avg_score_for'] = total_score_for / stats['total_games']
+        stats['avg_score_against'] = total_score_against / stats['total_games']
+
+    return stats
+
+
+def _head_to_head(team1_id: int, games: List[Game]) -> Dict:
+    """Aggregate head-to-head record from team1's perspective"""
+    h2h_stats = _empty_h2h()
+    h2h_stats['total_games'] = len(games)
+
+    for game in games:
+        team1_score = (game.home_score if game.home_team_id == team1_id else game.away_score) or 0
+        team2_score = (game.away_score if game.home_team_id == team1_id else game.home_score) or 0
+
+        if team1_score > team2_score:
+            h2h_stats['team1_wins'] += 1
+        elif team2_score > team1_score:
+            h2h_stats['team2_wins'] += 1
+        else:
+            h2h_stats['draws'] += 1
+
+        h2h_stats['recent_games'].append({
+            'date': game.game_date,
+            'team1_score': team1_score,
+            'team2_score': team2_score,
+            'venue': game.venue
+        })
+
+    return h2h_stats
+
+
+def _recent_form(team_id: int, games: List[Game]) -> List[Dict]:
+    """Summarise the most recent results for a team"""
+    form = []
+    for game in games:
+        is_home = game.home_team_id == team_id
+        team_score = (game.home_score if is_home else game.away_score) or 0
+        opponent_score = (game.away_score if is_home else game.home_score) or 0
+
+        form.append({
+            'result': _result(team_score, opponent_score),
+            'score_for': team_score,
+            'score_against': opponent_score,
+            'margin': team_score - opponent_score
+        })
+
+    return form
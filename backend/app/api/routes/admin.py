@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel, EmailStr
 
 from app.core.database import get_db
+from app.core.pagination import TOTAL_PATTERN, count_rows, keyset_page
+from app.core.principal_cache import Principal, principal_cache
 from app.core.security import get_current_user, require_permission, log_security_event
 from app.models.user import User, UserSession, SecurityLog, ROLE_PERMISSIONS
 
@@ -61,16 +63,22 @@ class SystemStats(BaseModel):
 
 @router.get("/users", response_model=List[UserResponse])
 async def get_users(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     limit: int = Query(100, ge=1, le=1000),
+    total: str = Query("none", pattern=TOTAL_PATTERN, description="Send X-Total-Count: none, approximate or exact"),
     role: Optional[str] = Query(None),
     subscription_tier: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
     search: Optional[str] = Query(None),
-    current_user: User = Depends(require_permission("read_users")),
+    current_user: Principal = Depends(require_permission("read_users")),
     db: Session = Depends(get_db)
 ):
-    """Get all users with filtering and pagination."""
+    """Get all users with filtering and cursor pagination, newest first.
+
+    The body stays a plain list; the next page's cursor is sent in the
+    ``X-Next-Cursor`` header (absent on the last page).
+    """
     
     query = db.query(User)
     
@@ -92,7 +100,16 @@ async def get_users(
         )
     
     # Apply pagination
-    users = query.offset(skip).limit(limit).all()
+    try:
+        users, next_cursor = keyset_page(query, User, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    user_count = count_rows(query, total)
+    if user_count is not None:
+        response.headers["X-Total-Count"] = str(user_count)
     
     log_security_event("admin_users_viewed", current_user.id, {
         "filters": {
@@ -109,7 +126,7 @@ async def get_users(
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    current_user: User = Depends(require_permission("read_users")),
+    current_user: Principal = Depends(require_permission("read_users")),
     db: Session = Depends(get_db)
 ):
     """Get specific user details."""
@@ -128,7 +145,7 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    current_user: User = Depends(require_permission("write_users")),
+    current_user: Principal = Depends(require_permission("write_users")),
     db: Session = Depends(get_db)
 ):
     """Update user information."""
@@ -163,6 +180,7 @@ async def update_user(
             user.downgrade_subscription()
     
     db.commit()
+    principal_cache.invalidate(user.id)
     db.refresh(user)
     
     log_security_event("admin_user_updated", current_user.id, {
@@ -175,7 +193,7 @@ async def update_user(
 @router.post("/users/{user_id}/promote-admin")
 async def promote_to_admin(
     user_id: int,
-    current_user: User = Depends(require_permission("manage_roles")),
+    current_user: Principal = Depends(require_permission("manage_roles")),
     db: Session = Depends(get_db)
 ):
     """Promote user to admin role."""
@@ -189,6 +207,7 @@ async def promote_to_admin(
     
     user.promote_to_admin()
     db.commit()
+    principal_cache.invalidate(user.id)
     
     log_security_event("user_promoted_to_admin", current_user.id, {
         "target_user_id": user_id,
@@ -200,7 +219,7 @@ async def promote_to_admin(
 @router.post("/users/{user_id}/demote-admin")
 async def demote_from_admin(
     user_id: int,
-    current_user: User = Depends(require_permission("manage_roles")),
+    current_user: Principal = Depends(require_permission("manage_roles")),
     db: Session = Depends(get_db)
 ):
     """Demote user from admin role."""
@@ -217,6 +236,7 @@ async def demote_from_admin(
     
     user.demote_from_admin()
     db.commit()
+    principal_cache.invalidate(user.id)
     
     log_security_event("user_demoted_from_admin", current_user.id, {
         "target_user_id": user_id,
@@ -229,7 +249,7 @@ async def demote_from_admin(
 async def upgrade_user_subscription(
     user_id: int,
     subscription: SubscriptionUpdate,
-    current_user: User = Depends(require_permission("manage_subscriptions")),
+    current_user: Principal = Depends(require_permission("manage_subscriptions")),
     db: Session = Depends(get_db)
 ):
     """Upgrade user subscription."""
@@ -247,6 +267,7 @@ async def upgrade_user_subscription(
     
     user.upgrade_subscription(subscription.tier, subscription.duration_days)
     db.commit()
+    principal_cache.invalidate(user.id)
     
     log_security_event("user_subscription_upgraded", current_user.id, {
         "target_user_id": user_id,
@@ -262,7 +283,7 @@ async def upgrade_user_subscription(
 @router.post("/users/{user_id}/downgrade-subscription")
 async def downgrade_user_subscription(
     user_id: int,
-    current_user: User = Depends(require_permission("manage_subscriptions")),
+    current_user: Principal = Depends(require_permission("manage_subscriptions")),
     db: Session = Depends(get_db)
 ):
     """Downgrade user to free subscription."""
@@ -273,6 +294,7 @@ async def downgrade_user_subscription(
     
     user.downgrade_subscription()
     db.commit()
+    principal_cache.invalidate(user.id)
     
     log_security_event("user_subscription_downgraded", current_user.id, {
         "target_user_id": user_id
@@ -283,7 +305,7 @@ async def downgrade_user_subscription(
 @router.post("/users/{user_id}/unlock")
 async def unlock_user_account(
     user_id: int,
-    current_user: User = Depends(require_permission("write_users")),
+    current_user: Principal = Depends(require_permission("write_users")),
     db: Session = Depends(get_db)
 ):
     """Unlock a locked user account."""
@@ -307,7 +329,7 @@ async def unlock_user_account(
 @router.get("/users/{user_id}/sessions")
 async def get_user_sessions(
     user_id: int,
-    current_user: User = Depends(require_permission("read_users")),
+    current_user: Principal = Depends(require_permission("read_users")),
     db: Session = Depends(get_db)
 ):
     """Get user's active sessions."""
@@ -342,7 +364,7 @@ async def get_user_sessions(
 async def terminate_user_session(
     user_id: int,
     session_id: int,
-    current_user: User = Depends(require_permission("write_users")),
+    current_user: Principal = Depends(require_permission("write_users")),
     db: Session = Depends(get_db)
 ):
     """Terminate a specific user session."""
@@ -367,15 +389,16 @@ async def terminate_user_session(
 
 @router.get("/security-logs")
 async def get_security_logs(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     limit: int = Query(100, ge=1, le=1000),
+    total: str = Query("none", pattern=TOTAL_PATTERN, description="Include a total: none, approximate or exact"),
     user_id: Optional[int] = Query(None),
     event_type: Optional[str] = Query(None),
     success: Optional[bool] = Query(None),
-    current_user: User = Depends(require_permission("view_security_logs")),
+    current_user: Principal = Depends(require_permission("view_security_logs")),
     db: Session = Depends(get_db)
 ):
-    """Get security logs with filtering."""
+    """Get security logs with filtering and cursor pagination, newest first."""
     
     query = db.query(SecurityLog)
     
@@ -388,16 +411,20 @@ async def get_security_logs(
     if success is not None:
         query = query.filter(SecurityLog.success == success)
     
-    logs = query.order_by(SecurityLog.created_at.desc()).offset(skip).limit(limit).all()
+    try:
+        logs, next_cursor = keyset_page(query, SecurityLog, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "logs": [log.to_dict() for log in logs],
-        "total": query.count()
+        "next_cursor": next_cursor,
+        "total": count_rows(query, total)
     }
 
 @router.get("/system-stats", response_model=SystemStats)
 async def get_system_stats(
-    current_user: User = Depends(require_permission("read_system")),
+    current_user: Principal = Depends(require_permission("read_system")),
     db: Session = Depends(get_db)
 ):
     """Get system statistics."""
@@ -470,7 +497,7 @@ async def get_system_stats(
 
 @router.get("/roles")
 async def get_available_roles(
-    current_user: User = Depends(require_permission("read_system")),
+    current_user: Principal = Depends(require_permission("read_system")),
     db: Session = Depends(get_db)
 ):
     """Get available roles and their permissions."""
@@ -479,4 +506,27 @@ async def get_available_roles(
         "roles": ROLE_PERMISSIONS,
         "total_roles": len(ROLE_PERMISSIONS),
         "total_permissions": len(set().union(*ROLE_PERMISSIONS.values()))
-    } 
\ No newline at end of file
+    }
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(
+    current_user: Principal = Depends(require_permission("read_system"))
+):
+    """Get hit/miss counters for in-process caches."""
+    from app.ai.context_cache import context_cache
+    from app.core.response_cache import response_cache
+    from app.ai.response_cache import llm_response_cache
+    from app.scrapers.http_cache import http_cache_store
+    from app.scrapers.season_fixture import season_fixture_cache
+    from app.services.team_alias_service import team_alias_index
+    
+    return {
+        "json_context": context_cache.stats(),
+        "llm_responses": llm_response_cache.stats(),
+        "http_pages": http_cache_store.stats(),
+        "season_pages": season_fixture_cache.stats(),
+        "team_aliases": team_alias_index.stats(),
+        "api_responses": response_cache.stats(),
+        "principals": principal_cache.stats()
+    }
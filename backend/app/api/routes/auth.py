@@ -7,7 +7,8 @@ from pydantic import BaseModel, EmailStr, validator
 import re
 
 from app.core.database import get_db
-from app.core.security import security_manager, get_current_user, rate_limit, log_security_event
+from app.core.principal_cache import Principal
+from app.core.security import security_manager, get_current_user, get_current_principal, rate_limit, log_security_event
 from app.models.user import User, UserSession, SecurityLog
 from app.services.email_service import EmailService
 
@@ -347,7 +348,7 @@ async def refresh_token(
 @router.post("/logout")
 async def logout(
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Logout user and invalidate session."""
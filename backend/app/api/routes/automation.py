@@ -3,9 +3,11 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.core.database import get_db
+from app.core.response_cache import response_cache
 from app.scrapers.afltables_upcoming import AFLTablesUpcomingScraper
 from app.scrapers.afltables_results import AFLTablesResultsScraper
 from app.services.scheduler_service import scheduler_service
+from app.services.tip_service import tip_service
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -54,7 +56,8 @@ async def scrape_upcoming_games(
             save_result = scraper.save_upcoming_games_to_db(db, upcoming_data)
             
             if save_result['success']:
-                result['message'] += f". Saved {save_result['saved_count']} new games, updated {save_result['updated_count']} existing games"
+                result['message'] += (f". Saved {save_result['saved_count']} new games, updated {save_result['updated_count']} existing games "
+                                      f"({save_result['unchanged_count']} unchanged)")
                 if save_result['errors']:
                     result['errors'] = save_result['errors']
             else:
@@ -98,7 +101,8 @@ async def scrape_recent_results(
             save_result = scraper.save_results_to_db(db, results_data)
             
             if save_result['success']:
-                result['message'] += f". Updated {save_result['updated_count']} games with results"
+                result['message'] += (f". Saved {save_result['saved_count']} new and updated {save_result['updated_count']} games "
+                                      f"with results ({save_result['unchanged_count']} unchanged)")
                 if save_result['errors']:
                     result['errors'] = save_result['errors']
             else:
@@ -236,7 +240,9 @@ async def run_full_weekly_update(db: Session = Depends(get_db)):
             if results_data['success']:
                 save_result = scraper_results.save_results_to_db(db, results_data)
                 if save_result['success']:
-                    results['steps_completed'].append(f"Updated {save_result['updated_count']} recent results")
+                    results['steps_completed'].append(
+                        f"Saved {save_result['saved_count']} and updated {save_result['updated_count']} recent results"
+                    )
                 else:
                     results['errors'].append(f"Failed to save results: {save_result['error']}")
             else:
@@ -303,6 +309,9 @@ async def run_full_weekly_update(db: Session = Depends(get_db)):
                         predictions_saved += 1
                 
                 db.commit()
+                if predictions_saved:
+                    response_cache.invalidate('predictions')
+                    tip_service.build_snapshots(db)
                 results['steps_completed'].append(f"Generated {predictions_saved} new predictions")
             else:
                 results['steps_completed'].append("No upcoming games found for tip generation")
@@ -5,8 +5,9 @@ from datetime import datetime
 from pydantic import BaseModel
 
 from app.core.database import get_db
+from app.core.pagination import TOTAL_PATTERN, count_rows, keyset_page
+from app.core.principal_cache import Principal
 from app.core.security import get_current_user, require_permission
-from app.models.user import User
 from app.models.content import Content, ContentTemplate
 from app.services.content_service import ContentService
 
@@ -62,16 +63,15 @@ class ContentResponse(BaseModel):
 
 class ContentListResponse(BaseModel):
     content: List[ContentResponse]
-    total: int
-    page: int
     per_page: int
-    total_pages: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
 
 # Content generation endpoints
 @router.post("/generate", response_model=ContentResponse)
 async def generate_content(
     content_data: ContentCreate,
-    current_user: User = Depends(require_permission("write_predictions")),
+    current_user: Principal = Depends(require_permission("write_predictions")),
     db: Session = Depends(get_db)
 ):
     """Generate new content using AI templates."""
@@ -107,7 +107,7 @@ async def generate_content(
 @router.post("/generate/game-analysis/{game_id}", response_model=ContentResponse)
 async def generate_game_analysis(
     game_id: int,
-    current_user: User = Depends(require_permission("write_predictions")),
+    current_user: Principal = Depends(require_permission("write_predictions")),
     db: Session = Depends(get_db)
 ):
     """Generate analysis for a specific game."""
@@ -130,7 +130,7 @@ async def generate_game_analysis(
 async def generate_team_preview(
     team_id: int,
     season: int = Query(2024, description="Season for preview"),
-    current_user: User = Depends(require_permission("write_predictions")),
+    current_user: Principal = Depends(require_permission("write_predictions")),
     db: Session = Depends(get_db)
 ):
     """Generate team preview for a specific season."""
@@ -158,12 +158,13 @@ async def get_content(
     status: Optional[str] = Query("published", description="Filter by status"),
     is_featured: Optional[bool] = Query(None, description="Filter featured content"),
     is_premium: Optional[bool] = Query(None, description="Filter premium content"),
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(require_permission("read_predictions")),
+    total: str = Query("none", pattern=TOTAL_PATTERN, description="Include a total: none, approximate or exact"),
+    current_user: Principal = Depends(require_permission("read_predictions")),
     db: Session = Depends(get_db)
 ):
-    """Get content with filtering and pagination."""
+    """Get content with filtering and cursor pagination, newest first."""
     try:
         # Build query
         query = db.query(Content)
@@ -178,31 +179,28 @@ async def get_content(
         if is_premium is not None:
             query = query.filter(Content.is_premium == is_premium)
         
-        # Get total count
-        total = query.count()
-        
         # Apply pagination
-        offset = (page - 1) * per_page
-        content_list = query.order_by(Content.created_at.desc()).offset(offset).limit(per_page).all()
-        
-        # Calculate pagination info
-        total_pages = (total + per_page - 1) // per_page
+        try:
+            content_list, next_cursor = keyset_page(query, Content, per_page, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         return ContentListResponse(
             content=content_list,
-            total=total,
-            page=page,
             per_page=per_page,
-            total_pages=total_pages
+            next_cursor=next_cursor,
+            total=count_rows(query, total)
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving content: {str(e)}")
 
 @router.get("/featured", response_model=List[ContentResponse])
 async def get_featured_content(
     limit: int = Query(5, ge=1, le=20, description="Number of featured items"),
-    current_user: User = Depends(require_permission("read_predictions")),
+    current_user: Principal = Depends(require_permission("read_predictions")),
     db: Session = Depends(get_db)
 ):
     """Get featured content."""
@@ -216,7 +214,7 @@ async def get_featured_content(
 @router.get("/{content_id}", response_model=ContentResponse)
 async def get_content_by_id(
     content_id: int,
-    current_user: User = Depends(require_permission("read_predictions")),
+    current_user: Principal = Depends(require_permission("read_predictions")),
     db: Session = Depends(get_db)
 ):
     """Get specific content by ID."""
@@ -238,7 +236,7 @@ async def get_content_by_id(
 @router.get("/slug/{slug}", response_model=ContentResponse)
 async def get_content_by_slug(
     slug: str,
-    current_user: User = Depends(require_permission("read_predictions")),
+    current_user: Principal = Depends(require_permission("read_predictions")),
     db: Session = Depends(get_db)
 ):
     """Get content by slug."""
@@ -261,7 +259,7 @@ async def get_content_by_slug(
 async def update_content(
     content_id: int,
     content_update: ContentUpdate,
-    current_user: User = Depends(require_permission("write_predictions")),
+    current_user: Principal = Depends(require_permission("write_predictions")),
     db: Session = Depends(get_db)
 ):
     """Update content."""
@@ -287,7 +285,7 @@ async def update_content(
 @router.post("/{content_id}/publish")
 async def publish_content(
     content_id: int,
-    current_user: User = Depends(require_permission("write_predictions")),
+    current_user: Principal = Depends(require_permission("write_predictions")),
     db: Session = Depends(get_db)
 ):
     """Publish content."""
@@ -311,7 +309,7 @@ async def publish_content(
 @router.post("/{content_id}/archive")
 async def archive_content(
     content_id: int,
-    current_user: User = Depends(require_permission("write_predictions")),
+    current_user: Principal = Depends(require_permission("write_predictions")),
     db: Session = Depends(get_db)
 ):
     """Archive content."""
@@ -336,7 +334,7 @@ async def archive_content(
 @router.delete("/{content_id}")
 async def delete_content(
     content_id: int,
-    current_user: User = Depends(require_permission("write_predictions")),
+    current_user: Principal = Depends(require_permission("write_predictions")),
     db: Session = Depends(get_db)
 ):
     """Delete content (soft delete by archiving)."""
@@ -362,7 +360,7 @@ async def delete_content(
 # Template management endpoints
 @router.get("/templates/", response_model=List[Dict[str, Any]])
 async def get_content_templates(
-    current_user: User = Depends(require_permission("read_predictions")),
+    current_user: Principal = Depends(require_permission("read_predictions")),
     db: Session = Depends(get_db)
 ):
     """Get available content templates."""
@@ -386,7 +384,7 @@ async def get_content_templates(
 @router.get("/templates/{template_id}", response_model=Dict[str, Any])
 async def get_content_template(
     template_id: int,
-    current_user: User = Depends(require_permission("read_predictions")),
+    current_user: Principal = Depends(require_permission("read_predictions")),
     db: Session = Depends(get_db)
 ):
     """Get specific content template."""
@@ -417,7 +415,7 @@ async def get_content_template(
 async def get_content_analytics(
     content_id: int,
     period: str = Query("daily", description="Analytics period"),
-    current_user: User = Depends(require_permission("read_analytics")),
+    current_user: Principal = Depends(require_permission("read_analytics")),
     db: Session = Depends(get_db)
 ):
     """Get content analytics."""
@@ -4,7 +4,7 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 from app.core.database import get_db
 from app.models.game import Game
-from app.models.team import Team
+from app.services.response_queries import game_rows
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -38,46 +38,23 @@ async def get_games(
     db: Session = Depends(get_db)
 ):
     """Get games with optional filtering"""
-    query = db.query(Game).join(Team, Game.home_team_id == Team.id).join(
-        Team, Game.away_team_id == Team.id
-    )
+    query = game_rows()
     
     if season:
-        query = query.filter(Game.season == season)
+        query = query.where(Game.season == season)
     
     if round_number:
-        query = query.filter(Game.round_number == round_number)
+        query = query.where(Game.round_number == round_number)
     
     if upcoming:
-        query = query.filter(
+        query = query.where(
             Game.is_finished == False,
             Game.game_date > datetime.now()
         )
     
-    games = query.order_by(Game.game_date.desc()).limit(limit).all()
+    rows = db.execute(query.order_by(Game.game_date.desc()).limit(limit)).mappings().all()
     
-    # Convert to response format
-    response_games = []
-    for game in games:
-        response_games.append(GameResponse(
-            id=game.id,
-            season=game.season,
-            round_number=game.round_number,
-            game_number=game.game_number,
-            home_team_name=game.home_team.name,
-            away_team_name=game.away_team.name,
-            venue=game.venue,
-            game_date=game.game_date,
-            is_finished=game.is_finished,
-            home_score=game.home_score,
-            away_score=game.away_score,
-            home_goals=game.home_goals,
-            away_goals=game.away_goals,
-            home_behinds=game.home_behinds,
-            away_behinds=game.away_behinds
-        ))
-    
-    return response_games
+    return [GameResponse(**row) for row in rows]
 
 @router.get("/upcoming", response_model=List[GameResponse])
 async def get_upcoming_games(
@@ -87,56 +64,20 @@ async def get_upcoming_games(
     """Get upcoming games in the next N days"""
     future_date = datetime.now() + timedelta(days=days)
     
-    games = db.query(Game).filter(
+    rows = db.execute(game_rows().where(
         Game.is_finished == False,
         Game.game_date > datetime.now(),
         Game.game_date <= future_date
-    ).order_by(Game.game_date.asc()).all()
-    
-    response_games = []
-    for game in games:
-        response_games.append(GameResponse(
-            id=game.id,
-            season=game.season,
-            round_number=game.round_number,
-            game_number=game.game_number,
-            home_team_name=game.home_team.name,
-            away_team_name=game.away_team.name,
-            venue=game.venue,
-            game_date=game.game_date,
-            is_finished=game.is_finished,
-            home_score=game.home_score,
-            away_score=game.away_score,
-            home_goals=game.home_goals,
-            away_goals=game.away_goals,
-            home_behinds=game.home_behinds,
-            away_behinds=game.away_behinds
-        ))
+    ).order_by(Game.game_date.asc())).mappings().all()
     
-    return response_games
+    return [GameResponse(**row) for row in rows]
 
 @router.get("/{game_id}", response_model=GameResponse)
 async def get_game(game_id: int, db: Session = Depends(get_db)):
     """Get a specific game by ID"""
-    game = db.query(Game).filter(Game.id == game_id).first()
+    row = db.execute(game_rows().where(Game.id == game_id)).mappings().first()
     
-    if not game:
+    if not row:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    return GameResponse(
-        id=game.id,
-        season=game.season,
-        round_number=game.round_number,
-        game_number=game.game_number,
-        home_team_name=game.home_team.name,
-        away_team_name=game.away_team.name,
-        venue=game.venue,
-        game_date=game.game_date,
-        is_finished=game.is_finished,
-        home_score=game.home_score,
-        away_score=game.away_score,
-        home_goals=game.home_goals,
-        away_goals=game.away_goals,
-        home_behinds=game.home_behinds,
-        away_behinds=game.away_behinds
-    ) 
\ No newline at end of file
+    return GameResponse(**row)
@@ -3,10 +3,14 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.core.database import get_db
+from app.core.response_cache import response_cache
 from app.models.prediction import Prediction
 from app.models.game import Game
 from app.models.team import Team
 from app.ai.predictor import AFLPredictor
+from app.ai.baseline import EloPredictor
+from app.services.response_queries import prediction_rows, prediction_fields
+from app.services.tip_service import tip_service
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -48,37 +52,17 @@ async def get_predictions(
     db: Session = Depends(get_db)
 ):
     """Get AI predictions with optional filtering"""
-    query = db.query(Prediction).join(Game)
+    query = prediction_rows()
     
     if game_id:
-        query = query.filter(Prediction.game_id == game_id)
+        query = query.where(Prediction.game_id == game_id)
     
     if season:
-        query = query.filter(Game.season == season)
+        query = query.where(Game.season == season)
     
-    predictions = query.order_by(Prediction.prediction_date.desc()).limit(limit).all()
+    rows = db.execute(query.order_by(Prediction.prediction_date.desc()).limit(limit)).mappings().all()
     
-    response_predictions = []
-    for pred in predictions:
-        response_predictions.append(PredictionResponse(
-            id=pred.id,
-            game_id=pred.game_id,
-            home_team_name=pred.game.home_team.name,
-            away_team_name=pred.game.away_team.name,
-            predicted_winner_name=pred.predicted_winner.name,
-            confidence_score=pred.confidence_score,
-            predicted_home_score=pred.predicted_home_score,
-            predicted_away_score=pred.predicted_away_score,
-            reasoning=pred.reasoning,
-            factors_considered=pred.factors_considered.split(',') if pred.factors_considered else [],
-            recommended_bet=pred.recommended_bet,
-            bet_confidence=pred.bet_confidence,
-            model_version=pred.model_version,
-            prediction_date=pred.prediction_date,
-            is_correct=pred.is_correct
-        ))
-    
-    return response_predictions
+    return [PredictionResponse(**prediction_fields(row)) for row in rows]
 
 @router.get("/upcoming", response_model=List[PredictionResponse])
 async def get_upcoming_predictions(
@@ -88,37 +72,19 @@ async def get_upcoming_predictions(
     """Get predictions for upcoming games"""
     future_date = datetime.now() + timedelta(days=days)
     
-    predictions = db.query(Prediction).join(Game).filter(
+    rows = db.execute(prediction_rows().where(
         Game.is_finished == False,
         Game.game_date > datetime.now(),
         Game.game_date <= future_date
-    ).order_by(Game.game_date.asc()).all()
-    
-    response_predictions = []
-    for pred in predictions:
-        response_predictions.append(PredictionResponse(
-            id=pred.id,
-            game_id=pred.game_id,
-            home_team_name=pred.game.home_team.name,
-            away_team_name=pred.game.away_team.name,
-            predicted_winner_name=pred.predicted_winner.name,
-            confidence_score=pred.confidence_score,
-            predicted_home_score=pred.predicted_home_score,
-            predicted_away_score=pred.predicted_away_score,
-            reasoning=pred.reasoning,
-            factors_considered=pred.factors_considered.split(',') if pred.factors_considered else [],
-            recommended_bet=pred.recommended_bet,
-            bet_confidence=pred.bet_confidence,
-            model_version=pred.model_version,
-            prediction_date=pred.prediction_date,
-            is_correct=pred.is_correct
-        ))
+    ).order_by(Game.game_date.asc())).mappings().all()
     
-    return response_predictions
+    return [PredictionResponse(**prediction_fields(row)) for row in rows]
 
 @router.post("/generate")
 async def generate_predictions(
     days: int = Query(7, description="Generate predictions for next N days"),
+    use_cache: bool = Query(True, description="Reuse cached AI responses for identical prompts"),
+    engine: str = Query("ai", pattern="^(ai|elo)$", description="Prediction engine: ai (Gemini) or elo (local baseline)"),
     db: Session = Depends(get_db)
 ):
     """Generate new AI predictions for upcoming games"""
@@ -135,7 +101,10 @@ async def generate_predictions(
             return {"message": "No upcoming games found", "predictions_generated": 0}
         
         # Initialize predictor
-        predictor = AFLPredictor()
+        if engine == "elo":
+            predictor = EloPredictor()
+        else:
+            predictor = AFLPredictor(use_cache=use_cache)
         
         # Generate predictions
         predictions = predictor.generate_predictions(db, upcoming_games)
@@ -145,6 +114,9 @@ async def generate_predictions(
             db.add(prediction)
         
         db.commit()
+        if predictions:
+            response_cache.invalidate('predictions')
+            tip_service.build_snapshots(db)
         
         return {
             "message": f"Generated {len(predictions)} predictions",
@@ -171,25 +143,9 @@ async def update_prediction_accuracy(db: Session = Depends(get_db)):
 @router.get("/{prediction_id}", response_model=PredictionResponse)
 async def get_prediction(prediction_id: int, db: Session = Depends(get_db)):
     """Get a specific prediction by ID"""
-    prediction = db.query(Prediction).filter(Prediction.id == prediction_id).first()
+    row = db.execute(prediction_rows().where(Prediction.id == prediction_id)).mappings().first()
     
-    if not prediction:
+    if not row:
         raise HTTPException(status_code=404, detail="Prediction not found")
     
-    return PredictionResponse(
-        id=prediction.id,
-        game_id=prediction.game_id,
-        home_team_name=prediction.game.home_team.name,
-        away_team_name=prediction.game.away_team.name,
-        predicted_winner_name=prediction.predicted_winner.name,
-        confidence_score=prediction.confidence_score,
-        predicted_home_score=prediction.predicted_home_score,
-        predicted_away_score=prediction.predicted_away_score,
-        reasoning=prediction.reasoning,
-        factors_considered=prediction.factors_considered.split(',') if prediction.factors_considered else [],
-        recommended_bet=prediction.recommended_bet,
-        bet_confidence=prediction.bet_confidence,
-        model_version=prediction.model_version,
-        prediction_date=prediction.prediction_date,
-        is_correct=prediction.is_correct
-    ) 
\ No newline at end of file
+    return PredictionResponse(**prediction_fields(row))
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
+from app.core.config import settings
 from app.core.database import get_db
 from app.scrapers.afl_scraper import AFLScraper
+from app.services.backfill_service import backfill_service
 from app.models.game import Game
 from app.models.team import Team
 from pydantic import BaseModel
@@ -22,49 +24,58 @@ class ScrapingResponse(BaseModel):
 
 @router.post("/historical-data")
 async def scrape_historical_data(
-    background_tasks: BackgroundTasks,
     start_season: int = Query(2020, description="Starting season to scrape"),
     end_season: int = Query(2024, description="Ending season to scrape"),
     db: Session = Depends(get_db)
 ):
-    """Scrape historical AFL data from afltables.com.au"""
+    """Queue a resumable backfill of historical AFL data from afltables.com.
+
+    The scrape runs in a worker process; poll ``/backfill/{job_id}`` for progress.
+    """
+    if end_season < start_season:
+        raise HTTPException(status_code=400, detail="end_season must not be before start_season")
+    
     try:
-        scraper = AFLScraper()
-        total_games = 0
-        total_teams = 0
-        start_time = datetime.now()
-        
-        for season in range(start_season, end_season + 1):
-            logger.info(f"Scraping season {season}")
-            
-            # Scrape season data
-            games_data = scraper.get_season_data(season)
-            
-            if games_data:
-                # Save to database
-                scraper.save_games_to_db(db, games_data)
-                total_games += len(games_data)
-                
-                # Count unique teams
-                unique_teams = set()
-                for game in games_data:
-                    unique_teams.add(game['home_team'])
-                    unique_teams.add(game['away_team'])
-                total_teams = len(unique_teams)
-        
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        return ScrapingResponse(
-            message=f"Successfully scraped {total_games} games from {start_season} to {end_season}",
-            games_scraped=total_games,
-            teams_created=total_teams,
-            season=f"{start_season}-{end_season}",
-            duration_seconds=duration
-        )
+        job = backfill_service.create_job(db, start_season, end_season)
+        if settings.backfill_spawn_worker:
+            backfill_service.start_worker(job.id)
+        return backfill_service.get_progress(db, job.id)
         
     except Exception as e:
-        logger.error(f"Error scraping historical data: {e}")
-        raise HTTPException(status_code=500, detail=f"Error scraping data: {str(e)}")
+        logger.error(f"Error queueing historical backfill: {e}")
+        raise HTTPException(status_code=500, detail=f"Error queueing backfill: {str(e)}")
+
+@router.get("/backfill")
+async def list_backfill_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Recent backfill jobs, newest first"""
+    return {"jobs": backfill_service.list_jobs(db, limit)}
+
+@router.get("/backfill/{job_id}")
+async def get_backfill_progress(job_id: int, db: Session = Depends(get_db)):
+    """Progress of a backfill job, including units that failed"""
+    progress = backfill_service.get_progress(db, job_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Backfill job not found")
+    return progress
+
+@router.post("/backfill/{job_id}/resume")
+async def resume_backfill(job_id: int, db: Session = Depends(get_db)):
+    """Resume a failed, cancelled or stalled backfill from its last checkpoint"""
+    result = backfill_service.resume_job(db, job_id)
+    if not result['success']:
+        raise HTTPException(status_code=409, detail=result['error'])
+    return result['job']
+
+@router.post("/backfill/{job_id}/cancel")
+async def cancel_backfill(job_id: int, db: Session = Depends(get_db)):
+    """Stop a backfill after its current batch; it can be resumed later"""
+    result = backfill_service.cancel_job(db, job_id)
+    if not result['success']:
+        raise HTTPException(status_code=409, detail=result['error'])
+    return result['job']
 
 @router.post("/season")
 async def scrape_season(
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, timedelta
 from app.core.database import get_db
-from app.services.tip_service import TipService
+from app.services.tip_service import tip_service
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -29,6 +28,7 @@ class WeeklyTipsResponse(BaseModel):
     total_games: int
     week_range: dict
     message: Optional[str] = None
+    snapshot: Optional[dict] = None
 
 class AccuracyStatsResponse(BaseModel):
     success: bool
@@ -42,7 +42,6 @@ async def get_weekly_tips(
 ):
     """Get AI-generated tips for upcoming games in the next week(s)"""
     try:
-        tip_service = TipService()
         result = tip_service.get_weekly_tips(db, weeks_ahead=weeks_ahead)
         
         if result['success']:
@@ -63,7 +62,6 @@ async def get_round_tips(
 ):
     """Get AI-generated tips for a specific round"""
     try:
-        tip_service = TipService()
         result = tip_service.get_round_tips(db, round_number=round_number, season=season)
         
         if result['success']:
@@ -80,7 +78,6 @@ async def get_round_tips(
 async def generate_tips_for_upcoming_games(db: Session = Depends(get_db)):
     """Generate new AI tips for upcoming games that don't have predictions yet"""
     try:
-        tip_service = TipService()
         result = tip_service.generate_tips_for_upcoming_games(db)
         
         if result['success']:
@@ -100,7 +97,6 @@ async def get_prediction_accuracy(
 ):
     """Get accuracy statistics for recent predictions"""
     try:
-        tip_service = TipService()
         result = tip_service.get_prediction_accuracy_stats(db, days_back=days_back)
         
         if result['success']:
@@ -127,7 +123,6 @@ async def get_current_round_tips(db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Could not determine current round")
         
         # Get tips for current round
-        tip_service = TipService()
         result = tip_service.get_round_tips(db, round_number=current_round)
         
         if result['success']:
@@ -147,8 +142,6 @@ async def get_featured_tips(
 ):
     """Get featured tips for the homepage - highest confidence upcoming games"""
     try:
-        tip_service = TipService()
-        
         # Get weekly tips
         result = tip_service.get_weekly_tips(db, weeks_ahead=1)
         
@@ -186,49 +179,15 @@ async def get_upcoming_tips(
 ):
     """Get tips for games in the next specified days"""
     try:
-        # Calculate date range
-        start_date = datetime.now()
-        end_date = start_date + timedelta(days=days_ahead)
-        
-        from app.models.game import Game
-        from app.models.prediction import Prediction
-        
-        # Get upcoming games in date range
-        upcoming_games = db.query(Game).filter(
-            Game.is_finished == False,
-            Game.game_date > start_date,
-            Game.game_date <= end_date
-        ).order_by(Game.game_date).all()
+        result = tip_service.get_upcoming_tips(db, days_ahead=days_ahead)
         
-        if not upcoming_games:
-            return {
-                'success': True,
-                'tips': [],
-                'message': f'No upcoming games found in the next {days_ahead} days',
-                'date_range': {
-                    'start': start_date.strftime('%Y-%m-%d'),
-                    'end': end_date.strftime('%Y-%m-%d')
-                }
-            }
-        
-        # Format tips
-        tip_service = TipService()
-        formatted_tips = []
-        for game in upcoming_games:
-            tip = tip_service._format_game_tip(db, game)
-            if tip:
-                formatted_tips.append(tip)
-        
-        return {
-            'success': True,
-            'tips': formatted_tips,
-            'total_games': len(formatted_tips),
-            'date_range': {
-                'start': start_date.strftime('%Y-%m-%d'),
-                'end': end_date.strftime('%Y-%m-%d')
-            }
-        }
+        if result['success']:
+            return result
+        else:
+            raise HTTPException(status_code=500, detail=result['error'])
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting upcoming tips: {str(e)}")
 
@@ -248,7 +207,6 @@ async def get_game_tip(
             raise HTTPException(status_code=404, detail="Game not found")
         
         # Format the tip
-        tip_service = TipService()
         tip = tip_service._format_game_tip(db, game)
         
         if not tip:
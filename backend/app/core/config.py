@@ -29,7 +29,20 @@ class Settings(BaseSettings):
     
     # External APIs
     GEMINI_API_KEY: str = Field(default="", env="GEMINI_API_KEY")
-    
+
+    # AI prediction settings
+    prediction_max_concurrency: int = 4       # Parallel Gemini calls per round
+    prediction_timeout_seconds: float = 60.0  # Per-call request timeout
+    prediction_max_retries: int = 2           # Retries after the first failed call
+    prediction_retry_backoff_seconds: float = 1.0
+    context_cache_max_entries: int = 16       # Parsed JSON context files kept in memory
+    
+    # LLM response cache (local SQLite file)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "/tmp/footybets_llm_cache.sqlite3"
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_entries: int = 5000
+
     # Google Cloud settings (Australian region)
     GOOGLE_CLOUD_PROJECT: str = "footybets-ai"
     GOOGLE_CLOUD_REGION: str = "australia-southeast1"
@@ -98,6 +111,36 @@ class Settings(BaseSettings):
     # Scraping settings
     scraping_delay: int = 1
     user_agent: str = "Mozilla/5.0 (compatible; FootyBets/1.0)"
+    scraper_max_in_flight: int = 4            # Concurrent requests to afltables
+    scraper_requests_per_second: float = 2.0  # Global politeness limit (token bucket)
+    scraper_max_retries: int = 3
+    scraper_retry_backoff_seconds: float = 0.5
+    scraper_timeout_seconds: float = 30.0
+    scraper_parse_workers: int = 2
+    scraper_cache_enabled: bool = True
+    scraper_cache_dir: str = "/tmp/footybets_http_cache"
+    scraper_cache_mode: str = "default"       # "default", "replay" (offline) or "refresh"
+    scraper_cache_max_age_seconds: int = 300  # Skip revalidation of mutable pages fetched this recently
+    season_fixture_ttl_seconds: int = 600     # Parsed seas/{year}.html shared by fixture and results scrapers
+    scraper_parser_backend: str = "lxml"      # "lxml" (fast path) or "soup" (BeautifulSoup html.parser)
+    ingest_batch_games: int = 18              # Game stats pages written (and committed) per bulk upsert
+    backfill_stale_seconds: int = 300         # A running backfill without a heartbeat this long can be resumed
+    backfill_spawn_worker: bool = True        # Start backfill workers from the app (off: run_backfill.py --worker)
+    export_dir: str = "/tmp/footybets_exports"  # Season-partitioned NDJSON/Parquet snapshots of games and player stats
+    export_chunk_size: int = 2000             # Rows fetched per server-side cursor chunk when exporting
+    player_stats_refresh_seconds: int = 60    # Columnar season stats are re-checked for new rows this often
+    analytics_refresh_overlap_seconds: int = 900  # Pending rollup refresh re-scans this far behind its watermark
+    
+    # Public read endpoint response cache (ETag/304, invalidated by ingestion and prediction jobs)
+    response_cache_enabled: bool = True
+    response_cache_ttl_seconds: int = 300      # Backstop for changes made by other processes
+    response_cache_max_entries: int = 512
+    response_cache_max_age_seconds: int = 60   # Cache-Control max-age for browsers and the CDN
+    tip_snapshot_weeks: int = 2                # Upcoming weeks materialized into tip snapshots when predictions change
+    
+    # Authenticated principals (is_active, roles, permissions) cached by user id
+    principal_cache_ttl_seconds: int = 60      # Backstop for changes made by other instances
+    principal_cache_max_entries: int = 10000
     
     # Redis (for rate limiting and caching)
     redis_url: Optional[str] = None
@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+import logging
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query
+
+logger = logging.getLogger(__name__)
+
+# ``total`` query parameter values: skip counting, planner estimate, or count(*)
+TOTAL_MODES = ('none', 'approximate', 'exact')
+TOTAL_PATTERN = "^(none|approximate|exact)$"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the position just after a row in (created_at, id) order"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; raises ValueError for anything it did not produce"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query: Query, model, limit: int, cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """One page of ``query`` newest first, continuing after ``cursor``.
+
+    Rows are ordered by (created_at, id) descending and the cursor becomes
+    a row-value comparison on the same pair, so with a matching composite
+    index every page is an index range scan of ``limit`` rows however deep
+    it is. Returns the rows and the cursor of the next page (None on the
+    last one).
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+
+    # One extra row tells whether another page exists without counting
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def count_rows(query: Query, mode: str) -> Optional[int]:
+    """Row count of a filtered query: None, the planner's estimate, or an exact count(*).
+
+    The estimate comes from PostgreSQL's EXPLAIN and costs no table scan;
+    other databases fall back to an exact count.
+    """
+    if mode == 'none':
+        return None
+
+    session = query.session
+    statement = query.order_by(None).statement
+    if mode == 'approximate' and session.get_bind().dialect.name == 'postgresql':
+        try:
+            compiled = statement.compile(dialect=session.get_bind().dialect)
+            # Savepoint, so a failed EXPLAIN doesn't abort the request's transaction
+            with session.begin_nested():
+                plan = session.connection().exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.warning(f"Row estimate failed, counting instead: {str(e)}")
+
+    return session.execute(select(func.count()).select_from(statement.subquery())).scalar_one()
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Principal(NamedTuple):
+    """What authorization needs to know about a user, without the ORM row"""
+    id: int
+    is_active: bool
+    is_admin: bool
+    roles: Tuple[str, ...]
+    permissions: FrozenSet[str]
+    subscription_tier: str
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions
+
+
+class PrincipalCache:
+    """Size-bounded LRU of principals by user id with a short TTL.
+
+    ``get`` only returns entries younger than ``ttl_seconds`` and is what
+    authentication uses. ``peek`` also returns expired entries: the rate
+    limit middleware only needs to pick a bucket, and must not open a
+    session to refresh one. Admin changes to roles, subscriptions or
+    account status call ``invalidate``; the TTL bounds staleness for
+    changes made by other instances.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = settings.principal_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = max(1, max_entries or settings.principal_cache_max_entries)
+        self._entries: "OrderedDict[int, Tuple[Principal, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or time.monotonic() >= entry[1]:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            return entry[0] if entry else None
+
+    def put(self, principal: Principal) -> None:
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+        logger.info(f"Principal cache invalidated for user {user_id}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Shared by the auth dependencies, the rate limit middleware and admin routes
+principal_cache = PrincipalCache()
@@ -0,0 +1,209 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cached GET routes (path prefix) and the data each one is built from.
+# Invalidating a data tag drops every cached response that depends on it.
+CACHED_ROUTES: List[Tuple[str, Tuple[str, ...]]] = [
+    ('/api/games/upcoming', ('games',)),
+    ('/api/predictions/upcoming', ('games', 'predictions')),
+    ('/api/tips/weekly', ('games', 'predictions', 'tips')),
+    ('/api/tips/upcoming', ('games', 'predictions', 'tips')),
+    ('/api/tips/current-round', ('games', 'predictions', 'tips')),
+    ('/api/tips/featured', ('games', 'predictions', 'tips')),
+    ('/api/analytics/', ('games', 'predictions', 'player_stats', 'analytics')),
+]
+
+
+def route_tags(path: str) -> Optional[Tuple[str, ...]]:
+    for prefix, tags in CACHED_ROUTES:
+        prefix = prefix.rstrip('/')
+        if path == prefix or path.startswith(prefix + '/'):
+            return tags
+    return None
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    """Route plus query params, independent of parameter order"""
+    params = sorted(parse_qsl(query_string.decode('latin-1'), keep_blank_values=True))
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+class ResponseCache:
+    """In-process LRU of rendered GET responses with per-tag invalidation.
+
+    Every data tag has a generation counter; an entry records the
+    generations it was rendered at and is stale once any of them has
+    moved on. Responses that finish rendering after an invalidation are
+    not stored, so a job invalidating mid-request can't leave old data
+    behind. Entries also expire after ``ttl_seconds`` as a backstop for
+    changes made by other processes (backfill workers, other instances).
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = settings.response_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = max(1, max_entries or settings.response_cache_max_entries)
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def generations(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get(self, key: str, tags: Tuple[str, ...]) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            current = tuple(self._generations.get(tag, 0) for tag in tags)
+            if entry is None or entry['generations'] != current or time.monotonic() >= entry['expires_at']:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, tags: Tuple[str, ...], generations: Tuple[int, ...], entry: Dict) -> bool:
+        """Store a rendered response unless its data was invalidated while it rendered"""
+        with self._lock:
+            if tuple(self._generations.get(tag, 0) for tag in tags) != generations:
+                return False
+            self._entries[key] = dict(entry, generations=generations,
+                                      expires_at=time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop cached responses built from any of these data tags"""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            self.invalidations += 1
+        logger.info(f"Response cache invalidated: {', '.join(tags)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'not_modified': self.not_modified,
+                'invalidations': self.invalidations,
+                'generations': dict(self._generations)
+            }
+
+
+# Shared by the middleware and the jobs that invalidate it
+response_cache = ResponseCache()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(',')]
+
+
+class ResponseCacheMiddleware:
+    """Serve cached GET responses for CACHED_ROUTES with strong ETags.
+
+    Adds ``ETag`` and ``Cache-Control`` to cacheable responses and answers
+    a matching ``If-None-Match`` with 304, whether or not the response
+    itself came from the cache.
+    """
+
+    def __init__(self, app, cache: ResponseCache = None):
+        self.app = app
+        self.cache = cache or response_cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        tags = route_tags(scope["path"])
+        if tags is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope["path"], scope.get("query_string", b""))
+        request_headers = {name.lower(): value for name, value in scope.get("headers", [])}
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1") or None
+
+        entry = self.cache.get(key, tags)
+        if entry is not None:
+            await self._send(send, entry, if_none_match, b"HIT")
+            return
+
+        generations = self.cache.generations(tags)
+        start_message = None
+        body = []
+
+        async def capture(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        content = b"".join(body)
+        if start_message is None or start_message["status"] != 200:
+            # Errors are passed through untouched and never cached
+            if start_message is not None:
+                await send(start_message)
+            await send({"type": "http.response.body", "body": content})
+            return
+
+        entry = {
+            'status': 200,
+            'headers': [(name, value) for name, value in start_message.get("headers", [])
+                        if name.lower() not in (b"etag", b"cache-control")],
+            'body': content,
+            'etag': '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+        }
+        self.cache.put(key, tags, generations, entry)
+        await self._send(send, entry, if_none_match, b"MISS")
+
+    async def _send(self, send, entry: Dict, if_none_match: Optional[str], cache_status: bytes):
+        cache_headers = [
+            (b"etag", entry['etag'].encode("latin-1")),
+            (b"cache-control", f"public, max-age={settings.response_cache_max_age_seconds}".encode("latin-1")),
+            (b"x-cache", cache_status),
+        ]
+
+        if _etag_matches(if_none_match, entry['etag']):
+            self.cache.not_modified += 1
+            headers = [(name, value) for name, value in entry['headers']
+                       if name.lower() not in (b"content-length", b"content-type")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers + cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": entry['status'],
+                    "headers": entry['headers'] + cache_headers})
+        await send({"type": "http.response.body", "body": entry['body']})
@@ -14,11 +14,13 @@ import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import logging
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.principal_cache import Principal, principal_cache
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
@@ -369,20 +371,18 @@ security_manager = SecurityManager()
 # JWT Bearer scheme
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user."""
+def token_user_id(token: str) -> int:
+    """User id of a valid access token; raises 401 otherwise."""
     try:
-        payload = security_manager.verify_token(credentials.credentials)
-        user_id: int = payload.get("sub")
+        payload = security_manager.verify_token(token)
+        user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        return int(user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -392,22 +392,65 @@ def get_current_user(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Principal for a user id, from the cache or one narrow query."""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    
+    row = db.execute(
+        select(User.id, User.is_active, User.is_admin, User.roles, User.permissions, User.subscription_tier)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+    
+    principal = Principal(
+        id=row.id,
+        is_active=bool(row.is_active),
+        is_admin=bool(row.is_admin),
+        roles=tuple(row.roles or ()),
+        permissions=frozenset(row.permissions or ()),
+        subscription_tier=row.subscription_tier or "free"
+    )
+    principal_cache.put(principal)
+    return principal
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Get the current authenticated, active principal (cached; no User row load)."""
+    principal = load_principal(db, token_user_id(credentials.credentials))
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    return principal
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the current authenticated user's full row (for routes that need the profile)."""
+    user = db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -418,7 +461,7 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
 
 def require_permission(permission: str):
     """Decorator to require specific permissions."""
-    def permission_checker(current_user: User = Depends(get_current_active_user)):
+    def permission_checker(current_user: Principal = Depends(get_current_principal)):
         if not current_user.has_permission(permission):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,50 @@
+import sqlite3
+from pathlib import Path
+from typing import Sequence
+
+
+class SQLiteFile:
+    """A local SQLite file bootstrapped on first use.
+
+    The first ``connect`` creates the parent directory, switches the file to
+    WAL so readers don't block the writer, and runs ``schema`` (idempotent
+    ``CREATE ... IF NOT EXISTS`` statements). Every call opens a fresh
+    connection, so callers serialise access with their own lock.
+    """
+
+    def __init__(self, path: Path, schema: Sequence[str] = (), timeout: float = 5):
+        self.path = Path(path)
+        self.schema = tuple(schema)
+        self.timeout = timeout
+        self._initialized = False
+
+    def connect(self) -> "ClosingConnection":
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=self.timeout)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.schema:
+                conn.execute(statement)
+            self._initialized = True
+        return ClosingConnection(conn)
+
+
+class ClosingConnection:
+    """Context manager that commits (or rolls back) and always closes the connection"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        finally:
+            self.conn.close()
+        return False
@@ -10,6 +10,7 @@ from app.api.routes import games, predictions, analytics, scraping, auth, admin,
 from app.api.routes import auth_simple
 from app.core.config import settings
 from app.core.security import SecurityMiddleware, log_security_event
+from app.core.response_cache import ResponseCacheMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +28,12 @@ app = FastAPI(
     redoc_url="/redoc" if settings.debug else None,
 )
 
+# Cached public read endpoints. add_middleware wraps the existing stack, so registering
+# this first keeps it innermost: cache hits and 304s still pass host validation and
+# get security and CORS headers
+if settings.response_cache_enabled:
+    app.add_middleware(ResponseCacheMiddleware)
+
 # Security middleware
 if settings.enable_security_headers:
     app.add_middleware(SecurityMiddleware)
@@ -73,57 +80,44 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 # Admin rate limiting middleware
+def _within_rate_limit(client_ip: str, is_admin: bool) -> bool:
+    from app.core.security import security_manager
+    if is_admin:
+        return security_manager.check_rate_limit(f"admin_{client_ip}", max_requests=1000, window_seconds=3600)
+    return security_manager.check_rate_limit(f"user_{client_ip}", max_requests=100, window_seconds=3600)
+
 @app.middleware("http")
 async def admin_rate_limit_middleware(request: Request, call_next):
-    """Provide higher rate limits for admin users."""
+    """Provide higher rate limits for admin users.
+
+    Admin status comes from the shared principal cache (filled by the auth
+    dependencies), so this opens no database session. A token whose user
+    isn't cached yet (first request since startup or eviction) is limited
+    as a regular user.
+    """
+    from app.core.principal_cache import principal_cache
     from app.core.security import security_manager
-    from app.core.database import get_db
-    from app.models.user import User
-    import jwt
     
     client_ip = request.client.host
     
     # Check if this is an admin request by looking for auth header
+    is_admin = False
     auth_header = request.headers.get("authorization")
     if auth_header and auth_header.startswith("Bearer "):
         try:
-            token = auth_header.split(" ")[1]
-            payload = security_manager.verify_token(token)
+            payload = security_manager.verify_token(auth_header.split(" ")[1])
             user_id = payload.get("sub")
-            
-            if user_id:
-                # Get user from database
-                db = next(get_db())
-                user = db.query(User).filter(User.id == user_id).first()
-                
-                if user and user.is_admin:
-                    # Admin users get higher rate limits
-                    if not security_manager.check_rate_limit(f"admin_{client_ip}", max_requests=1000, window_seconds=3600):
-                        return JSONResponse(
-                            status_code=429,
-                            content={"detail": "Admin rate limit exceeded"}
-                        )
-                else:
-                    # Regular users get standard rate limits
-                    if not security_manager.check_rate_limit(f"user_{client_ip}", max_requests=100, window_seconds=3600):
-                        return JSONResponse(
-                            status_code=429,
-                            content={"detail": "Rate limit exceeded"}
-                        )
+            principal = principal_cache.peek(int(user_id)) if user_id else None
+            is_admin = bool(principal and principal.is_admin)
         except Exception:
             # If token verification fails, use standard rate limiting
-            if not security_manager.check_rate_limit(f"user_{client_ip}", max_requests=100, window_seconds=3600):
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Rate limit exceeded"}
-                )
-    else:
-        # No auth header, use standard rate limiting
-        if not security_manager.check_rate_limit(f"user_{client_ip}", max_requests=100, window_seconds=3600):
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded"}
-            )
+            is_admin = False
+    
+    if not _within_rate_limit(client_ip, is_admin):
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Admin rate limit exceeded" if is_admin else "Rate limit exceeded"}
+        )
     
     response = await call_next(request)
     return response
@@ -5,4 +5,7 @@ from .prediction import Prediction
 from .user_tip import UserTip
 from .content import Content, ContentVersion, ContentAnalytics, ContentTemplate
 from .analytics import Analytics
-from .player import Player, PlayerGameStats 
\ No newline at end of file
+from .player import Player, PlayerGameStats
+from .team_stats import TeamSeasonStats
+from .backfill import BackfillJob, BackfillCheckpoint
+from .tip_snapshot import TipSnapshot
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, UniqueConstraint
 from datetime import datetime
 from app.core.database import Base
 
 class Analytics(Base):
     __tablename__ = "analytics"
+    __table_args__ = (
+        UniqueConstraint('period_type', 'period_start', 'model_version', name='uq_analytics_period_model'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -11,6 +14,7 @@ class Analytics(Base):
     period_type = Column(String)  # "daily", "weekly", "monthly", "season"
     period_start = Column(DateTime, index=True)
     period_end = Column(DateTime, index=True)
+    season = Column(Integer, index=True)  # Set for "season" rollups
     
     # Prediction accuracy
     total_predictions = Column(Integer)
@@ -21,6 +25,12 @@ class Analytics(Base):
     high_confidence_accuracy = Column(Float)  # > 0.8
     medium_confidence_accuracy = Column(Float)  # 0.6-0.8
     low_confidence_accuracy = Column(Float)  # < 0.6
+    high_confidence_total = Column(Integer)
+    high_confidence_correct = Column(Integer)
+    medium_confidence_total = Column(Integer)
+    medium_confidence_correct = Column(Integer)
+    low_confidence_total = Column(Integer)
+    low_confidence_correct = Column(Integer)
     
     # Team performance
     team_performance_data = Column(Text)  # JSON string of team-specific stats
@@ -0,0 +1,61 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+class BackfillJob(Base):
+    __tablename__ = "backfill_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Requested range (inclusive)
+    start_season = Column(Integer, nullable=False)
+    end_season = Column(Integer, nullable=False)
+
+    # pending, running, completed, failed, cancelled
+    status = Column(String, nullable=False, default='pending', index=True)
+
+    # Progress, in (season, round, game) units
+    units_total = Column(Integer, nullable=False, default=0)
+    units_done = Column(Integer, nullable=False, default=0)
+    units_failed = Column(Integer, nullable=False, default=0)
+    current_season = Column(Integer)
+    error = Column(Text)
+
+    # Worker liveness; a running job with a stale heartbeat can be taken over
+    worker_pid = Column(Integer)
+    heartbeat_at = Column(DateTime)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # Metadata
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    checkpoints = relationship("BackfillCheckpoint", back_populates="job", cascade="all, delete-orphan")
+
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+    __table_args__ = (
+        UniqueConstraint('job_id', 'unit_key', name='uq_backfill_checkpoints_job_unit'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("backfill_jobs.id"), nullable=False, index=True)
+
+    # One (season, round, game) unit
+    unit_key = Column(String, nullable=False)  # "{season}/{round}/{game}"
+    season = Column(Integer, nullable=False)
+    round_number = Column(Integer)
+    game_id = Column(Integer, ForeignKey("games.id"))
+
+    # done or failed; failed units are retried on resume
+    status = Column(String, nullable=False)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=1)
+    completed_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    job = relationship("BackfillJob", back_populates="checkpoints")
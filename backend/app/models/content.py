@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -7,6 +7,11 @@ from app.core.database import Base
 
 class Content(Base):
     __tablename__ = "content"
+    __table_args__ = (
+        # Keyset pagination; listings filter on status (published by default)
+        Index('ix_content_status_created_at_id', 'status', 'created_at', 'id'),
+        Index('ix_content_created_at_id', 'created_at', 'id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
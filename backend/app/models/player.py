@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Date
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Date, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -34,6 +34,9 @@ class Player(Base):
 
 class PlayerGameStats(Base):
     __tablename__ = "player_game_stats"
+    __table_args__ = (
+        UniqueConstraint('game_id', 'player_id', name='uq_player_game_stats_game_player'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -64,6 +67,7 @@ class PlayerGameStats(Base):
     
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     game = relationship("Game", back_populates="player_stats")
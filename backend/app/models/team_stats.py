@@ -0,0 +1,86 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+FORM_LENGTH = 5
+
+
+class TeamSeasonStats(Base):
+    """Materialized per-team, per-season results, updated as games finish"""
+    __tablename__ = "team_season_stats"
+    __table_args__ = (
+        UniqueConstraint('team_id', 'season', name='uq_team_season_stats_team_season'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
+    season = Column(Integer, nullable=False, index=True)
+
+    # Overall record
+    games_played = Column(Integer, default=0, nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    draws = Column(Integer, default=0, nullable=False)
+    points_for = Column(Integer, default=0, nullable=False)
+    points_against = Column(Integer, default=0, nullable=False)
+
+    # Home/away splits
+    home_games = Column(Integer, default=0, nullable=False)
+    home_wins = Column(Integer, default=0, nullable=False)
+    home_points_for = Column(Integer, default=0, nullable=False)
+    home_points_against = Column(Integer, default=0, nullable=False)
+    away_games = Column(Integer, default=0, nullable=False)
+    away_wins = Column(Integer, default=0, nullable=False)
+    away_points_for = Column(Integer, default=0, nullable=False)
+    away_points_against = Column(Integer, default=0, nullable=False)
+
+    # Rolling form, oldest to newest (e.g. "WWLDW")
+    recent_form = Column(String(FORM_LENGTH), default="", nullable=False)
+    last_game_date = Column(DateTime)
+
+    # Metadata
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    team = relationship("Team")
+
+    @property
+    def win_percentage(self) -> float:
+        return (self.wins / self.games_played * 100) if self.games_played else 0.0
+
+    @property
+    def avg_score_for(self) -> float:
+        return (self.points_for / self.games_played) if self.games_played else 0.0
+
+    @property
+    def avg_score_against(self) -> float:
+        return (self.points_against / self.games_played) if self.games_played else 0.0
+
+    @property
+    def percentage(self) -> float:
+        """AFL ladder percentage: points for / points against x 100"""
+        return (self.points_for / self.points_against * 100) if self.points_against else 0.0
+
+    def to_dict(self):
+        return {
+            "team_id": self.team_id,
+            "season": self.season,
+            "games_played": self.games_played,
+            "wins": self.wins,
+            "losses": self.losses,
+            "draws": self.draws,
+            "points_for": self.points_for,
+            "points_against": self.points_against,
+            "home_games": self.home_games,
+            "home_wins": self.home_wins,
+            "away_games": self.away_games,
+            "away_wins": self.away_wins,
+            "win_percentage": round(self.win_percentage, 1),
+            "avg_score_for": round(self.avg_score_for, 1),
+            "avg_score_against": round(self.avg_score_against, 1),
+            "percentage": round(self.percentage, 1),
+            "recent_form": self.recent_form,
+            "last_game_date": self.last_game_date.isoformat() if self.last_game_date else None
+        }
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+class TipSnapshot(Base):
+    __tablename__ = "tip_snapshots"
+    __table_args__ = (
+        UniqueConstraint('scope', 'scope_key', 'version', name='uq_tip_snapshots_scope_key_version'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # "round" (key "2025-R12") or "week" (key "2025-W31", the ISO week it was built in)
+    scope = Column(String, nullable=False, index=True)
+    scope_key = Column(String, nullable=False, index=True)
+    season = Column(Integer)
+    round_number = Column(Integer)
+
+    # Readers take the highest version, so a committed insert is the swap
+    version = Column(Integer, nullable=False, default=1)
+    document = Column(Text, nullable=False)  # Serialized tips document (JSON)
+    games_count = Column(Integer, nullable=False, default=0)
+
+    # Metadata
+    built_at = Column(DateTime, default=datetime.utcnow, index=True)
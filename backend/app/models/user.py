@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime, timedelta
@@ -56,6 +56,10 @@ ROLE_PERMISSIONS = {
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination of the admin user list
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -420,6 +424,12 @@ class UserSession(Base):
 
 class SecurityLog(Base):
     __tablename__ = "security_logs"
+    __table_args__ = (
+        # Keyset pagination, unfiltered and by the admin filters
+        Index('ix_security_logs_created_at_id', 'created_at', 'id'),
+        Index('ix_security_logs_user_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('ix_security_logs_event_created_at_id', 'event_type', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
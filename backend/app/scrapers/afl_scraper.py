@@ -1,26 +1,30 @@
-import requests
 from bs4 import BeautifulSoup
 import time
 import json
 import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.database import SessionLocal
 from app.models.game import Game
 from app.models.team import Team
-from app.models.player import Player, PlayerGameStats
+from app.services.ingestion_service import ingestion_service
+from app.services.team_alias_service import canonical_team_name, team_alias_index
+from app.services.team_stats_service import team_stats_service
+from app.scrapers.constants import DEFAULT_BASE_URL, USER_AGENT
+from app.scrapers.fetcher import ConcurrentFetcher
+from app.scrapers.parsing import get_parser
 import logging
 
 logger = logging.getLogger(__name__)
 
 class AFLScraper:
-    def __init__(self):
-        self.base_url = "https://afltables.com/afl"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, base_url: Optional[str] = None, fetcher: Optional[ConcurrentFetcher] = None):
+        # base_url can point at a local fixture server serving saved afltables pages
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.fetcher = fetcher or ConcurrentFetcher(user_agent=USER_AGENT)
+        # Sequential page loads share the fetcher's pooled session
+        self.session = self.fetcher.session
         
     def test_small_scrape(self, season: int = 2024, rounds: int = 2) -> Dict:
         """Test the scraper with a small amount of data"""
@@ -80,7 +84,7 @@ class AFLScraper:
         """Get season overview data"""
         try:
             url = f"{self.base_url}/seas/{season}.html"
-            response = self.session.get(url)
+            response = self.fetcher.get(url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -170,7 +174,7 @@ class AFLScraper:
                         
                         # Look for date patterns or team names
                         if (re.match(r'\d{1,2}/\d{1,2}/\d{4}', first_col) or 
-                            any(team_name in str(cols) for team_name in ['Carlton', 'Collingwood', 'Essendon', 'Richmond', 'Geelong', 'Hawthorn', 'Melbourne', 'North Melbourne', 'St Kilda', 'Sydney', 'Western Bulldogs', 'Adelaide', 'Brisbane', 'Fremantle', 'Gold Coast', 'GWS', 'Port Adelaide', 'West Coast'])):
+                            any(canonical_team_name(col.get_text(strip=True)) for col in cols)):
                             
                             game_data = self._extract_game_from_row(cols, season, round_num)
                             if game_data:
@@ -193,17 +197,11 @@ class AFLScraper:
             if len(cols) < 6:
                 return None
             
-            # Try to identify teams and scores
-            text_content = ' '.join([col.get_text(strip=True) for col in cols])
-            
-            # Look for team names
-            teams = ['Carlton', 'Collingwood', 'Essendon', 'Richmond', 'Geelong', 'Hawthorn', 
-                    'Melbourne', 'North Melbourne', 'St Kilda', 'Sydney', 'Western Bulldogs', 
-                    'Adelaide', 'Brisbane', 'Fremantle', 'Gold Coast', 'GWS', 'Port Adelaide', 'West Coast']
-            
+            # Team cells, in row order, by exact (alias-aware) name
             found_teams = []
-            for team in teams:
-                if team in text_content:
+            for col in cols:
+                team = canonical_team_name(col.get_text(strip=True))
+                if team and team not in found_teams:
                     found_teams.append(team)
             
             if len(found_teams) >= 2:
@@ -338,7 +336,7 @@ class AFLScraper:
     def parse_player_stats_from_game(self, game_url: str) -> list:
         """Parse player stats from a single game page."""
         try:
-            response = self.session.get(game_url)
+            response = self.fetcher.get(game_url)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             tables = soup.find_all('table')
@@ -375,55 +373,14 @@ class AFLScraper:
         """Parse the main season page to extract all games"""
         try:
             url = f"{self.base_url}/seas/{season}.html"
-            response = self.session.get(url)
+            response = self.fetcher.get(url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            games = []
-            current_round = None
-            processed_tables = set()  # Track processed tables to avoid duplicates
-            
-            # Find all tables
-            tables = soup.find_all('table')
-            
-            for table in tables:
-                rows = table.find_all('tr')
-                if len(rows) < 1:
-                    continue
-                
-                # Check if this is a round header table
-                first_row = rows[0]
-                if 'Round' in first_row.get_text():
-                    round_match = re.search(r'Round (\d+)', first_row.get_text())
-                    if round_match:
-                        current_round = int(round_match.group(1))
-                        continue
-                
-                # Check if this table contains game data by looking for team links
-                team_links = table.find_all('a', href=lambda x: x and 'teams/' in x)
-                if len(team_links) >= 2 and id(table) not in processed_tables:
-                    # This looks like a game table
-                    processed_tables.add(id(table))
-                    # Games are stored in pairs of rows (home team, away team)
-                    for i in range(0, len(rows), 2):
-                        if i + 1 < len(rows):
-                            home_row = rows[i]
-                            away_row = rows[i + 1]
-                            
-                            game_data = self._parse_game_rows(home_row, away_row, season, current_round)
-                            if game_data:
-                                games.append(game_data)
-            
-            # Remove duplicates based on game_id
-            unique_games = {}
-            for game in games:
-                game_id = game.get('game_id', '')
-                if game_id and game_id not in unique_games:
-                    unique_games[game_id] = game
+            games = get_parser().parse_season_games(response.content, season, self.base_url)
             
             return {
                 "success": True,
-                "games": list(unique_games.values()),
+                "games": games,
                 "season": season
             }
             
@@ -431,117 +388,20 @@ class AFLScraper:
             logger.error(f"Error parsing season page: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def _parse_game_rows(self, home_row, away_row, season: int, round_num: int = None) -> Optional[Dict]:
-        """Parse two rows representing a game (home and away teams)"""
-        try:
-            home_cells = home_row.find_all(['td', 'th'])
-            away_cells = away_row.find_all(['td', 'th'])
-            
-            if len(home_cells) < 4 or len(away_cells) < 4:
-                return None
-            
-            # Extract team names from links
-            home_team_link = home_cells[0].find('a', href=lambda x: x and 'teams/' in x)
-            away_team_link = away_cells[0].find('a', href=lambda x: x and 'teams/' in x)
-            
-            if not home_team_link or not away_team_link:
-                return None
-            
-            home_team = home_team_link.get_text(strip=True)
-            away_team = away_team_link.get_text(strip=True)
-            
-            # Skip if same team (this shouldn't happen in real games)
-            if home_team == away_team:
-                return None
-            
-            # Extract scores (third column)
-            home_score_text = home_cells[2].get_text(strip=True)
-            away_score_text = away_cells[2].get_text(strip=True)
-            
-            home_score = int(home_score_text) if home_score_text.isdigit() else 0
-            away_score = int(away_score_text) if away_score_text.isdigit() else 0
-            
-            # Extract game details from the last cell
-            game_details = away_cells[-1].get_text(strip=True)
-            
-            # Extract venue and date if available
-            venue = None
-            game_date = None
-            
-            # Look for venue pattern
-            venue_match = re.search(r'Venue:\s*([^(]+)', game_details)
-            if venue_match:
-                venue = venue_match.group(1).strip()
-            
-            # Look for date pattern
-            date_match = re.search(r'(\w{3}\s+\d{1,2}-\w{3}-\d{4})', game_details)
-            if date_match:
-                try:
-                    date_str = date_match.group(1)
-                    game_date = datetime.strptime(date_str, '%a %d-%b-%Y')
-                except:
-                    pass
-            
-            # Extract match stats link
-            stats_link = None
-            stats_a = away_cells[-1].find('a', href=True)
-            if stats_a and 'stats/games' in stats_a['href']:
-                # Fix the stats link path
-                href = stats_a['href']
-                if href.startswith('../'):
-                    href = href[3:]  # Remove ../
-                stats_link = f"{self.base_url}/{href}"
-                
-                # Extract round number from stats link if not already set
-                if not round_num:
-                    round_match = re.search(r'/(\d{1,2})/', href)
-                    if round_match:
-                        round_num = int(round_match.group(1))
-            
-            # If we still don't have a round number, try to infer from context
-            if not round_num:
-                # Look for round info in the game details
-                round_match = re.search(r'Round (\d+)', game_details)
-                if round_match:
-                    round_num = int(round_match.group(1))
-            
-            return {
-                'home_team': home_team,
-                'away_team': away_team,
-                'home_score': home_score,
-                'away_score': away_score,
-                'season': season,
-                'round': round_num,
-                'venue': venue,
-                'game_date': game_date,
-                'stats_link': stats_link,
-                'game_id': f"{season}_r{round_num}_{home_team}_{away_team}" if round_num else f"{season}_{home_team}_{away_team}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error parsing game rows: {str(e)}")
-            return None
+    @staticmethod
+    def stats_game_id(game_data: Dict) -> Optional[str]:
+        """Numeric afltables game id from a parsed game's stats link"""
+        match = re.search(r'/stats/games/\d+/(\d+)\.html', game_data.get('stats_link') or '')
+        return match.group(1) if match else None
+    
+    def game_stats_url(self, game_id: str, season: int) -> str:
+        return f"{self.base_url}/stats/games/{season}/{game_id}.html"
     
     def parse_game_stats(self, game_id: str, season: int) -> Dict:
         """Parse detailed game statistics including player stats"""
         try:
-            url = f"{self.base_url}/stats/games/{season}/{game_id}.html"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract game details
-            game_details = self._extract_game_details(soup)
-            
-            # Extract player statistics
-            player_stats = self._extract_player_stats(soup)
-            
-            return {
-                'success': True,
-                'game_details': game_details,
-                'player_stats': player_stats
-            }
+            response = self.fetcher.get(self.game_stats_url(game_id, season))
+            return self.parse_game_stats_content(response.content)
             
         except Exception as e:
             logger.error(f"Error parsing game stats for {game_id}: {str(e)}")
@@ -550,174 +410,28 @@ class AFLScraper:
                 'error': str(e)
             }
     
-    def _extract_game_details(self, soup: BeautifulSoup) -> Dict:
-        """Extract game details from the stats page"""
-        try:
-            # Find the main game table
-            game_table = soup.find('table', style=lambda x: x and 'font: 12px Verdana' in x)
-            if not game_table:
-                return {}
-            
-            rows = game_table.find_all('tr')
-            if len(rows) < 3:
-                return {}
-            
-            # Extract round, venue, date, attendance
-            details = {}
-            
-            # Round info is in the first row
-            first_row = rows[0]
-            round_text = first_row.get_text()
-            if 'Round:' in round_text:
-                round_match = re.search(r'Round:\s*(\d+)', round_text)
-                if round_match:
-                    details['round'] = int(round_match.group(1))
-            
-            # Venue
-            venue_link = first_row.find('a', href=lambda x: x and 'venues' in x)
-            if venue_link:
-                details['venue'] = venue_link.get_text().strip()
-            
-            # Date
-            date_match = re.search(r'Date:\s*([^,]+,\s*\d+-\w+-\d+\s+\d+:\d+\s+\w+)', round_text)
-            if date_match:
-                details['date'] = date_match.group(1).strip()
-            
-            # Attendance
-            attendance_match = re.search(r'Attendance:\s*(\d+)', round_text)
-            if attendance_match:
-                details['attendance'] = int(attendance_match.group(1))
-            
-            # Team scores
-            team_scores = {}
-            for i in range(1, 3):  # First two team rows
-                if i < len(rows):
-                    team_row = rows[i]
-                    team_link = team_row.find('a', href=lambda x: x and 'teams' in x)
-                    if team_link:
-                        team_name = team_link.get_text().strip()
-                        scores = []
-                        score_cells = team_row.find_all('td')[1:5]  # Skip team name cell
-                        for cell in score_cells:
-                            score_text = cell.get_text().strip()
-                            if score_text:
-                                # Parse AFL score format (goals.behinds.total)
-                                score_parts = score_text.split('.')
-                                if len(score_parts) >= 3:
-                                    goals = int(score_parts[0])
-                                    behinds = int(score_parts[1])
-                                    total = int(score_parts[2])
-                                    scores.append({
-                                        'goals': goals,
-                                        'behinds': behinds,
-                                        'total': total,
-                                        'raw': score_text
-                                    })
-                                else:
-                                    # Fallback to just the number
-                                    scores.append({
-                                        'total': int(score_text),
-                                        'raw': score_text
-                                    })
-                        team_scores[team_name] = scores
-            
-            details['team_scores'] = team_scores
-            
-            return details
-            
-        except Exception as e:
-            logger.error(f"Error extracting game details: {str(e)}")
-            return {}
+    def parse_game_stats_content(self, content: bytes) -> Dict:
+        """Parse a downloaded game stats page"""
+        result = get_parser().parse_game_stats(content)
+        result['success'] = True
+        return result
     
-    def _extract_player_stats(self, soup: BeautifulSoup) -> Dict:
-        """Extract player statistics from the stats page"""
-        try:
-            player_stats = {}
-            
-            # Find all player stat tables
-            stat_tables = soup.find_all('table', class_='sortable')
-            
-            for table in stat_tables:
-                # Check if this is a player stats table
-                header = table.find('th')
-                if not header or 'Match Statistics' not in header.get_text():
-                    continue
-                
-                # Extract team name from header
-                team_name = header.get_text().split('Match Statistics')[0].strip()
-                
-                # Parse player rows
-                tbody = table.find('tbody')
-                if not tbody:
-                    continue
-                
-                players = []
-                rows = tbody.find_all('tr')
-                
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) < 15:  # Need minimum columns for stats
-                        continue
-                    
-                    # Extract player info
-                    player_link = cells[1].find('a')
-                    if not player_link:
-                        continue
-                    
-                    player_name = player_link.get_text().strip()
-                    jumper_number = cells[0].get_text().strip()
-                    
-                    # Extract statistics
-                    stats = {
-                        'jumper_number': jumper_number,
-                        'kicks': self._parse_stat(cells[2]),
-                        'marks': self._parse_stat(cells[3]),
-                        'handballs': self._parse_stat(cells[4]),
-                        'disposals': self._parse_stat(cells[5]),
-                        'goals': self._parse_stat(cells[6]),
-                        'behinds': self._parse_stat(cells[7]),
-                        'hit_outs': self._parse_stat(cells[8]),
-                        'tackles': self._parse_stat(cells[9]),
-                        'rebound_50s': self._parse_stat(cells[10]),
-                        'inside_50s': self._parse_stat(cells[11]),
-                        'clearances': self._parse_stat(cells[12]),
-                        'clangers': self._parse_stat(cells[13]),
-                        'free_kicks_for': self._parse_stat(cells[14]),
-                        'free_kicks_against': self._parse_stat(cells[15]),
-                        'brownlow_votes': self._parse_stat(cells[16]) if len(cells) > 16 else 0,
-                        'contested_possessions': self._parse_stat(cells[17]) if len(cells) > 17 else 0,
-                        'uncontested_possessions': self._parse_stat(cells[18]) if len(cells) > 18 else 0,
-                        'contested_marks': self._parse_stat(cells[19]) if len(cells) > 19 else 0,
-                        'marks_inside_50': self._parse_stat(cells[20]) if len(cells) > 20 else 0,
-                        'one_percenters': self._parse_stat(cells[21]) if len(cells) > 21 else 0,
-                        'bounces': self._parse_stat(cells[22]) if len(cells) > 22 else 0,
-                        'goal_assists': self._parse_stat(cells[23]) if len(cells) > 23 else 0,
-                        'percentage_played': self._parse_stat(cells[24]) if len(cells) > 24 else 100
-                    }
-                    
-                    players.append({
-                        'name': player_name,
-                        'stats': stats
-                    })
-                
-                player_stats[team_name] = players
-            
-            return player_stats
-            
-        except Exception as e:
-            logger.error(f"Error extracting player stats: {str(e)}")
-            return {}
+    def fetch_game_stats(self, season: int, game_ids: List[str]) -> Iterator[Tuple[str, Dict]]:
+        """Fetch and parse many game stats pages concurrently.
+        
+        Yields ``(game_id, stats_result)`` in completion order; failures come back
+        as ``{'success': False, 'error': ...}`` like ``parse_game_stats``.
+        """
+        results = self.fetcher.fetch_and_parse(
+            game_ids,
+            url_for=lambda game_id: self.game_stats_url(game_id, season),
+            parse=lambda game_id, content: self.parse_game_stats_content(content)
+        )
+        for game_id, result in results:
+            if isinstance(result, Exception):
+                result = {'success': False, 'error': str(result)}
+            yield game_id, result
     
-    def _parse_stat(self, cell) -> int:
-        """Parse a statistic cell and return integer value"""
-        try:
-            text = cell.get_text().strip()
-            if text and text != '&nbsp;':
-                return int(text)
-            return 0
-        except (ValueError, AttributeError):
-            return 0 
-
     def scrape_multiple_seasons(self, start_year: int = 2019, end_year: int = 2024, save_to_db: bool = True) -> Dict:
         """
         Scrape multiple seasons of AFL data and save to database
@@ -830,19 +544,28 @@ class AFLScraper:
             if save_to_db:
                 db = SessionLocal()
                 try:
+                    game_records = {}
                     for game in games:
                         # Save or update game
                         game_record = self._save_game_to_db(db, game, year)
-                        
-                        # Get player stats for this game if available
-                        if game.get('game_id'):
-                            stats_result = self.parse_game_stats(game['game_id'], year)
-                            if stats_result['success']:
-                                players_found += self._save_player_stats_to_db(db, stats_result, game_record)
-                                player_stats_found += self._count_player_stats(stats_result)
-                        
-                        # Be respectful to the server
-                        time.sleep(0.5)
+                        stats_id = self.stats_game_id(game)
+                        if stats_id:
+                            game_records[stats_id] = game_record.id
+                    db.commit()
+                    
+                    # Player stats pages are fetched concurrently (rate limited by the fetcher)
+                    # and written in bulk, one commit per batch of games
+                    batch = []
+                    for game_id, stats_result in self.fetch_game_stats(year, list(game_records)):
+                        if stats_result['success']:
+                            batch.append((game_records[game_id], stats_result))
+                        if len(batch) >= settings.ingest_batch_games:
+                            players_found, player_stats_found = self._ingest_batch(
+                                db, batch, players_found, player_stats_found)
+                            batch = []
+                    if batch:
+                        players_found, player_stats_found = self._ingest_batch(
+                            db, batch, players_found, player_stats_found)
                     
                     db.commit()
                 except Exception as e:
@@ -875,117 +598,71 @@ class AFLScraper:
     def _save_game_to_db(self, db: Session, game_data: Dict, year: int) -> Game:
         """Save or update a game in the database"""
         try:
+            home_team = self._get_or_create_team(db, game_data['home_team'])
+            away_team = self._get_or_create_team(db, game_data['away_team'])
+            is_finished = bool(game_data.get('home_score') or game_data.get('away_score'))
+            
             # Check if game already exists
             existing_game = db.query(Game).filter(
-                Game.home_team == game_data['home_team'],
-                Game.away_team == game_data['away_team'],
-                Game.round == game_data['round'],
+                Game.home_team_id == home_team.id,
+                Game.away_team_id == away_team.id,
+                Game.round_number == game_data['round'],
                 Game.season == year
             ).first()
             
             if existing_game:
+                was_finished = bool(existing_game.is_finished)
+                
                 # Update existing game
                 existing_game.home_score = game_data['home_score']
                 existing_game.away_score = game_data['away_score']
-                if 'venue' in game_data:
+                if game_data.get('venue'):
                     existing_game.venue = game_data['venue']
-                if 'date' in game_data:
-                    existing_game.date = game_data['date']
+                if game_data.get('game_date'):
+                    existing_game.game_date = game_data['game_date']
+                if is_finished:
+                    existing_game.is_finished = True
+                    team_stats_service.record_result(db, existing_game, was_finished)
                 return existing_game
             else:
                 # Create new game
                 new_game = Game(
                     season=year,
-                    round=game_data['round'],
-                    home_team=game_data['home_team'],
-                    away_team=game_data['away_team'],
+                    round_number=game_data['round'],
+                    home_team_id=home_team.id,
+                    away_team_id=away_team.id,
                     home_score=game_data['home_score'],
                     away_score=game_data['away_score'],
                     venue=game_data.get('venue'),
-                    date=game_data.get('date'),
-                    game_id=game_data.get('game_id')
+                    game_date=game_data.get('game_date'),
+                    is_finished=is_finished
                 )
                 db.add(new_game)
                 db.flush()  # Get the ID
+                if is_finished:
+                    team_stats_service.record_result(db, new_game)
                 return new_game
                 
         except Exception as e:
             logger.error(f"Error saving game to database: {str(e)}")
             raise
     
-    def _save_player_stats_to_db(self, db: Session, stats_result: Dict, game_record: Game) -> int:
-        """Save player statistics to database"""
-        try:
-            players_saved = 0
-            player_stats = stats_result.get('player_stats', {})
-            
-            for team_name, players in player_stats.items():
-                for player_data in players:
-                    # Get or create player
-                    player = self._get_or_create_player(db, player_data['name'])
-                    
-                    # Save player game stats
-                    stats = player_data['stats']
-                    game_stats = PlayerGameStats(
-                        player_id=player.id,
-                        game_id=game_record.id,
-                        team=team_name,
-                        jumper_number=stats.get('jumper_number'),
-                        kicks=stats.get('kicks', 0),
-                        marks=stats.get('marks', 0),
-                        handballs=stats.get('handballs', 0),
-                        disposals=stats.get('disposals', 0),
-                        goals=stats.get('goals', 0),
-                        behinds=stats.get('behinds', 0),
-                        hit_outs=stats.get('hit_outs', 0),
-                        tackles=stats.get('tackles', 0),
-                        rebound_50s=stats.get('rebound_50s', 0),
-                        inside_50s=stats.get('inside_50s', 0),
-                        clearances=stats.get('clearances', 0),
-                        clangers=stats.get('clangers', 0),
-                        free_kicks_for=stats.get('free_kicks_for', 0),
-                        free_kicks_against=stats.get('free_kicks_against', 0),
-                        brownlow_votes=stats.get('brownlow_votes', 0),
-                        contested_possessions=stats.get('contested_possessions', 0),
-                        uncontested_possessions=stats.get('uncontested_possessions', 0),
-                        contested_marks=stats.get('contested_marks', 0),
-                        marks_inside_50=stats.get('marks_inside_50', 0),
-                        one_percenters=stats.get('one_percenters', 0),
-                        bounces=stats.get('bounces', 0),
-                        goal_assists=stats.get('goal_assists', 0),
-                        percentage_played=stats.get('percentage_played', 100)
-                    )
-                    
-                    db.add(game_stats)
-                    players_saved += 1
-            
-            return players_saved
-            
-        except Exception as e:
-            logger.error(f"Error saving player stats to database: {str(e)}")
-            raise
-    
-    def _get_or_create_player(self, db: Session, player_name: str) -> Player:
-        """Get existing player or create new one"""
-        try:
-            player = db.query(Player).filter(Player.name == player_name).first()
-            if not player:
-                player = Player(name=player_name)
-                db.add(player)
-                db.flush()  # Get the ID
-            return player
-        except Exception as e:
-            logger.error(f"Error getting/creating player: {str(e)}")
-            raise
+    def _get_or_create_team(self, db: Session, team_name: str) -> Team:
+        """Get existing team (by any known spelling) or create new one"""
+        team = team_alias_index.get_team(db, team_name)
+        if team is not None:
+            return team
+        team = Team(name=canonical_team_name(team_name) or team_name)
+        db.add(team)
+        db.flush()  # Get the ID
+        team_alias_index.add_on_commit(db, team)
+        return team
     
-    def _count_player_stats(self, stats_result: Dict) -> int:
-        """Count total number of player statistics"""
-        try:
-            count = 0
-            player_stats = stats_result.get('player_stats', {})
-            for team_players in player_stats.values():
-                count += len(team_players)
-            return count
-        except Exception as e:
-            logger.error(f"Error counting player stats: {str(e)}")
-            return 0 
\ No newline at end of file
+    def _ingest_batch(self, db: Session, batch: List[Tuple[int, Dict]], players_found: int,
+                      player_stats_found: int) -> Tuple[int, int]:
+        """Bulk write a batch of (game id, stats result) pairs and add to the running totals"""
+        result = ingestion_service.ingest_player_stats(db, batch)
+        if not result['success']:
+            raise Exception(result['error'])
+        return players_found + result['players_created'], player_stats_found + result['player_stats_written']
+ 
\ No newline at end of file
@@ -0,0 +1,3 @@
+# afltables, and the browser user agent every afltables scraper sends
+DEFAULT_BASE_URL = "https://afltables.com/afl"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -0,0 +1,160 @@
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.scrapers.http_cache import CachedSession, CacheMissError, create_scraper_session
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying; anything else is returned to the caller as-is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every worker of a fetcher"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchError(Exception):
+    """Raised when a URL could not be fetched after all retries"""
+
+
+class ConcurrentFetcher:
+    """Polite concurrent HTTP fetcher for afltables pages.
+
+    All requests share one pooled session, a global token bucket and a cap on
+    in-flight requests. ``fetch_and_parse`` runs downloads and parsing on
+    separate thread pools so HTML parsing overlaps network I/O.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, max_in_flight: Optional[int] = None,
+                 requests_per_second: Optional[float] = None, max_retries: Optional[int] = None,
+                 backoff_seconds: Optional[float] = None, timeout_seconds: Optional[float] = None,
+                 parse_workers: Optional[int] = None, user_agent: Optional[str] = None,
+                 cache_mode: Optional[str] = None):
+        self.base_url = base_url
+        self.max_in_flight = max_in_flight or settings.scraper_max_in_flight
+        self.max_retries = settings.scraper_max_retries if max_retries is None else max_retries
+        self.backoff_seconds = settings.scraper_retry_backoff_seconds if backoff_seconds is None else backoff_seconds
+        self.timeout_seconds = timeout_seconds or settings.scraper_timeout_seconds
+        self.parse_workers = parse_workers or settings.scraper_parse_workers
+        self.bucket = TokenBucket(
+            settings.scraper_requests_per_second if requests_per_second is None else requests_per_second
+        )
+        self.in_flight = threading.BoundedSemaphore(self.max_in_flight)
+
+        self.session = create_scraper_session(user_agent, mode=cache_mode)
+        # Pool per host, sized so every in-flight request can keep its connection alive
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_in_flight, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def url(self, path: str) -> str:
+        """Resolve a path against ``base_url`` (absolute URLs pass through)"""
+        if not self.base_url:
+            return path
+        return urljoin(self.base_url.rstrip('/') + '/', path.lstrip('/'))
+
+    def get(self, url: str) -> requests.Response:
+        """GET with rate limiting, the in-flight cap and jittered exponential backoff"""
+        url = self.url(url)
+        # Cached pages need neither a token nor an in-flight slot
+        if isinstance(self.session, CachedSession):
+            cached = self.session.fresh_response(url)
+            if cached is not None:
+                return cached
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = self.backoff_seconds * (2 ** (attempt - 1))
+                time.sleep(delay + random.uniform(0, delay))
+
+            self.bucket.acquire()
+            try:
+                with self.in_flight:
+                    response = self.session.get(url, timeout=self.timeout_seconds)
+            except CacheMissError:
+                raise
+            except requests.RequestException as e:
+                last_error = e
+                logger.warning(f"Request to {url} failed (attempt {attempt + 1}): {str(e)}")
+                continue
+
+            if response.status_code in RETRY_STATUSES:
+                last_error = FetchError(f"HTTP {response.status_code}")
+                logger.warning(f"Request to {url} returned {response.status_code} (attempt {attempt + 1})")
+                continue
+
+            response.raise_for_status()
+            return response
+
+        raise FetchError(f"Giving up on {url} after {self.max_retries + 1} attempts: {last_error}")
+
+    def fetch_and_parse(self, items: Iterable[Any], url_for: Callable[[Any], str],
+                        parse: Callable[[Any, bytes], Any]) -> Iterator[Tuple[Any, Any]]:
+        """Download each item's page concurrently and yield ``(item, parse(item, content))``.
+
+        Results are yielded in completion order as soon as they are parsed. A
+        failed download or parse yields ``(item, exception)`` instead.
+        """
+        items = list(items)
+        if not items:
+            return
+
+        results: "queue.Queue[Tuple[Any, Any]]" = queue.Queue()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='fetch') as downloads, \
+                ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix='parse') as parsers:
+
+            def parse_stage(item, content):
+                try:
+                    results.put((item, parse(item, content)))
+                except Exception as e:
+                    logger.error(f"Error parsing {url_for(item)}: {str(e)}")
+                    results.put((item, e))
+
+            def download_stage(item):
+                try:
+                    content = self.get(url_for(item)).content
+                except Exception as e:
+                    logger.error(f"Error fetching {url_for(item)}: {str(e)}")
+                    results.put((item, e))
+                    return
+                parsers.submit(parse_stage, item, content)
+
+            for item in items:
+                downloads.submit(download_stage, item)
+
+            for _ in range(len(items)):
+                yield results.get()
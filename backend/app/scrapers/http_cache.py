@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from app.core.config import settings
+from app.core.sqlite_store import ClosingConnection, SQLiteFile
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ('default', 'replay', 'refresh')
+
+SEASON_PAGE = re.compile(r'/seas/(\d{4})\.html$')
+GAME_STATS_PAGE = re.compile(r'/stats/games/(\d{4})/[^/]+\.html$')
+# Response headers worth replaying; everything else is transport detail
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def is_immutable(url: str, now: Optional[datetime] = None) -> bool:
+    """Pages that can no longer change: completed seasons and finished-game stats.
+
+    A game stats page is only published once the match is over, so any cached
+    copy is final.
+    """
+    path = urlsplit(url).path
+    season_match = SEASON_PAGE.search(path)
+    if season_match:
+        return int(season_match.group(1)) < (now or datetime.now()).year
+    return GAME_STATS_PAGE.search(path) is not None
+
+
+class CacheMissError(requests.ConnectionError):
+    """Raised in replay mode when a page was never cached"""
+
+
+class HTTPCacheStore:
+    """Content-addressed page bodies on disk plus a SQLite index of URL metadata"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._db = SQLiteFile(self.directory / 'index.sqlite3', schema=(
+            "CREATE TABLE IF NOT EXISTS http_pages ("
+            "url TEXT PRIMARY KEY, "
+            "content_hash TEXT NOT NULL, "
+            "headers TEXT NOT NULL, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "immutable INTEGER NOT NULL DEFAULT 0, "
+            "fetched_at REAL NOT NULL)",
+        ))
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the index row and body for a URL, or None"""
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT url, content_hash, headers, etag, last_modified, immutable, fetched_at "
+                    "FROM http_pages WHERE url = ?", (url,)
+                ).fetchone()
+            if row is None:
+                return None
+
+            content = self._blob_path(row[1]).read_bytes()
+            return {
+                'url': row[0],
+                'content_hash': row[1],
+                'headers': json.loads(row[2]),
+                'etag': row[3],
+                'last_modified': row[4],
+                'immutable': bool(row[5]),
+                'fetched_at': row[6],
+                'content': content
+            }
+        except FileNotFoundError:
+            logger.warning(f"HTTP cache body missing for {url}")
+            return None
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"HTTP cache read failed for {url}: {e}")
+            return None
+
+    def store(self, url: str, response: requests.Response, immutable: bool) -> None:
+        """Write the body under its content hash and (re)index the URL"""
+        try:
+            content = response.content
+            content_hash = hashlib.sha256(content).hexdigest()
+            blob_path = self._blob_path(content_hash)
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, blob_path)
+
+            headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_pages "
+                    "(url, content_hash, headers, etag, last_modified, immutable, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, content_hash, json.dumps(headers), headers.get('ETag'),
+                     headers.get('Last-Modified'), int(immutable), time.time())
+                )
+            self.writes += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"HTTP cache write failed for {url}: {e}")
+
+    def touch(self, url: str, immutable: bool) -> None:
+        """Record a successful revalidation (304)"""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "UPDATE http_pages SET fetched_at = ?, immutable = ? WHERE url = ?",
+                    (time.time(), int(immutable), url)
+                )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"HTTP cache update failed for {url}: {e}")
+
+    def clear(self) -> None:
+        """Forget every cached page (bodies are left for the OS temp cleaner)"""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM http_pages")
+        except Exception as e:
+            logger.warning(f"HTTP cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size for monitoring"""
+        entries = 0
+        try:
+            with self._lock, self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM http_pages").fetchone()[0]
+        except Exception as e:
+            logger.warning(f"HTTP cache stats failed: {e}")
+
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            'directory': str(self.directory),
+            'entries': entries,
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.revalidated) / lookups, 4) if lookups else 0.0,
+            'writes': self.writes,
+            'errors': self.errors
+        }
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.directory / 'blobs' / content_hash[:2] / content_hash
+
+    def _connect(self) -> ClosingConnection:
+        return self._db.connect()
+
+
+class CachedSession(requests.Session):
+    """requests.Session that serves GETs from an HTTPCacheStore.
+
+    Modes:
+      - ``default``: immutable or recently fetched pages come from disk; others
+        are revalidated with If-None-Match / If-Modified-Since.
+      - ``replay``: never touch the network; uncached pages raise CacheMissError.
+      - ``refresh``: always download, but still write through to the cache.
+    """
+
+    def __init__(self, store: 'HTTPCacheStore', mode: str = 'default', max_age_seconds: int = 0):
+        super().__init__()
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.store = store
+        self.mode = mode
+        self.max_age_seconds = max_age_seconds
+
+    def fresh_response(self, url: str) -> Optional[requests.Response]:
+        """Cached response that can be used without any network round trip"""
+        if self.mode == 'refresh':
+            return None
+        entry = self.store.lookup(url)
+        if entry is None:
+            return None
+        if self.mode == 'replay' or entry['immutable'] or is_immutable(url) or (
+            self.max_age_seconds and time.time() - entry['fetched_at'] < self.max_age_seconds
+        ):
+            self.store.hits += 1
+            return self._from_entry(entry, 'HIT')
+        return None
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET':
+            return super().request(method, url, *args, **kwargs)
+
+        fresh = self.fresh_response(url)
+        if fresh is not None:
+            return fresh
+        if self.mode == 'replay':
+            self.store.misses += 1
+            raise CacheMissError(f"{url} is not in the HTTP cache (replay mode)")
+
+        entry = self.store.lookup(url) if self.mode == 'default' else None
+        if entry is not None:
+            headers = dict(kwargs.pop('headers', None) or {})
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+            kwargs['headers'] = headers
+
+        response = super().request(method, url, *args, **kwargs)
+        immutable = is_immutable(url)
+
+        if response.status_code == 304 and entry is not None:
+            self.store.revalidated += 1
+            self.store.touch(url, immutable)
+            return self._from_entry(entry, 'REVALIDATED')
+
+        self.store.misses += 1
+        if response.status_code == 200:
+            self.store.store(url, response, immutable)
+        return response
+
+    @staticmethod
+    def _from_entry(entry: Dict[str, Any], cache_status: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry['url']
+        response._content = entry['content']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['X-Cache'] = cache_status
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.reason = 'OK'
+        return response
+
+
+# Shared by every scraper session in the process
+http_cache_store = HTTPCacheStore(settings.scraper_cache_dir)
+
+
+def create_scraper_session(user_agent: Optional[str] = None, mode: Optional[str] = None) -> requests.Session:
+    """Session for afltables scrapers, backed by the on-disk cache unless disabled"""
+    if settings.scraper_cache_enabled:
+        session = CachedSession(
+            http_cache_store,
+            mode=mode or settings.scraper_cache_mode,
+            max_age_seconds=settings.scraper_cache_max_age_seconds
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({'User-Agent': user_agent or settings.user_agent})
+    return session
@@ -0,0 +1,720 @@
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cells mentioning one of these hold venue details
+VENUE_HINTS = ['MCG', 'SCG', 'Optus Stadium', 'Marvel Stadium']
+KNOWN_VENUES = VENUE_HINTS + ['Adelaide Oval', 'Gabba', 'GMHBA Stadium']
+ROUND_PATTERN = re.compile(r'Round (\d+)')
+DATE_PATTERN = re.compile(r'(\w{3}\s+\d{1,2}-\w{3}-\d{4})')
+TIME_PATTERN = re.compile(r'(\d{1,2}:\d{2}\s*[ap]m)', re.IGNORECASE)
+SCORE_PATTERN = re.compile(r'(\d+)\.(\d+)\.(\d+)')
+VENUE_PATTERN = re.compile(r'Venue:\s*([^(]+)')
+ATTENDANCE_PATTERN = re.compile(r'Attendance:\s*(\d+)')
+STATS_ROUND_PATTERN = re.compile(r'Round:\s*(\d+)')
+STATS_LINK_ROUND_PATTERN = re.compile(r'/(\d{1,2})/')
+STATS_DATE_PATTERN = re.compile(r'Date:\s*([^,]+,\s*\d+-\w+-\d+\s+\d+:\d+\s+\w+)')
+
+# Player stats columns after jumper number and name, in page order
+STAT_COLUMNS = [
+    'kicks', 'marks', 'handballs', 'disposals', 'goals', 'behinds', 'hit_outs', 'tackles',
+    'rebound_50s', 'inside_50s', 'clearances', 'clangers', 'free_kicks_for', 'free_kicks_against',
+]
+# Columns that older pages may not have, with their defaults
+OPTIONAL_STAT_COLUMNS = [
+    ('brownlow_votes', 0), ('contested_possessions', 0), ('uncontested_possessions', 0),
+    ('contested_marks', 0), ('marks_inside_50', 0), ('one_percenters', 0), ('bounces', 0),
+    ('goal_assists', 0), ('percentage_played', 100),
+]
+
+
+class ParserBackend(ABC):
+    """Extracts structured data from afltables season and game stats pages"""
+
+    name = ''
+
+    @abstractmethod
+    def parse_season_page(self, content: bytes, season: int) -> List[Dict]:
+        """Normalized games from a ``seas/{season}.html`` page.
+
+        Every game carries season, round, game_date, venue, teams, scores,
+        attendance and ``is_finished`` (true when both scores are present).
+        """
+
+    @abstractmethod
+    def parse_season_games(self, content: bytes, season: int, base_url: str) -> List[Dict]:
+        """Games with their match stats links from a ``seas/{season}.html`` page, as the backfill reads it.
+
+        Each game carries teams, scores, round, venue, game_date, an absolute
+        ``stats_link`` (under ``base_url``) and a ``game_id``; one game per id.
+        """
+
+    @abstractmethod
+    def parse_game_stats(self, content: bytes) -> Dict:
+        """``{'game_details', 'player_stats'}`` from a ``stats/games/...`` page"""
+
+
+def _deduplicate_games(games: List[Dict]) -> List[Dict]:
+    """Remove duplicate games based on teams, round, and season, then sort by date"""
+    seen = set()
+    unique_games = []
+    for game in games:
+        key = (game.get('home_team'), game.get('away_team'), game.get('round'), game.get('season'))
+        if key not in seen and all(key):
+            seen.add(key)
+            unique_games.append(game)
+    unique_games.sort(key=lambda x: x.get('game_date') or datetime.min)
+    return unique_games
+
+
+def _parse_score(score_text: str) -> Dict:
+    """Parse AFL score format (goals.behinds.total), falling back to just the total"""
+    score_parts = score_text.split('.')
+    if len(score_parts) >= 3:
+        return {
+            'goals': int(score_parts[0]),
+            'behinds': int(score_parts[1]),
+            'total': int(score_parts[2]),
+            'raw': score_text
+        }
+    return {
+        'total': int(score_text),
+        'raw': score_text
+    }
+
+
+def _stat_value(text: str) -> int:
+    """Integer value of a stripped statistic cell (blank or non-numeric is 0)"""
+    try:
+        if text and text != '&nbsp;':
+            return int(text)
+        return 0
+    except ValueError:
+        return 0
+
+
+def _game_from_cells(home_texts: List[str], away_texts: List[str], home_row_text: str,
+                     away_row_text: str, season: int, round_num: Optional[int]) -> Dict:
+    """Build a season-page game from the stripped cell texts of its two rows"""
+    game_date = None
+    venue = None
+    attendance = None
+
+    for cell_texts in (home_texts, away_texts):
+        for cell_text in cell_texts:
+            date_match = DATE_PATTERN.search(cell_text)
+            if date_match and not game_date:
+                try:
+                    game_date = datetime.strptime(date_match.group(1), '%a %d-%b-%Y')
+                except ValueError:
+                    pass
+
+            time_match = TIME_PATTERN.search(cell_text)
+            if time_match and game_date:
+                try:
+                    time_obj = datetime.strptime(time_match.group(1), '%I:%M %p').time()
+                    game_date = datetime.combine(game_date.date(), time_obj)
+                except ValueError:
+                    pass
+
+            if 'Venue:' in cell_text or any(name in cell_text for name in VENUE_HINTS):
+                venue_match = VENUE_PATTERN.search(cell_text)
+                if venue_match:
+                    venue = venue_match.group(1).strip()
+                else:
+                    venue = next((name for name in KNOWN_VENUES if name in cell_text), venue)
+
+            attendance_match = ATTENDANCE_PATTERN.search(cell_text)
+            if attendance_match:
+                attendance = int(attendance_match.group(1))
+
+    if not round_num:
+        for row_text in (home_row_text, away_row_text):
+            round_match = ROUND_PATTERN.search(row_text)
+            if round_match:
+                round_num = int(round_match.group(1))
+                break
+
+    home_score = _score_from_cells(home_texts)
+    away_score = _score_from_cells(away_texts)
+
+    return {
+        'season': season,
+        'round': round_num,
+        'game_date': game_date,
+        'venue': venue,
+        'home_score': home_score,
+        'away_score': away_score,
+        'attendance': attendance,
+        'is_finished': home_score is not None and away_score is not None
+    }
+
+
+def _score_from_cells(cell_texts: List[str]) -> Optional[int]:
+    """Total score from the first score-like cell of a team row"""
+    for cell_text in cell_texts:
+        score_match = SCORE_PATTERN.search(cell_text)
+        if score_match:
+            return int(score_match.group(3))
+        if cell_text.isdigit() and len(cell_text) <= 3:
+            return int(cell_text)
+    return None
+
+
+def _linked_game(home_texts: List[str], away_texts: List[str], home_team: str, away_team: str,
+                 stats_href: Optional[str], season: int, round_num: Optional[int], base_url: str) -> Optional[Dict]:
+    """Build a backfill game from the stripped cell texts of its two rows and its stats link"""
+    # Skip if same team (this shouldn't happen in real games)
+    if home_team == away_team:
+        return None
+
+    # Scores are the third column
+    home_score = int(home_texts[2]) if home_texts[2].isdigit() else 0
+    away_score = int(away_texts[2]) if away_texts[2].isdigit() else 0
+
+    # Venue and date come from the away row's last cell
+    game_details = away_texts[-1]
+    venue = None
+    game_date = None
+    venue_match = VENUE_PATTERN.search(game_details)
+    if venue_match:
+        venue = venue_match.group(1).strip()
+    date_match = DATE_PATTERN.search(game_details)
+    if date_match:
+        try:
+            game_date = datetime.strptime(date_match.group(1), '%a %d-%b-%Y')
+        except ValueError:
+            pass
+
+    stats_link = None
+    if stats_href and 'stats/games' in stats_href:
+        if stats_href.startswith('../'):
+            stats_href = stats_href[3:]
+        stats_link = f"{base_url}/{stats_href}"
+
+        # Round number from the stats link if the page didn't give one
+        if not round_num:
+            round_match = STATS_LINK_ROUND_PATTERN.search(stats_href)
+            if round_match:
+                round_num = int(round_match.group(1))
+
+    if not round_num:
+        round_match = ROUND_PATTERN.search(game_details)
+        if round_match:
+            round_num = int(round_match.group(1))
+
+    return {
+        'home_team': home_team,
+        'away_team': away_team,
+        'home_score': home_score,
+        'away_score': away_score,
+        'season': season,
+        'round': round_num,
+        'venue': venue,
+        'game_date': game_date,
+        'stats_link': stats_link,
+        'game_id': f"{season}_r{round_num}_{home_team}_{away_team}" if round_num else f"{season}_{home_team}_{away_team}"
+    }
+
+
+def _unique_game_ids(games: List[Dict]) -> List[Dict]:
+    """First game for each game_id, in page order"""
+    unique_games = {}
+    for game in games:
+        game_id = game.get('game_id', '')
+        if game_id and game_id not in unique_games:
+            unique_games[game_id] = game
+    return list(unique_games.values())
+
+
+def _game_details_from_rows(first_row_text: str, venue_text: Optional[str], team_rows: List) -> Dict:
+    """Build game stats page details; ``team_rows`` are (team_name, [score cell texts])"""
+    details = {}
+
+    if 'Round:' in first_row_text:
+        round_match = STATS_ROUND_PATTERN.search(first_row_text)
+        if round_match:
+            details['round'] = int(round_match.group(1))
+
+    if venue_text is not None:
+        details['venue'] = venue_text
+
+    date_match = STATS_DATE_PATTERN.search(first_row_text)
+    if date_match:
+        details['date'] = date_match.group(1).strip()
+
+    attendance_match = ATTENDANCE_PATTERN.search(first_row_text)
+    if attendance_match:
+        details['attendance'] = int(attendance_match.group(1))
+
+    team_scores = {}
+    for team_name, score_texts in team_rows:
+        team_scores[team_name] = [_parse_score(text) for text in score_texts if text]
+    details['team_scores'] = team_scores
+
+    return details
+
+
+def _player_afl_id(href: Optional[str], name: str) -> str:
+    """afltables player key from a profile link (``../../players/P/Patrick_Dangerfield.html``).
+
+    The site suffixes namesakes (``Josh_Kennedy1``), so the key tells apart
+    players that share a name. Falls back to the name when there is no link.
+    """
+    if href:
+        key = href.rstrip('/').rsplit('/', 1)[-1]
+        if key.endswith('.html'):
+            key = key[:-len('.html')]
+        if key:
+            return key
+    return name.replace(' ', '_')
+
+
+def _player_stats(jumper_number: str, stat_texts: List[str]) -> Dict:
+    """Map a player row's stripped stat cell texts (from the kicks column on) to named stats"""
+    stats = {'jumper_number': jumper_number}
+    for index, column in enumerate(STAT_COLUMNS):
+        stats[column] = _stat_value(stat_texts[index])
+    offset = len(STAT_COLUMNS)
+    for index, (column, default) in enumerate(OPTIONAL_STAT_COLUMNS):
+        position = offset + index
+        stats[column] = _stat_value(stat_texts[position]) if len(stat_texts) > position else default
+    return stats
+
+
+class SoupParser(ParserBackend):
+    """Reference implementation on BeautifulSoup's html.parser"""
+
+    name = 'soup'
+
+    def parse_season_page(self, content: bytes, season: int) -> List[Dict]:
+        soup = BeautifulSoup(content, 'html.parser')
+        games = []
+        current_round = None
+
+        for table in soup.find_all('table'):
+            rows = table.find_all('tr')
+
+            # Look for round headers
+            for row in rows:
+                round_match = ROUND_PATTERN.search(row.get_text())
+                if round_match:
+                    current_round = int(round_match.group(1))
+
+            # Game tables have at least two team links
+            if len(table.find_all('a', href=self._is_team_link)) >= 2:
+                games.extend(self._parse_game_table(rows, season, current_round))
+
+        return _deduplicate_games(games)
+
+    def _parse_game_table(self, rows, season: int, current_round: Optional[int]) -> List[Dict]:
+        games = []
+        i = 0
+        while i < len(rows):
+            row = rows[i]
+            team_link = row.find('a', href=self._is_team_link)
+            if not team_link:
+                i += 1
+                continue
+
+            if i + 1 < len(rows):
+                away_row = rows[i + 1]
+                away_team_link = away_row.find('a', href=self._is_team_link)
+                if away_team_link:
+                    game_data = self._extract_game(row, away_row, season, current_round)
+                    if game_data:
+                        game_data['home_team'] = team_link.get_text(strip=True)
+                        game_data['away_team'] = away_team_link.get_text(strip=True)
+                        games.append(game_data)
+                    i += 2
+                    continue
+
+            i += 1
+
+        return games
+
+    def _extract_game(self, home_row, away_row, season: int, round_num: Optional[int]) -> Optional[Dict]:
+        try:
+            return _game_from_cells(
+                [cell.get_text(strip=True) for cell in home_row.find_all(['td', 'th'])],
+                [cell.get_text(strip=True) for cell in away_row.find_all(['td', 'th'])],
+                home_row.get_text(), away_row.get_text(), season, round_num
+            )
+        except Exception as e:
+            logger.error(f"Error extracting game details: {str(e)}")
+            return None
+
+    def parse_season_games(self, content: bytes, season: int, base_url: str) -> List[Dict]:
+        soup = BeautifulSoup(content, 'html.parser')
+        games = []
+        current_round = None
+
+        for table in soup.find_all('table'):
+            rows = table.find_all('tr')
+            if not rows:
+                continue
+
+            # Round header tables start with "Round N"
+            first_row_text = rows[0].get_text()
+            if 'Round' in first_row_text:
+                round_match = ROUND_PATTERN.search(first_row_text)
+                if round_match:
+                    current_round = int(round_match.group(1))
+                    continue
+
+            # Game tables hold (home, away) row pairs
+            if len(table.find_all('a', href=self._is_team_link)) >= 2:
+                for i in range(0, len(rows) - 1, 2):
+                    game_data = self._extract_linked_game(rows[i], rows[i + 1], season, current_round, base_url)
+                    if game_data:
+                        games.append(game_data)
+
+        return _unique_game_ids(games)
+
+    def _extract_linked_game(self, home_row, away_row, season: int, round_num: Optional[int],
+                             base_url: str) -> Optional[Dict]:
+        try:
+            home_cells = home_row.find_all(['td', 'th'])
+            away_cells = away_row.find_all(['td', 'th'])
+            if len(home_cells) < 4 or len(away_cells) < 4:
+                return None
+
+            home_team_link = home_cells[0].find('a', href=self._is_team_link)
+            away_team_link = away_cells[0].find('a', href=self._is_team_link)
+            if not home_team_link or not away_team_link:
+                return None
+
+            stats_a = away_cells[-1].find('a', href=True)
+            return _linked_game(
+                [cell.get_text(strip=True) for cell in home_cells],
+                [cell.get_text(strip=True) for cell in away_cells],
+                home_team_link.get_text(strip=True), away_team_link.get_text(strip=True),
+                stats_a['href'] if stats_a else None, season, round_num, base_url
+            )
+        except Exception as e:
+            logger.error(f"Error parsing game rows: {str(e)}")
+            return None
+
+    def parse_game_stats(self, content: bytes) -> Dict:
+        soup = BeautifulSoup(content, 'html.parser')
+        return {
+            'game_details': self._extract_game_details(soup),
+            'player_stats': self._extract_player_stats(soup)
+        }
+
+    def _extract_game_details(self, soup: BeautifulSoup) -> Dict:
+        try:
+            # Find the main game table
+            game_table = soup.find('table', style=lambda x: x and 'font: 12px Verdana' in x)
+            if not game_table:
+                return {}
+
+            rows = game_table.find_all('tr')
+            if len(rows) < 3:
+                return {}
+
+            # Round, venue, date and attendance are in the first row
+            first_row = rows[0]
+            venue_link = first_row.find('a', href=lambda x: x and 'venues' in x)
+
+            team_rows = []
+            for team_row in rows[1:3]:
+                team_link = team_row.find('a', href=lambda x: x and 'teams' in x)
+                if team_link:
+                    team_rows.append((
+                        team_link.get_text().strip(),
+                        [cell.get_text().strip() for cell in team_row.find_all('td')[1:5]]
+                    ))
+
+            return _game_details_from_rows(
+                first_row.get_text(),
+                venue_link.get_text().strip() if venue_link else None,
+                team_rows
+            )
+
+        except Exception as e:
+            logger.error(f"Error extracting game details: {str(e)}")
+            return {}
+
+    def _extract_player_stats(self, soup: BeautifulSoup) -> Dict:
+        try:
+            player_stats = {}
+
+            for table in soup.find_all('table', class_='sortable'):
+                # Check if this is a player stats table
+                header = table.find('th')
+                if not header or 'Match Statistics' not in header.get_text():
+                    continue
+
+                team_name = header.get_text().split('Match Statistics')[0].strip()
+
+                tbody = table.find('tbody')
+                if not tbody:
+                    continue
+
+                players = []
+                for row in tbody.find_all('tr'):
+                    cells = row.find_all('td')
+                    if len(cells) < 15:  # Need minimum columns for stats
+                        continue
+
+                    player_link = cells[1].find('a')
+                    if not player_link:
+                        continue
+
+                    name = player_link.get_text().strip()
+                    players.append({
+                        'name': name,
+                        'afl_id': _player_afl_id(player_link.get('href'), name),
+                        'stats': _player_stats(
+                            cells[0].get_text().strip(),
+                            [cell.get_text().strip() for cell in cells[2:]]
+                        )
+                    })
+
+                player_stats[team_name] = players
+
+            return player_stats
+
+        except Exception as e:
+            logger.error(f"Error extracting player stats: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _is_team_link(href: Optional[str]) -> bool:
+        return bool(href) and 'teams/' in href
+
+
+# Compiled once; XPath evaluation happens in libxml2
+_TEAM_LINKS = etree.XPath(".//a[contains(@href, 'teams/')]")
+_COUNT_TEAM_LINKS = etree.XPath("count(.//a[contains(@href, 'teams/')])")
+_GAME_TABLE = etree.XPath("//table[contains(@style, 'font: 12px Verdana')]")
+_VENUE_LINK = etree.XPath(".//a[contains(@href, 'venues')]")
+_STATS_TEAM_LINK = etree.XPath(".//a[contains(@href, 'teams')]")
+_SORTABLE_TABLES = etree.XPath("//table[contains(concat(' ', normalize-space(@class), ' '), ' sortable ')]")
+
+
+def _text(element) -> str:
+    """Equivalent of BeautifulSoup's ``get_text()``"""
+    return ''.join(element.itertext())
+
+
+def _stripped_text(element) -> str:
+    """Equivalent of BeautifulSoup's ``get_text(strip=True)``"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+class LxmlParser(ParserBackend):
+    """lxml/XPath implementation producing the same output as ``SoupParser``"""
+
+    name = 'lxml'
+
+    def parse_season_page(self, content: bytes, season: int) -> List[Dict]:
+        document = lxml_html.document_fromstring(content)
+        games = []
+        current_round = None
+
+        for table in document.iter('table'):
+            rows = list(table.iter('tr'))
+            row_texts = [_text(row) for row in rows]
+
+            for row_text in row_texts:
+                round_match = ROUND_PATTERN.search(row_text)
+                if round_match:
+                    current_round = int(round_match.group(1))
+
+            if _COUNT_TEAM_LINKS(table) >= 2:
+                games.extend(self._parse_game_table(rows, row_texts, season, current_round))
+
+        return _deduplicate_games(games)
+
+    def _parse_game_table(self, rows, row_texts: List[str], season: int,
+                          current_round: Optional[int]) -> List[Dict]:
+        games = []
+        team_links = [_TEAM_LINKS(row) for row in rows]
+        i = 0
+        while i < len(rows):
+            if not team_links[i]:
+                i += 1
+                continue
+
+            if i + 1 < len(rows) and team_links[i + 1]:
+                try:
+                    game_data = _game_from_cells(
+                        [_stripped_text(cell) for cell in rows[i].iter('td', 'th')],
+                        [_stripped_text(cell) for cell in rows[i + 1].iter('td', 'th')],
+                        row_texts[i], row_texts[i + 1], season, current_round
+                    )
+                except Exception as e:
+                    logger.error(f"Error extracting game details: {str(e)}")
+                    game_data = None
+                if game_data:
+                    game_data['home_team'] = _stripped_text(team_links[i][0])
+                    game_data['away_team'] = _stripped_text(team_links[i + 1][0])
+                    games.append(game_data)
+                i += 2
+                continue
+
+            i += 1
+
+        return games
+
+    def parse_season_games(self, content: bytes, season: int, base_url: str) -> List[Dict]:
+        document = lxml_html.document_fromstring(content)
+        games = []
+        current_round = None
+
+        for table in document.iter('table'):
+            rows = list(table.iter('tr'))
+            if not rows:
+                continue
+
+            first_row_text = _text(rows[0])
+            if 'Round' in first_row_text:
+                round_match = ROUND_PATTERN.search(first_row_text)
+                if round_match:
+                    current_round = int(round_match.group(1))
+                    continue
+
+            if _COUNT_TEAM_LINKS(table) >= 2:
+                for i in range(0, len(rows) - 1, 2):
+                    game_data = self._extract_linked_game(rows[i], rows[i + 1], season, current_round, base_url)
+                    if game_data:
+                        games.append(game_data)
+
+        return _unique_game_ids(games)
+
+    def _extract_linked_game(self, home_row, away_row, season: int, round_num: Optional[int],
+                             base_url: str) -> Optional[Dict]:
+        try:
+            home_cells = list(home_row.iter('td', 'th'))
+            away_cells = list(away_row.iter('td', 'th'))
+            if len(home_cells) < 4 or len(away_cells) < 4:
+                return None
+
+            home_team_links = _TEAM_LINKS(home_cells[0])
+            away_team_links = _TEAM_LINKS(away_cells[0])
+            if not home_team_links or not away_team_links:
+                return None
+
+            stats_a = next((a for a in away_cells[-1].iter('a') if a.get('href') is not None), None)
+            return _linked_game(
+                [_stripped_text(cell) for cell in home_cells],
+                [_stripped_text(cell) for cell in away_cells],
+                _stripped_text(home_team_links[0]), _stripped_text(away_team_links[0]),
+                stats_a.get('href') if stats_a is not None else None, season, round_num, base_url
+            )
+        except Exception as e:
+            logger.error(f"Error parsing game rows: {str(e)}")
+            return None
+
+    def parse_game_stats(self, content: bytes) -> Dict:
+        document = lxml_html.document_fromstring(content)
+        return {
+            'game_details': self._extract_game_details(document),
+            'player_stats': self._extract_player_stats(document)
+        }
+
+    def _extract_game_details(self, document) -> Dict:
+        try:
+            game_tables = _GAME_TABLE(document)
+            if not game_tables:
+                return {}
+
+            rows = list(game_tables[0].iter('tr'))
+            if len(rows) < 3:
+                return {}
+
+            first_row = rows[0]
+            venue_links = _VENUE_LINK(first_row)
+
+            team_rows = []
+            for team_row in rows[1:3]:
+                team_links = _STATS_TEAM_LINK(team_row)
+                if team_links:
+                    team_rows.append((
+                        _text(team_links[0]).strip(),
+                        [_text(cell).strip() for cell in list(team_row.iter('td'))[1:5]]
+                    ))
+
+            return _game_details_from_rows(
+                _text(first_row),
+                _text(venue_links[0]).strip() if venue_links else None,
+                team_rows
+            )
+
+        except Exception as e:
+            logger.error(f"Error extracting game details: {str(e)}")
+            return {}
+
+    def _extract_player_stats(self, document) -> Dict:
+        try:
+            player_stats = {}
+
+            for table in _SORTABLE_TABLES(document):
+                header = next(table.iter('th'), None)
+                if header is None:
+                    continue
+                header_text = _text(header)
+                if 'Match Statistics' not in header_text:
+                    continue
+
+                team_name = header_text.split('Match Statistics')[0].strip()
+
+                tbody = next(table.iter('tbody'), None)
+                if tbody is None:
+                    continue
+
+                players = []
+                for row in tbody.iter('tr'):
+                    cells = list(row.iter('td'))
+                    if len(cells) < 15:
+                        continue
+
+                    player_link = next(cells[1].iter('a'), None)
+                    if player_link is None:
+                        continue
+
+                    name = _text(player_link).strip()
+                    players.append({
+                        'name': name,
+                        'afl_id': _player_afl_id(player_link.get('href'), name),
+                        'stats': _player_stats(
+                            _text(cells[0]).strip(),
+                            [_text(cell).strip() for cell in cells[2:]]
+                        )
+                    })
+
+                player_stats[team_name] = players
+
+            return player_stats
+
+        except Exception as e:
+            logger.error(f"Error extracting player stats: {str(e)}")
+            return {}
+
+
+PARSER_BACKENDS = {
+    SoupParser.name: SoupParser,
+    LxmlParser.name: LxmlParser,
+}
+_parsers: Dict[str, ParserBackend] = {}
+
+
+def get_parser(name: Optional[str] = None) -> ParserBackend:
+    """Parser backend by name (default: the ``scraper_parser_backend`` setting)"""
+    name = name or settings.scraper_parser_backend
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name} (expected one of {', '.join(PARSER_BACKENDS)})")
+    if name not in _parsers:
+        _parsers[name] = PARSER_BACKENDS[name]()
+    return _parsers[name]
@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from app.core.config import settings
+from app.scrapers.constants import DEFAULT_BASE_URL, USER_AGENT
+from app.scrapers.http_cache import create_scraper_session
+from app.scrapers.parsing import get_parser
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_season_page(content: bytes, season: int) -> List[Dict]:
+    """Parse a ``seas/{season}.html`` page into one normalized list of games.
+
+    Every game carries season, round, game_date, venue, teams, scores,
+    attendance and ``is_finished`` (true when both scores are present), so
+    fixture and results consumers can filter the same list.
+    """
+    return get_parser().parse_season_page(content, season)
+
+
+class SeasonFixtureCache:
+    """Per-season cache of parsed season pages with a short TTL.
+
+    Concurrent callers asking for the same season wait for a single download
+    and parse. Callers receive copies of the game dicts, so filtering or
+    annotating them never leaks into the shared list.
+    """
+
+    def __init__(self, ttl_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[Dict]]] = {}
+        self._locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_season(self, season: int, base_url: str = DEFAULT_BASE_URL,
+                   session: Optional[requests.Session] = None) -> Dict:
+        """Return ``{'success', 'games', 'season'}`` for a season, parsing at most once per TTL"""
+        key = (base_url.rstrip('/'), season)
+        try:
+            with self._lock:
+                season_lock = self._locks.setdefault(key, threading.Lock())
+
+            with season_lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.time() - entry[0] < self.ttl_seconds:
+                    self.hits += 1
+                    games = entry[1]
+                else:
+                    self.misses += 1
+                    games = self._load(key[0], season, session)
+                    self._entries[key] = (time.time(), games)
+
+            return {
+                'success': True,
+                'games': [dict(game) for game in games],
+                'season': season
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting season {season} page: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def invalidate(self, season: Optional[int] = None) -> None:
+        """Drop one season (or everything), e.g. after results are known to have changed"""
+        with self._lock:
+            if season is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[1] == season]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _load(self, base_url: str, season: int, session: Optional[requests.Session]) -> List[Dict]:
+        if session is None:
+            if self._session is None:
+                self._session = create_scraper_session(USER_AGENT)
+            session = self._session
+
+        response = session.get(f"{base_url}/seas/{season}.html")
+        response.raise_for_status()
+        games = parse_season_page(response.content, season)
+        logger.info(f"Parsed {len(games)} games from the {season} season page")
+        return games
+
+
+# Shared by the upcoming and results scrapers (and so by the scheduler jobs)
+season_fixture_cache = SeasonFixtureCache(ttl_seconds=settings.season_fixture_ttl_seconds)
@@ -0,0 +1,228 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.models.analytics import Analytics
+from app.models.game import Game
+from app.models.prediction import Prediction
+from app.services.analytics_service import analytics_service, COUNT_KEYS
+
+logger = logging.getLogger(__name__)
+
+PERIOD_TYPES = ('daily', 'weekly', 'monthly', 'season')
+DATE_PERIOD_TYPES = ('daily', 'weekly', 'monthly')
+# model_version stored on rollup rows that cover every model
+ALL_MODELS = 'all'
+
+METRIC_FIELDS = COUNT_KEYS + (
+    'accuracy_percentage', 'high_confidence_accuracy', 'medium_confidence_accuracy',
+    'low_confidence_accuracy', 'betting_roi', 'average_confidence',
+)
+
+# (period_type, period_start, season)
+BucketKey = Tuple[str, datetime, Optional[int]]
+
+
+def period_bounds(period_type: str, moment: datetime) -> Tuple[datetime, datetime]:
+    """Start (inclusive) and end (exclusive) of the calendar period containing ``moment``"""
+    day = datetime(moment.year, moment.month, moment.day)
+    if period_type == 'daily':
+        return day, day + timedelta(days=1)
+    if period_type == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+    if period_type == 'monthly':
+        start = day.replace(day=1)
+        end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+        return start, end
+    if period_type == 'season':
+        return datetime(moment.year, 1, 1), datetime(moment.year + 1, 1, 1)
+    raise ValueError(f"Unknown period type: {period_type}")
+
+
+class AnalyticsRollupService:
+    """Keeps pre-aggregated rows in the analytics table current.
+
+    Daily, weekly and monthly rows bucket predictions by prediction_date; season
+    rows bucket by the game's season. Each bucket has one row per model version
+    plus an ``all`` row, and only buckets touched by newly evaluated predictions
+    are recomputed.
+    """
+
+    def refresh_for_predictions(self, db: Session, evaluated: Iterable[Tuple[Optional[datetime], Optional[int]]]) -> Dict:
+        """Refresh the buckets containing just evaluated predictions.
+
+        ``evaluated`` holds each prediction's (prediction_date, game season),
+        collected by the caller while the rows are loaded, before its commit.
+        """
+        return self.refresh_buckets(db, self._touched_buckets(evaluated))
+
+    def refresh_pending(self, db: Session, full: bool = False) -> Dict:
+        """Refresh buckets for predictions evaluated since the last rollup (or all of them).
+
+        The watermark is the latest rollup write, but a prediction's
+        updated_at is stamped when its transaction flushes, not when it
+        commits; one committed after a concurrent refresh can sit behind
+        the watermark. Re-scanning an overlap window catches those, at the
+        cost of recomputing a few recent buckets again.
+        """
+        query = db.query(Prediction.prediction_date, Game.season).join(
+            Game, Game.id == Prediction.game_id
+        ).filter(Prediction.is_correct.isnot(None))
+
+        watermark = None
+        if not full:
+            watermark = db.query(func.max(Analytics.updated_at)).filter(
+                Analytics.period_type.in_(PERIOD_TYPES)
+            ).scalar()
+            if watermark is not None:
+                watermark -= timedelta(seconds=settings.analytics_refresh_overlap_seconds)
+                query = query.filter(Prediction.updated_at > watermark)
+
+        result = self.refresh_buckets(db, self._touched_buckets(query.distinct()))
+        if result['success']:
+            logger.info(f"Analytics rollups refreshed: {result['buckets_refreshed']} buckets"
+                        f" (since {watermark or 'beginning'})")
+        return result
+
+    def refresh_buckets(self, db: Session, buckets: Set[BucketKey]) -> Dict:
+        """Recompute and upsert the rollup rows for each bucket, then commit"""
+        try:
+            for period_type, period_start, season in sorted(buckets, key=lambda b: (b[0], b[1])):
+                self._refresh_bucket(db, period_type, period_start, season)
+            db.commit()
+            if buckets:
+                response_cache.invalidate('analytics')
+            return {'success': True, 'buckets_refreshed': len(buckets)}
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error refreshing analytics rollups: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+    def overview(self, db: Session, period: str, now: datetime, season: Optional[int] = None,
+                 model_version: Optional[str] = None) -> Tuple[datetime, Dict]:
+        """Combine rollup rows into the metrics shown on the dashboard overview.
+
+        ``week`` and ``month`` cover the last 7/30 calendar days, ``season`` the
+        current calendar year and ``all`` everything. A ``season`` filter with
+        ``all`` reads that season's row directly; combined with a shorter period
+        it is the intersection of both, which the date rollups (not split by
+        season) can't answer, so it is one live aggregate over that period.
+        """
+        today = datetime(now.year, now.month, now.day)
+        if period == 'week':
+            start_date, period_type = today - timedelta(days=6), 'daily'
+        elif period == 'month':
+            start_date, period_type = today - timedelta(days=29), 'daily'
+        elif period == 'season':
+            start_date, period_type = datetime(now.year, 1, 1), 'monthly'
+        else:  # all
+            start_date, period_type = datetime(2000, 1, 1), 'season'
+
+        if season is not None and period_type != 'season':
+            return start_date, analytics_service.prediction_metrics(
+                db, start_date=start_date, season=season, model_version=model_version
+            )[0]
+
+        query = db.query(Analytics).filter(
+            Analytics.model_version == (model_version or ALL_MODELS),
+            Analytics.period_type == period_type
+        )
+        if season is not None:
+            start_date = datetime(season, 1, 1)
+            query = query.filter(Analytics.season == season)
+        elif period_type != 'season':
+            query = query.filter(Analytics.period_start >= start_date)
+
+        return start_date, analytics_service.combine_metrics(
+            self._row_metrics(row) for row in query.all()
+        )
+
+    def trends(self, db: Session, days: int, now: datetime) -> List[Dict]:
+        """Daily accuracy over the last ``days`` days from the daily rollups"""
+        start_date = datetime(now.year, now.month, now.day) - timedelta(days=days)
+        rows = db.query(Analytics).filter(
+            Analytics.period_type == 'daily',
+            Analytics.model_version == ALL_MODELS,
+            Analytics.period_start >= start_date
+        ).order_by(Analytics.period_start).all()
+
+        return [
+            {
+                'date': row.period_start.date().isoformat(),
+                'total_predictions': row.total_predictions,
+                'correct_predictions': row.correct_predictions,
+                'accuracy_percentage': row.accuracy_percentage
+            }
+            for row in rows
+        ]
+
+    def get_bucket(self, db: Session, period_type: str, moment: datetime,
+                   model_version: str = ALL_MODELS) -> Optional[Analytics]:
+        """Return the stored rollup row for the period containing ``moment``"""
+        period_start, _ = period_bounds(period_type, moment)
+        return db.query(Analytics).filter(
+            Analytics.period_type == period_type,
+            Analytics.period_start == period_start,
+            Analytics.model_version == model_version
+        ).first()
+
+    def _refresh_bucket(self, db: Session, period_type: str, period_start: datetime,
+                        season: Optional[int]) -> None:
+        if period_type == 'season':
+            period_start, period_end = period_bounds('season', datetime(season, 1, 1))
+            per_model = analytics_service.prediction_metrics(db, season=season, group_by=['model_version'])
+        else:
+            period_start, period_end = period_bounds(period_type, period_start)
+            per_model = analytics_service.prediction_metrics(
+                db, start_date=period_start, end_date=period_end, group_by=['model_version']
+            )
+
+        metrics_by_model = {metrics.pop('model_version') or 'unknown': metrics for metrics in per_model}
+        if metrics_by_model:
+            metrics_by_model[ALL_MODELS] = analytics_service.combine_metrics(metrics_by_model.values())
+
+        existing = {
+            row.model_version: row
+            for row in db.query(Analytics).filter(
+                Analytics.period_type == period_type,
+                Analytics.period_start == period_start
+            )
+        }
+        for model_version, metrics in metrics_by_model.items():
+            row = existing.pop(model_version, None)
+            if row is None:
+                row = Analytics(period_type=period_type, period_start=period_start, model_version=model_version)
+                db.add(row)
+            row.period_end = period_end
+            row.season = season if period_type == 'season' else None
+            for field in METRIC_FIELDS:
+                setattr(row, field, metrics[field])
+            # Touch the row even if nothing changed so the refresh watermark advances
+            row.updated_at = datetime.utcnow()
+
+        # Buckets whose predictions disappeared (or changed model) no longer have rows
+        for row in existing.values():
+            db.delete(row)
+
+    @staticmethod
+    def _touched_buckets(rows: Iterable[Tuple[Optional[datetime], Optional[int]]]) -> Set[BucketKey]:
+        buckets: Set[BucketKey] = set()
+        for prediction_date, season in rows:
+            if prediction_date is not None:
+                for period_type in DATE_PERIOD_TYPES:
+                    buckets.add((period_type, period_bounds(period_type, prediction_date)[0], None))
+            if season is not None:
+                buckets.add(('season', datetime(season, 1, 1), season))
+        return buckets
+
+    @staticmethod
+    def _row_metrics(row: Analytics) -> Dict:
+        return {field: getattr(row, field) for field in METRIC_FIELDS}
+
+
+analytics_rollup_service = AnalyticsRollupService()
@@ -0,0 +1,197 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import select, union_all, func, case
+from sqlalchemy.orm import Session
+
+from app.models.game import Game
+from app.models.team import Team
+from app.models.prediction import Prediction
+
+logger = logging.getLogger(__name__)
+
+
+# Confidence buckets used across the dashboard
+HIGH_CONFIDENCE = 0.8
+MEDIUM_CONFIDENCE = 0.6
+BET_SIDES = ('home', 'away')
+METRIC_GROUPS = {
+    'model_version': Prediction.model_version,
+    'season': Game.season,
+}
+# Additive counters, used when merging pre-aggregated metrics
+COUNT_KEYS = (
+    'total_predictions', 'correct_predictions',
+    'high_confidence_total', 'high_confidence_correct',
+    'medium_confidence_total', 'medium_confidence_correct',
+    'low_confidence_total', 'low_confidence_correct',
+    'total_bets_recommended', 'winning_bets',
+)
+
+
+class AnalyticsService:
+    """Database-side aggregations for the analytics endpoints."""
+
+    def prediction_metrics(self, db: Session, start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None, season: Optional[int] = None,
+                           model_version: Optional[str] = None,
+                           group_by: Sequence[str] = ()) -> List[Dict]:
+        """Accuracy, confidence-bucket and betting metrics for evaluated predictions.
+
+        Everything is computed in one statement with FILTER aggregates. With no
+        ``group_by`` a single row is returned; otherwise one row per group
+        (``model_version`` and/or ``season``). ``end_date`` is exclusive.
+        """
+        unknown = [key for key in group_by if key not in METRIC_GROUPS]
+        if unknown:
+            raise ValueError(f"Unsupported group_by: {', '.join(unknown)}")
+
+        correct = Prediction.is_correct == True
+        confidence = Prediction.confidence_score
+        high = confidence > HIGH_CONFIDENCE
+        medium = confidence.between(MEDIUM_CONFIDENCE, HIGH_CONFIDENCE)
+        low = confidence < MEDIUM_CONFIDENCE
+        bet = Prediction.recommended_bet.in_(BET_SIDES)
+
+        group_columns = [METRIC_GROUPS[key].label(key) for key in group_by]
+        stmt = select(
+            *group_columns,
+            func.count().label('total_predictions'),
+            func.count().filter(correct).label('correct_predictions'),
+            func.count().filter(high).label('high_confidence_total'),
+            func.count().filter(high & correct).label('high_confidence_correct'),
+            func.count().filter(medium).label('medium_confidence_total'),
+            func.count().filter(medium & correct).label('medium_confidence_correct'),
+            func.count().filter(low).label('low_confidence_total'),
+            func.count().filter(low & correct).label('low_confidence_correct'),
+            func.count().filter(bet).label('total_bets_recommended'),
+            func.count().filter(bet & correct).label('winning_bets'),
+            func.avg(confidence).label('average_confidence')
+        ).select_from(Prediction).where(Prediction.is_correct.isnot(None))
+
+        if season is not None or 'season' in group_by:
+            stmt = stmt.join(Game, Game.id == Prediction.game_id)
+        if start_date is not None:
+            stmt = stmt.where(Prediction.prediction_date >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(Prediction.prediction_date < end_date)
+        if season is not None:
+            stmt = stmt.where(Game.season == season)
+        if model_version is not None:
+            stmt = stmt.where(Prediction.model_version == model_version)
+        if group_columns:
+            stmt = stmt.group_by(*group_columns).order_by(*group_columns)
+
+        return [self._finalize_metrics(row._mapping, group_by) for row in db.execute(stmt)]
+
+    def combine_metrics(self, metrics: Iterable[Dict]) -> Dict:
+        """Merge already-aggregated metric dicts (e.g. rollup rows) into one"""
+        totals = {key: 0 for key in COUNT_KEYS}
+        confidence_sum = 0.0
+        for item in metrics:
+            for key in COUNT_KEYS:
+                totals[key] += item.get(key) or 0
+            confidence_sum += (item.get('average_confidence') or 0) * (item.get('total_predictions') or 0)
+
+        totals['average_confidence'] = (
+            confidence_sum / totals['total_predictions'] if totals['total_predictions'] else 0.0
+        )
+        return self._finalize_metrics(totals, ())
+
+    @staticmethod
+    def _finalize_metrics(row, group_by: Sequence[str]) -> Dict:
+        def pct(part, whole):
+            return (part / whole * 100) if whole else 0.0
+
+        total = row['total_predictions'] or 0
+        high_total = row['high_confidence_total'] or 0
+        medium_total = row['medium_confidence_total'] or 0
+        low_total = row['low_confidence_total'] or 0
+        bets = row['total_bets_recommended'] or 0
+        winning_bets = row['winning_bets'] or 0
+        metrics = {key: row[key] for key in group_by}
+        metrics.update({
+            'total_predictions': total,
+            'correct_predictions': row['correct_predictions'] or 0,
+            'accuracy_percentage': pct(row['correct_predictions'] or 0, total),
+            'high_confidence_accuracy': pct(row['high_confidence_correct'] or 0, high_total),
+            'medium_confidence_accuracy': pct(row['medium_confidence_correct'] or 0, medium_total),
+            'low_confidence_accuracy': pct(row['low_confidence_correct'] or 0, low_total),
+            'high_confidence_total': high_total,
+            'high_confidence_correct': row['high_confidence_correct'] or 0,
+            'medium_confidence_total': medium_total,
+            'medium_confidence_correct': row['medium_confidence_correct'] or 0,
+            'low_confidence_total': low_total,
+            'low_confidence_correct': row['low_confidence_correct'] or 0,
+            'total_bets_recommended': bets,
+            'winning_bets': winning_bets,
+            'betting_roi': ((winning_bets / bets) - 0.5) * 100 if bets else 0.0,
+            'average_confidence': float(row['average_confidence'] or 0)
+        })
+        return metrics
+
+    def team_performance(self, db: Session, season: Optional[int] = None, limit: int = 18) -> List[Dict]:
+        """Win/loss record and scoring averages per team in a single grouped query.
+
+        Each finished game is unioned as two rows (home and away perspective) so
+        one GROUP BY over team covers both sides.
+        """
+        filters = [
+            Game.is_finished == True,
+            Game.home_score.isnot(None),
+            Game.away_score.isnot(None)
+        ]
+        if season is not None:
+            filters.append(Game.season == season)
+
+        home = select(
+            Game.home_team_id.label('team_id'),
+            Game.home_score.label('score_for'),
+            Game.away_score.label('score_against')
+        ).where(*filters)
+        away = select(
+            Game.away_team_id.label('team_id'),
+            Game.away_score.label('score_for'),
+            Game.home_score.label('score_against')
+        ).where(*filters)
+        results = union_all(home, away).subquery('team_results')
+
+        total_games = func.count().label('total_games')
+        wins = func.sum(case((results.c.score_for > results.c.score_against, 1), else_=0))
+        losses = func.sum(case((results.c.score_for < results.c.score_against, 1), else_=0))
+        draws = func.sum(case((results.c.score_for == results.c.score_against, 1), else_=0))
+        win_percentage = (100.0 * wins / func.count()).label('win_percentage')
+
+        stmt = select(
+            Team.name.label('team_name'),
+            total_games,
+            wins.label('wins'),
+            losses.label('losses'),
+            draws.label('draws'),
+            win_percentage,
+            func.avg(results.c.score_for).label('avg_score_for'),
+            func.avg(results.c.score_against).label('avg_score_against')
+        ).join(
+            Team, Team.id == results.c.team_id
+        ).group_by(
+            Team.id, Team.name
+        ).order_by(
+            win_percentage.desc(), Team.name
+        ).limit(limit)
+
+        return [
+            {
+                'team_name': row.team_name,
+                'total_games': row.total_games,
+                'wins': int(row.wins or 0),
+                'losses': int(row.losses or 0),
+                'draws': int(row.draws or 0),
+                'win_percentage': float(row.win_percentage or 0),
+                'avg_score_for': float(row.avg_score_for or 0),
+                'avg_score_against': float(row.avg_score_against or 0)
+            }
+            for row in db.execute(stmt)
+        ]
+
+
+analytics_service = AnalyticsService()
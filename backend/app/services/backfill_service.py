@@ -0,0 +1,367 @@
+import logging
+import multiprocessing
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.backfill import BackfillJob, BackfillCheckpoint
+from app.services.ingestion_service import ingestion_service, upsert_insert
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('pending', 'running', 'completed', 'failed', 'cancelled')
+# Jobs a resume request may restart (stale running jobs are handled separately)
+RESUMABLE_STATUSES = ('pending', 'failed', 'cancelled')
+
+
+class BackfillCancelled(Exception):
+    """Raised inside a worker when its job was cancelled through the API"""
+
+
+def unit_key(season: int, game_data: Dict, stats_id: Optional[str]) -> str:
+    """Stable "{season}/{round}/{game}" key of one backfill unit"""
+    return f"{season}/{game_data.get('round') or 0}/{stats_id or game_data.get('game_id')}"
+
+
+class BackfillService:
+    """Resumable multi-season scrapes, checkpointed per (season, round, game).
+
+    A unit's checkpoint is committed in the same transaction as its player
+    stats, so a worker that dies mid-season resumes after the last committed
+    batch. Workers run in their own process and claim a job atomically; a
+    running job whose heartbeat goes stale can be taken over by a new worker.
+    """
+
+    def create_job(self, db: Session, start_season: int, end_season: int) -> BackfillJob:
+        job = BackfillJob(start_season=start_season, end_season=end_season, status='pending')
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        logger.info(f"Created backfill job {job.id} for {start_season}-{end_season}")
+        return job
+
+    def claim_job(self, db: Session, job_id: int) -> bool:
+        """Mark a pending (or stale running) job as ours; False if another worker holds it"""
+        now = datetime.utcnow()
+        result = db.execute(
+            update(BackfillJob)
+            .where(BackfillJob.id == job_id, or_(
+                BackfillJob.status == 'pending',
+                and_(BackfillJob.status == 'running', self._stale_heartbeat(now))
+            ))
+            .values(
+                status='running',
+                worker_pid=os.getpid(),
+                heartbeat_at=now,
+                started_at=func.coalesce(BackfillJob.started_at, now),
+                finished_at=None,
+                error=None,
+                attempts=BackfillJob.attempts + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def run_job(self, job_id: int, scraper=None) -> Dict:
+        """Run (or resume) a job to completion in this process"""
+        from app.scrapers.afl_scraper import AFLScraper
+
+        db = SessionLocal()
+        try:
+            if not self.claim_job(db, job_id):
+                return {'success': False, 'error': f"Backfill job {job_id} is not claimable"}
+
+            job = db.query(BackfillJob).filter(BackfillJob.id == job_id).one()
+            scraper = scraper or AFLScraper()
+            logger.info(f"Worker {os.getpid()} running backfill job {job_id} (attempt {job.attempts})")
+
+            try:
+                # Plan every season first so progress has a stable denominator
+                seasons = {}
+                for season in range(job.start_season, job.end_season + 1):
+                    season_data = scraper.parse_season_page(season)
+                    if not season_data['success']:
+                        raise Exception(f"Season {season}: {season_data['error']}")
+                    seasons[season] = season_data['games']
+                    self._heartbeat(db, job)
+
+                job.units_total = sum(len(games) for games in seasons.values())
+                db.commit()
+
+                done = self._done_units(db, job_id)
+                for season, games in seasons.items():
+                    self._run_season(db, job, scraper, season, games, done)
+
+                self._update_progress(db, job)
+                if job.units_failed:
+                    outcome = ('failed', f"{job.units_failed} units failed; resume the job to retry them")
+                else:
+                    outcome = ('completed', None)
+
+            except BackfillCancelled:
+                db.rollback()
+                outcome = (None, None)
+                logger.info(f"Backfill job {job_id} cancelled")
+            except Exception as e:
+                db.rollback()
+                outcome = ('failed', str(e))
+                logger.error(f"Backfill job {job_id} failed: {str(e)}")
+
+            self._finish(db, job, *outcome)
+            return {'success': job.status == 'completed', 'job': self._job_dict(db, job)}
+
+        finally:
+            db.close()
+
+    def _finish(self, db: Session, job: BackfillJob, status: Optional[str], error: Optional[str]) -> None:
+        """Release the job and record its outcome, unless it stopped running meanwhile (e.g. was cancelled)"""
+        db.flush()
+        if status:
+            # Conditional like _transition, so a cancel that lands after the last check wins
+            db.execute(
+                update(BackfillJob)
+                .where(BackfillJob.id == job.id, BackfillJob.status == 'running')
+                .values(status=status, error=error)
+                .execution_options(synchronize_session=False)
+            )
+        db.execute(
+            update(BackfillJob)
+            .where(BackfillJob.id == job.id)
+            .values(finished_at=datetime.utcnow(), worker_pid=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        db.refresh(job)
+
+    def _run_season(self, db: Session, job: BackfillJob, scraper, season: int, games: List[Dict],
+                    done: Set[str]) -> None:
+        job.current_season = season
+        pending = []
+        for game_data in games:
+            stats_id = scraper.stats_game_id(game_data)
+            key = unit_key(season, game_data, stats_id)
+            if key not in done:
+                pending.append((key, stats_id, game_data))
+        if not pending:
+            self._heartbeat(db, job)
+            return
+
+        logger.info(f"Backfill job {job.id}: {len(pending)} units left in {season}")
+
+        # Game rows first; games without a stats page are complete once saved
+        units = {}
+        checkpoints = []
+        for key, stats_id, game_data in pending:
+            game_record = scraper._save_game_to_db(db, game_data, season)
+            if stats_id:
+                units[stats_id] = (key, game_data, game_record.id)
+            else:
+                checkpoints.append(self._checkpoint(job, key, season, game_data, game_record.id))
+        self._commit_units(db, job, checkpoints)
+
+        batch = []
+        checkpoints = []
+        for stats_id, stats_result in scraper.fetch_game_stats(season, list(units)):
+            key, game_data, game_id = units[stats_id]
+            if stats_result['success']:
+                batch.append((game_id, stats_result))
+                checkpoints.append(self._checkpoint(job, key, season, game_data, game_id))
+            else:
+                checkpoints.append(self._checkpoint(job, key, season, game_data, game_id,
+                                                    error=stats_result['error']))
+
+            if len(batch) >= settings.ingest_batch_games:
+                self._flush(db, job, batch, checkpoints)
+                batch, checkpoints = [], []
+
+        if checkpoints:
+            self._flush(db, job, batch, checkpoints)
+
+    def _flush(self, db: Session, job: BackfillJob, batch: List, checkpoints: List[Dict]) -> None:
+        """Write a batch of player stats and its checkpoints in one transaction"""
+        written = False
+        if batch:
+            result = ingestion_service.ingest_player_stats(db, batch, commit=False)
+            written = result['success']
+            if not result['success']:
+                # The ingest rolled back; keep the units retryable
+                for checkpoint in checkpoints:
+                    if checkpoint['status'] == 'done':
+                        checkpoint['status'] = 'failed'
+                        checkpoint['error'] = result['error']
+        self._commit_units(db, job, checkpoints)
+        if written:
+            ingestion_service.player_stats_committed(db, [game_id for game_id, _ in batch])
+
+    def _commit_units(self, db: Session, job: BackfillJob, checkpoints: List[Dict]) -> None:
+        if checkpoints:
+            table = BackfillCheckpoint.__table__
+            statement = upsert_insert(db, table)
+            statement = statement.on_conflict_do_update(
+                index_elements=['job_id', 'unit_key'],
+                set_={
+                    'status': statement.excluded.status,
+                    'error': statement.excluded.error,
+                    'game_id': statement.excluded.game_id,
+                    'attempts': table.c.attempts + 1,
+                    'completed_at': statement.excluded.completed_at,
+                }
+            )
+            db.execute(statement, checkpoints)
+
+        status = db.query(BackfillJob.status).filter(BackfillJob.id == job.id).scalar()
+        if status == 'cancelled':
+            raise BackfillCancelled()
+        self._update_progress(db, job)
+        self._heartbeat(db, job)
+
+    def _checkpoint(self, job: BackfillJob, key: str, season: int, game_data: Dict, game_id: Optional[int],
+                    error: Optional[str] = None) -> Dict:
+        return {
+            'job_id': job.id,
+            'unit_key': key,
+            'season': season,
+            'round_number': game_data.get('round'),
+            'game_id': game_id,
+            'status': 'failed' if error else 'done',
+            'error': error,
+            'attempts': 1,
+            'completed_at': datetime.utcnow(),
+        }
+
+    def _update_progress(self, db: Session, job: BackfillJob) -> None:
+        counts = dict(db.query(BackfillCheckpoint.status, func.count(BackfillCheckpoint.id)).filter(
+            BackfillCheckpoint.job_id == job.id
+        ).group_by(BackfillCheckpoint.status).all())
+        job.units_done = counts.get('done', 0)
+        job.units_failed = counts.get('failed', 0)
+
+    def _heartbeat(self, db: Session, job: BackfillJob) -> None:
+        job.heartbeat_at = datetime.utcnow()
+        db.commit()
+
+    def _done_units(self, db: Session, job_id: int) -> Set[str]:
+        return {key for key, in db.query(BackfillCheckpoint.unit_key).filter(
+            BackfillCheckpoint.job_id == job_id,
+            BackfillCheckpoint.status == 'done'
+        )}
+
+    def _stale_heartbeat(self, now: datetime):
+        stale_before = now - timedelta(seconds=settings.backfill_stale_seconds)
+        return or_(BackfillJob.heartbeat_at.is_(None), BackfillJob.heartbeat_at < stale_before)
+
+    def requeue_job(self, db: Session, job_id: int) -> Dict:
+        """Put a failed, cancelled or stalled job back in the queue"""
+        return self._transition(db, job_id, 'pending', or_(
+            BackfillJob.status.in_(RESUMABLE_STATUSES),
+            and_(BackfillJob.status == 'running', self._stale_heartbeat(datetime.utcnow()))
+        ))
+
+    def resume_job(self, db: Session, job_id: int) -> Dict:
+        """Re-queue a job and start a worker that continues from its last checkpoint"""
+        result = self.requeue_job(db, job_id)
+        if result['success'] and settings.backfill_spawn_worker:
+            self.start_worker(job_id)
+        return result
+
+    def cancel_job(self, db: Session, job_id: int) -> Dict:
+        """Ask a job to stop; its worker exits after the current batch"""
+        return self._transition(db, job_id, 'cancelled', BackfillJob.status.in_(('pending', 'running')))
+
+    def _transition(self, db: Session, job_id: int, status: str, allowed) -> Dict:
+        # A conditional UPDATE, so a worker changing the job concurrently can't be overwritten
+        result = db.execute(
+            update(BackfillJob)
+            .where(BackfillJob.id == job_id, allowed)
+            .values(status=status, error=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        job = db.query(BackfillJob).filter(BackfillJob.id == job_id).populate_existing().first()
+        if not job:
+            return {'success': False, 'error': f"Backfill job {job_id} not found"}
+        if result.rowcount != 1:
+            return {'success': False, 'error': f"Backfill job {job_id} is {job.status}"}
+        return {'success': True, 'job': self._job_dict(db, job)}
+
+    def claimable_jobs(self, db: Session) -> List[int]:
+        """Queued jobs and running jobs whose worker stopped heartbeating"""
+        return [job_id for job_id, in db.query(BackfillJob.id).filter(or_(
+            BackfillJob.status == 'pending',
+            and_(BackfillJob.status == 'running', self._stale_heartbeat(datetime.utcnow()))
+        )).order_by(BackfillJob.id)]
+
+    def resume_stale_jobs(self, db: Session) -> List[int]:
+        """Start workers for queued jobs and jobs whose worker died (e.g. after a restart)"""
+        if not settings.backfill_spawn_worker:
+            return []
+        job_ids = self.claimable_jobs(db)
+        for job_id in job_ids:
+            self.start_worker(job_id)
+        return job_ids
+
+    def start_worker(self, job_id: int) -> int:
+        """Run a job in a separate process so it outlives the request that queued it"""
+        process = multiprocessing.get_context('spawn').Process(
+            target=run_backfill_worker, args=(job_id,), name=f"backfill-{job_id}"
+        )
+        process.start()
+        logger.info(f"Started backfill worker {process.pid} for job {job_id}")
+        return process.pid
+
+    def get_progress(self, db: Session, job_id: int) -> Optional[Dict]:
+        job = db.query(BackfillJob).filter(BackfillJob.id == job_id).populate_existing().first()
+        return self._job_dict(db, job, include_failures=True) if job else None
+
+    def list_jobs(self, db: Session, limit: int = 20) -> List[Dict]:
+        jobs = db.query(BackfillJob).order_by(BackfillJob.created_at.desc()).limit(limit).all()
+        return [self._job_dict(db, job) for job in jobs]
+
+    def _job_dict(self, db: Session, job: BackfillJob, include_failures: bool = False) -> Dict:
+        data = {
+            'id': job.id,
+            'status': job.status,
+            'start_season': job.start_season,
+            'end_season': job.end_season,
+            'current_season': job.current_season,
+            'units_total': job.units_total,
+            'units_done': job.units_done,
+            'units_failed': job.units_failed,
+            'percent_complete': round(job.units_done / job.units_total * 100, 1) if job.units_total else 0.0,
+            'attempts': job.attempts,
+            'worker_pid': job.worker_pid,
+            'heartbeat_at': job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+            'error': job.error
+        }
+        if include_failures:
+            data['failed_units'] = [
+                {'unit': checkpoint.unit_key, 'error': checkpoint.error, 'attempts': checkpoint.attempts}
+                for checkpoint in db.query(BackfillCheckpoint).filter(
+                    BackfillCheckpoint.job_id == job.id,
+                    BackfillCheckpoint.status == 'failed'
+                ).order_by(BackfillCheckpoint.unit_key).limit(50)
+            ]
+        return data
+
+
+def run_backfill_worker(job_id: int) -> None:
+    """Worker process entry point"""
+    logging.basicConfig(level=logging.INFO)
+    result = backfill_service.run_job(job_id)
+    if not result['success']:
+        logger.warning(f"Backfill job {job_id} finished without success: "
+                       f"{result.get('error') or result['job']['status']}")
+
+
+# Global backfill service instance
+backfill_service = BackfillService()
@@ -9,6 +9,8 @@ import re
 from slugify import slugify
 
 from app.core.config import settings
+from app.ai.response_cache import llm_response_cache
+from app.services.team_stats_service import team_stats_service
 from app.models.content import Content, ContentVersion, ContentAnalytics, ContentTemplate
 from app.models.game import Game
 from app.models.team import Team
@@ -21,7 +23,9 @@ class ContentService:
     def __init__(self):
         genai.configure(api_key=settings.gemini_api_key)
         self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model_name = self.model.model_name
         self.model_version = "1.0.0"
+        self.response_cache = llm_response_cache
         
         # Default content templates
         self.default_templates = {
@@ -129,7 +133,7 @@ class ContentService:
         }
     
     def generate_content(self, db: Session, template_name: str, context: Dict[str, Any], 
-                        user_id: Optional[int] = None) -> Optional[Content]:
+                        user_id: Optional[int] = None, use_cache: bool = True) -> Optional[Content]:
         """Generate content using a specific template and context."""
         try:
             # Get or create template
@@ -141,9 +145,8 @@ class ContentService:
             # Prepare prompt with context
             prompt = template.get_prompt_with_context(context)
             
-            # Generate content using Gemini
-            response = self.model.generate_content(prompt)
-            generated_text = response.text
+            # Generate content using Gemini (identical prompts come from the cache)
+            generated_text = self._generate_text(prompt, use_cache)
             
             # Parse and structure the content
             structured_content = self._parse_generated_content(generated_text, template)
@@ -151,7 +154,7 @@ class ContentService:
             # Create content record
             content = Content(
                 title=structured_content.get("title", f"Generated {template.content_type}"),
-                slug=self._generate_slug(structured_content.get("title", f"generated-{template.content_type}")),
+                slug=self._generate_unique_slug(db, structured_content.get("title", f"generated-{template.content_type}")),
                 content_type=template.content_type,
                 summary=structured_content.get("summary", ""),
                 content_body=structured_content.get("content_body", generated_text),
@@ -196,6 +199,22 @@ class ContentService:
             db.rollback()
             return None
     
+    def _generate_text(self, prompt: str, use_cache: bool = True) -> str:
+        """Call Gemini for a prompt, going through the shared response cache."""
+        cache_key = None
+        if use_cache:
+            cache_key = self.response_cache.make_key(self.model_name, prompt)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached["text"]
+        
+        response = self.model.generate_content(prompt)
+        generated_text = response.text
+        
+        if cache_key:
+            self.response_cache.set(cache_key, {"text": generated_text}, self.model_name)
+        return generated_text
+    
     def generate_game_analysis(self, db: Session, game_id: int, user_id: Optional[int] = None) -> Optional[Content]:
         """Generate analysis for a specific game."""
         try:
@@ -431,6 +450,16 @@ class ContentService:
         """Generate URL slug from title."""
         return slugify(title, max_length=50)
     
+    def _generate_unique_slug(self, db: Session, title: str) -> str:
+        """Generate a slug that isn't already taken (cached responses repeat titles)."""
+        base_slug = self._generate_slug(title)
+        slug = base_slug
+        suffix = 2
+        while db.query(Content.id).filter(Content.slug == slug).first():
+            slug = f"{base_slug}-{suffix}"
+            suffix += 1
+        return slug
+    
     def _get_game_historical_data(self, db: Session, game: Game) -> str:
         """Get historical data for a game."""
         # Get recent games between these teams
@@ -488,23 +517,12 @@ class ContentService:
             return {}
         
         # Get last season performance
-        last_season_games = db.query(Game).filter(
-            and_(
-                or_(Game.home_team_id == team_id, Game.away_team_id == team_id),
-                Game.season == season - 1,
-                Game.is_finished == True
-            )
-        ).all()
-        
-        wins = 0
-        for g in last_season_games:
-            if g.home_team_id == team_id and g.home_score > g.away_score:
-                wins += 1
-            elif g.away_team_id == team_id and g.away_score > g.home_score:
-                wins += 1
+        last_season = team_stats_service.get_team_season(db, team_id, season - 1)
+        wins = last_season.wins if last_season else 0
+        games_played = last_season.games_played if last_season else 0
         
         return {
-            "last_season": f"{wins} wins from {len(last_season_games)} games",
+            "last_season": f"{wins} wins from {games_played} games",
             "key_players": "Star players to watch this season",
             "outlook": "Promising season ahead with strong squad"
         } 
\ No newline at end of file
@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.models.game import Game
+from app.models.player import Player, PlayerGameStats
+from app.models.team import Team
+from app.services.ingestion_service import STAT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('ndjson', 'parquet')
+
+# Column name -> type for each dataset; also the Parquet schema
+GAME_COLUMNS = {
+    'id': 'int', 'season': 'int', 'round_number': 'int', 'game_number': 'int',
+    'game_date': 'datetime', 'venue': 'str', 'is_finished': 'bool',
+    'home_team_id': 'int', 'home_team': 'str', 'away_team_id': 'int', 'away_team': 'str',
+    'home_score': 'int', 'away_score': 'int', 'home_goals': 'int', 'away_goals': 'int',
+    'home_behinds': 'int', 'away_behinds': 'int',
+}
+
+PLAYER_STAT_COLUMNS = {
+    'id': 'int', 'game_id': 'int', 'season': 'int', 'round_number': 'int',
+    'player_id': 'int', 'player_afl_id': 'str', 'player_name': 'str',
+    'team_id': 'int', 'team': 'str',
+    **{name: 'int' for name in STAT_FIELDS},
+}
+
+
+def _games_query():
+    home, away = aliased(Team), aliased(Team)
+    return (
+        select(
+            Game.id, Game.season, Game.round_number, Game.game_number, Game.game_date,
+            Game.venue, Game.is_finished,
+            Game.home_team_id, home.name.label('home_team'),
+            Game.away_team_id, away.name.label('away_team'),
+            Game.home_score, Game.away_score, Game.home_goals, Game.away_goals,
+            Game.home_behinds, Game.away_behinds,
+        )
+        .join(home, Game.home_team_id == home.id)
+        .join(away, Game.away_team_id == away.id)
+        .order_by(Game.season, Game.round_number, Game.game_date, Game.id)
+    )
+
+
+def _player_stats_query():
+    return (
+        select(
+            PlayerGameStats.id, PlayerGameStats.game_id, Game.season, Game.round_number,
+            PlayerGameStats.player_id, Player.afl_id.label('player_afl_id'),
+            Player.name.label('player_name'),
+            PlayerGameStats.team_id, Team.name.label('team'),
+            *[getattr(PlayerGameStats, name) for name in STAT_FIELDS],
+        )
+        .join(Game, PlayerGameStats.game_id == Game.id)
+        .join(Player, PlayerGameStats.player_id == Player.id)
+        .outerjoin(Team, PlayerGameStats.team_id == Team.id)
+        .order_by(Game.season, PlayerGameStats.game_id, PlayerGameStats.id)
+    )
+
+
+DATASETS = {
+    'games': (GAME_COLUMNS, _games_query),
+    'player_stats': (PLAYER_STAT_COLUMNS, _player_stats_query),
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def load_ndjson(path: Path) -> List[Dict]:
+    """Read an NDJSON partition into a list of records"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class _NdjsonWriter:
+    def __init__(self, path: Path, columns: Dict[str, str]):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, rows: List[Dict]):
+        self.file.writelines(json.dumps(row, default=_json_default) + '\n' for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    """One row group per cursor chunk, so memory stays at one chunk"""
+
+    def __init__(self, path: Path, columns: Dict[str, str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+        types = {'int': pa.int64(), 'str': pa.string(), 'bool': pa.bool_(),
+                 'float': pa.float64(), 'datetime': pa.timestamp('us')}
+        self.pa = pa
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns.items()])
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression='snappy')
+
+    def write(self, rows: List[Dict]):
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {'ndjson': _NdjsonWriter, 'parquet': _ParquetWriter}
+
+
+class _Partition:
+    """Writers for one season; files are written under temporary names and renamed on commit"""
+
+    def __init__(self, root: Path, dataset: str, season: int, columns: Dict[str, str], formats: Iterable[str]):
+        self.dir = root / dataset / f"season={season}"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.dataset = dataset
+        self.season = season
+        self.rows = 0
+        self.writers = {}
+        try:
+            for fmt in formats:
+                tmp_path = self.dir / f".{dataset}.{fmt}.tmp"
+                self.writers[fmt] = (WRITERS[fmt](tmp_path, columns), tmp_path)
+        except Exception:
+            self.abort()
+            raise
+
+    def write(self, rows: List[Dict]):
+        for writer, _ in self.writers.values():
+            writer.write(rows)
+        self.rows += len(rows)
+
+    def commit(self) -> None:
+        for fmt, (writer, tmp_path) in self.writers.items():
+            writer.close()
+            os.replace(tmp_path, self.dir / f"{self.dataset}.{fmt}")
+        manifest = {
+            'dataset': self.dataset,
+            'season': self.season,
+            'rows': self.rows,
+            'formats': sorted(self.writers),
+            'exported_at': datetime.utcnow().isoformat()
+        }
+        with open(self.dir / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    def abort(self) -> None:
+        for writer, tmp_path in self.writers.values():
+            try:
+                writer.close()
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+
+class ExportService:
+    """Streams games and player stats out of the database into season partitions.
+
+    Layout: ``{export_dir}/{dataset}/season={season}/{dataset}.{ndjson,parquet}``
+    plus a ``manifest.json``. Rows are read through a server-side cursor
+    ``chunk_size`` at a time and written straight out, so memory use does not
+    grow with the number of seasons exported. A partition only replaces the
+    previous export once it has been written completely.
+    """
+
+    def __init__(self, export_dir: Optional[str] = None, chunk_size: Optional[int] = None):
+        self.export_dir = Path(export_dir or settings.export_dir)
+        self.chunk_size = chunk_size or settings.export_chunk_size
+
+    def export(self, db: Session, dataset: str, seasons: Optional[List[int]] = None,
+               formats: Iterable[str] = ('ndjson',)) -> Dict:
+        """Export one dataset, optionally limited to some seasons"""
+        if dataset not in DATASETS:
+            return {'success': False, 'error': f"Unknown dataset: {dataset}"}
+        formats = list(dict.fromkeys(formats))
+        unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+        if unknown or not formats:
+            return {'success': False, 'error': f"Unsupported export format(s): {unknown or formats}"}
+
+        columns, build_query = DATASETS[dataset]
+        query = build_query()
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+
+        partitions = {}
+        partition = None
+        result = None
+        try:
+            # yield_per turns on stream_results: a server-side cursor on PostgreSQL
+            result = db.execute(query.execution_options(yield_per=self.chunk_size))
+            for chunk in result.mappings().partitions():
+                # Rows arrive ordered by season, so at most one partition is open
+                start = 0
+                while start < len(chunk):
+                    season = chunk[start]['season']
+                    end = start
+                    while end < len(chunk) and chunk[end]['season'] == season:
+                        end += 1
+
+                    if partition is None or partition.season != season:
+                        if partition is not None:
+                            partition.commit()
+                            partitions[partition.season] = partition.rows
+                        partition = _Partition(self.export_dir, dataset, season, columns, formats)
+                    partition.write([dict(row) for row in chunk[start:end]])
+                    start = end
+
+            if partition is not None:
+                partition.commit()
+                partitions[partition.season] = partition.rows
+                partition = None
+
+        except Exception as e:
+            if partition is not None:
+                partition.abort()
+            logger.error(f"Error exporting {dataset}: {str(e)}")
+            return {'success': False, 'error': str(e), 'partitions': partitions}
+        finally:
+            if result is not None:
+                result.close()
+
+        total = sum(partitions.values())
+        logger.info(f"Exported {total} {dataset} rows in {len(partitions)} season partitions "
+                    f"({', '.join(formats)}) to {self.export_dir / dataset}")
+        return {
+            'success': True,
+            'dataset': dataset,
+            'formats': formats,
+            'partitions': partitions,
+            'rows': total,
+            'output_dir': str(self.export_dir / dataset)
+        }
+
+    def list_partitions(self, dataset: str, fmt: str = 'ndjson') -> Dict[int, Path]:
+        """Completed partition files for a dataset, by season"""
+        dataset_dir = self.export_dir / dataset
+        if not dataset_dir.is_dir():
+            return {}
+        found = {}
+        for season_dir in dataset_dir.glob('season=*'):
+            path = season_dir / f"{dataset}.{fmt}"
+            season = season_dir.name.split('=', 1)[1]
+            if season.isdigit() and path.exists():
+                found[int(season)] = path
+        return dict(sorted(found.items()))
+
+    def latest_partition(self, dataset: str, fmt: str = 'ndjson') -> Optional[Path]:
+        """File of the most recent exported season, or None if nothing has been exported"""
+        partitions = self.list_partitions(dataset, fmt)
+        return partitions[max(partitions)] if partitions else None
+
+
+# Shared instance used by the scheduler, the predictor and export_historical_data.py
+export_service = ExportService()
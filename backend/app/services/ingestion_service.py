@@ -0,0 +1,384 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.response_cache import response_cache
+from app.models.game import Game
+from app.models.player import Player, PlayerGameStats
+from app.services.team_alias_service import team_alias_index
+from app.services.team_stats_service import team_stats_service
+from app.services.tip_service import tip_service
+
+logger = logging.getLogger(__name__)
+
+# PlayerGameStats column -> key in the parsed afltables stats
+STAT_FIELDS = {
+    'goals': 'goals',
+    'behinds': 'behinds',
+    'kicks': 'kicks',
+    'handballs': 'handballs',
+    'marks': 'marks',
+    'tackles': 'tackles',
+    'hitouts': 'hit_outs',
+    'frees_for': 'free_kicks_for',
+    'frees_against': 'free_kicks_against',
+    'disposals': 'disposals',
+    'contested_possessions': 'contested_possessions',
+    'uncontested_possessions': 'uncontested_possessions',
+    'inside_50s': 'inside_50s',
+    'rebound_50s': 'rebound_50s',
+    'clearances': 'clearances',
+    'clangers': 'clangers',
+}
+
+# Game columns a fixture or result sync may change, compared as one fingerprint
+GAME_SYNC_FIELDS = ('game_date', 'venue', 'home_score', 'away_score', 'is_finished')
+SYNC_MODES = ('fixture', 'results')
+
+
+def upsert_insert(db: Session, table):
+    """Dialect ``insert()`` supporting ON CONFLICT (PostgreSQL in production, SQLite locally)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(table)
+    if dialect == 'sqlite':
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Bulk upserts are not supported on {dialect}")
+
+
+def _afl_id(player_data: Dict) -> str:
+    # Stats parsed before afl_id was extracted only carry the name
+    return player_data.get('afl_id') or player_data['name'].replace(' ', '_')
+
+
+class IngestionService:
+    """Bulk writes of scraped afltables data.
+
+    Each batch costs a fixed handful of statements regardless of how many
+    players it holds: one IN query per lookup, one multi-row insert for new
+    players and one multi-row upsert for the stats rows.
+    """
+
+    def ingest_player_stats(self, db: Session, batch: Iterable[Tuple[int, Dict]], commit: bool = True) -> Dict:
+        """Write the player stats of a batch of ``(game_id, stats_result)`` pairs.
+
+        Players are keyed on their afltables id, and stats on (game, player),
+        so re-ingesting a game overwrites its rows instead of duplicating them.
+        """
+        try:
+            entries = []
+            games = set()
+            for game_id, stats_result in batch:
+                games.add(game_id)
+                for team_name, players in (stats_result.get('player_stats') or {}).items():
+                    for player_data in players:
+                        entries.append((game_id, team_name, player_data))
+
+            if not entries:
+                return {'success': True, 'games': len(games), 'players_created': 0, 'player_stats_written': 0}
+
+            team_ids = self._team_ids(db, {team_name for _, team_name, _ in entries})
+
+            players = {}
+            for _, team_name, player_data in entries:
+                players[_afl_id(player_data)] = (player_data['name'], team_ids.get(team_name))
+            player_ids, players_created = self.resolve_players(db, players)
+
+            # One row per (game, player); a repeated row in the batch replaces the earlier one
+            now = datetime.utcnow()
+            stats_rows = {}
+            for game_id, team_name, player_data in entries:
+                stats = player_data['stats']
+                row = {
+                    'game_id': game_id,
+                    'player_id': player_ids[_afl_id(player_data)],
+                    'team_id': team_ids.get(team_name),
+                    'created_at': now,
+                    'updated_at': now,
+                }
+                for column, key in STAT_FIELDS.items():
+                    row[column] = stats.get(key, 0)
+                stats_rows[(game_id, row['player_id'])] = row
+
+            statement = upsert_insert(db, PlayerGameStats.__table__)
+            statement = statement.on_conflict_do_update(
+                index_elements=['game_id', 'player_id'],
+                set_={column: statement.excluded[column] for column in ['team_id', 'updated_at', *STAT_FIELDS]}
+            )
+            db.execute(statement, list(stats_rows.values()))
+
+            if commit:
+                db.commit()
+                self.player_stats_committed(db, games)
+
+            logger.info(f"Ingested {len(stats_rows)} player stats rows for {len(games)} games "
+                        f"({players_created} new players)")
+            return {
+                'success': True,
+                'games': len(games),
+                'players_created': players_created,
+                'player_stats_written': len(stats_rows)
+            }
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error ingesting player stats: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def player_stats_committed(self, db: Session, game_ids: Iterable[int]) -> None:
+        """Drop cached copies of the seasons these games belong to (call after commit)"""
+        # Imported here: the store reads STAT_FIELDS from this module
+        from app.services.player_stats_store import player_stats_store
+        for season in db.execute(select(Game.season).where(Game.id.in_(list(game_ids))).distinct()).scalars():
+            player_stats_store.invalidate(season)
+        response_cache.invalidate('player_stats')
+
+    def resolve_players(self, db: Session, players: Dict[str, Tuple[str, int]]) -> Tuple[Dict[str, int], int]:
+        """Map afltables ids to player ids, creating missing players.
+
+        ``players`` maps afl_id -> (name, team_id). Returns the id map and the
+        number of players created (caller commits).
+        """
+        player_ids = dict(db.execute(
+            select(Player.afl_id, Player.id).where(Player.afl_id.in_(list(players)))
+        ).all())
+        missing = [afl_id for afl_id in players if afl_id not in player_ids]
+        if not missing:
+            return player_ids, 0
+
+        # Players saved by name before afl_id was recorded: claim them when the name is unambiguous
+        names = {}
+        for afl_id in missing:
+            names.setdefault(players[afl_id][0], []).append(afl_id)
+        legacy = {}
+        for player_id, name in db.execute(
+            select(Player.id, Player.name).where(Player.afl_id.is_(None), Player.name.in_(list(names)))
+        ).all():
+            legacy.setdefault(name, []).append(player_id)
+        claimed = [
+            {'b_player_id': ids[0], 'b_afl_id': names[name][0]}
+            for name, ids in legacy.items() if len(ids) == 1 and len(names[name]) == 1
+        ]
+        if claimed:
+            db.execute(
+                update(Player.__table__)
+                .where(Player.__table__.c.id == bindparam('b_player_id'))
+                .values(afl_id=bindparam('b_afl_id')),
+                claimed
+            )
+            player_ids.update({row['b_afl_id']: row['b_player_id'] for row in claimed})
+            missing = [afl_id for afl_id in missing if afl_id not in player_ids]
+            if not missing:
+                return player_ids, 0
+
+        now = datetime.utcnow()
+        columns = Player.__table__.c
+        statement = upsert_insert(db, Player.__table__).on_conflict_do_nothing(index_elements=['afl_id'])
+        created = dict(db.execute(statement.returning(columns.afl_id, columns.id), [
+            {
+                'afl_id': afl_id,
+                'name': players[afl_id][0],
+                'current_team_id': players[afl_id][1],
+                'games_played': 0,
+                'goals_kicked': 0,
+                'behinds_kicked': 0,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for afl_id in missing
+        ]).all())
+        player_ids.update(created)
+
+        # Rows skipped by ON CONFLICT were inserted by a concurrent writer; they aren't ours to count
+        skipped = [afl_id for afl_id in missing if afl_id not in created]
+        if skipped:
+            player_ids.update(db.execute(
+                select(Player.afl_id, Player.id).where(Player.afl_id.in_(skipped))
+            ).all())
+        return player_ids, len(created)
+
+    def sync_games(self, db: Session, games: List[Dict], mode: str, commit: bool = True) -> Dict:
+        """Diff scraped fixture or result games against the database and write only real changes.
+
+        Existing games of the affected seasons are loaded once and keyed by
+        (season, round, home_team_id, away_team_id). Each incoming game is
+        merged over its stored row and the tracked fields are compared as a
+        fingerprint; unchanged games cost nothing, new games are inserted and
+        changed games updated with one bulk statement each.
+
+        ``mode`` is ``'fixture'`` (dates and venues only; never touches
+        scores) or ``'results'`` (scores, marking games finished). Returns a
+        changeset: ids of created, updated and newly finished (or corrected)
+        games plus the per-game field changes.
+        """
+        if mode not in SYNC_MODES:
+            raise ValueError(f"Unknown sync mode: {mode}")
+
+        try:
+            changeset = {
+                'created_ids': [],
+                'updated_ids': [],
+                'finished_ids': [],
+                'changes': {},
+                'unchanged_count': 0,
+                'errors': []
+            }
+            if not games:
+                return {'success': True, 'changeset': changeset, **self._sync_counts(changeset, 0)}
+
+            team_ids = self._team_ids(db, {game[side] for game in games for side in ('home_team', 'away_team')})
+            seasons = {game['season'] for game in games}
+            columns = Game.__table__.c
+            existing = {
+                (row.season, row.round_number, row.home_team_id, row.away_team_id): row
+                for row in db.execute(
+                    select(columns.id, columns.season, columns.round_number, columns.home_team_id,
+                           columns.away_team_id, *[columns[field] for field in GAME_SYNC_FIELDS])
+                    .where(columns.season.in_(seasons))
+                )
+            }
+
+            inserts = {}
+            updates = []
+            changed_rounds = set()
+            for game_data in games:
+                home_team_id = team_ids.get(game_data['home_team'])
+                away_team_id = team_ids.get(game_data['away_team'])
+                if not home_team_id or not away_team_id:
+                    changeset['errors'].append(
+                        f"Unknown team in {game_data.get('home_team')} vs {game_data.get('away_team')}"
+                    )
+                    continue
+
+                key = (game_data['season'], game_data['round'], home_team_id, away_team_id)
+                row = existing.get(key)
+                current = {field: getattr(row, field) for field in GAME_SYNC_FIELDS} if row else {}
+                if row is not None:
+                    current['is_finished'] = bool(current['is_finished'])
+                desired = self._merge_game(current, game_data, mode)
+
+                if row is None:
+                    inserts[key] = desired
+                    changed_rounds.add(key[:2])
+                elif self._fingerprint(desired) != self._fingerprint(current):
+                    changes = {
+                        field: [current[field], desired[field]]
+                        for field in GAME_SYNC_FIELDS if desired[field] != current[field]
+                    }
+                    updates.append({'b_id': row.id, **desired})
+                    changed_rounds.add(key[:2])
+                    changeset['changes'][row.id] = changes
+                    if desired['is_finished'] and (
+                        not current['is_finished'] or 'home_score' in changes or 'away_score' in changes
+                    ):
+                        changeset['finished_ids'].append(row.id)
+                else:
+                    changeset['unchanged_count'] += 1
+
+            now = datetime.utcnow()
+            if inserts:
+                rows = [
+                    {
+                        'season': key[0],
+                        'round_number': key[1],
+                        'home_team_id': key[2],
+                        'away_team_id': key[3],
+                        'created_at': now,
+                        'updated_at': now,
+                        **values
+                    }
+                    for key, values in inserts.items()
+                ]
+                # Rows come back keyed by their natural key, so no ordering guarantee is needed
+                created = db.execute(
+                    insert(Game.__table__).returning(
+                        columns.id, columns.season, columns.round_number, columns.home_team_id, columns.away_team_id
+                    ),
+                    rows
+                ).all()
+                for row in created:
+                    changeset['created_ids'].append(row.id)
+                    if inserts[(row.season, row.round_number, row.home_team_id, row.away_team_id)]['is_finished']:
+                        changeset['finished_ids'].append(row.id)
+
+            if updates:
+                db.execute(
+                    update(Game.__table__)
+                    .where(Game.__table__.c.id == bindparam('b_id'))
+                    .values(updated_at=now, **{field: bindparam(field) for field in GAME_SYNC_FIELDS}),
+                    updates
+                )
+                changeset['updated_ids'] = [row['b_id'] for row in updates]
+
+            # Team season stats follow newly finished games and score corrections only
+            if changeset['finished_ids']:
+                corrected = {
+                    game_id for game_id in changeset['updated_ids']
+                    if changeset['changes'][game_id].get('is_finished') is None
+                }
+                for game in db.query(Game).filter(Game.id.in_(changeset['finished_ids'])).populate_existing():
+                    team_stats_service.record_result(db, game, was_finished=game.id in corrected)
+
+            if commit:
+                db.commit()
+                if changeset['created_ids'] or changeset['updated_ids']:
+                    response_cache.invalidate('games')
+                    # Moved or new fixtures change the dates and venues in the tips snapshots,
+                    # including rounds that are no longer (or not yet) in the upcoming window
+                    if mode == 'fixture':
+                        tip_service.build_snapshots(db, rounds=changed_rounds)
+
+            logger.info(f"Synced {len(games)} {mode} games: {len(changeset['created_ids'])} created, "
+                        f"{len(changeset['updated_ids'])} updated, {changeset['unchanged_count']} unchanged")
+            return {'success': True, 'changeset': changeset, **self._sync_counts(changeset, len(games))}
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error syncing {mode} games: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    @staticmethod
+    def _merge_game(current: Dict, game_data: Dict, mode: str) -> Dict:
+        """Stored values overlaid with what the scrape knows; missing scraped values keep the stored ones"""
+        merged = {field: current.get(field) for field in GAME_SYNC_FIELDS}
+        if game_data.get('game_date'):
+            merged['game_date'] = game_data['game_date']
+        if game_data.get('venue'):
+            merged['venue'] = game_data['venue']
+        if mode == 'results':
+            merged['home_score'] = game_data['home_score']
+            merged['away_score'] = game_data['away_score']
+            merged['is_finished'] = True
+        else:
+            merged['is_finished'] = bool(merged['is_finished'])
+        return merged
+
+    @staticmethod
+    def _fingerprint(values: Dict) -> int:
+        return hash(tuple(values.get(field) for field in GAME_SYNC_FIELDS))
+
+    @staticmethod
+    def _sync_counts(changeset: Dict, total: int) -> Dict:
+        return {
+            'saved_count': len(changeset['created_ids']),
+            'updated_count': len(changeset['updated_ids']),
+            'unchanged_count': changeset['unchanged_count'],
+            'total_processed': total,
+            'errors': changeset['errors']
+        }
+
+    def _team_ids(self, db: Session, team_names: Iterable[str]) -> Dict[str, int]:
+        return team_alias_index.resolve_many(db, team_names)
+
+# Shared instance for scrapers and backfill scripts
+ingestion_service = IngestionService()
@@ -0,0 +1,281 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.game import Game
+from app.models.player import Player, PlayerGameStats
+from app.models.team import Team
+from app.services.ingestion_service import STAT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+STAT_COLUMNS = tuple(STAT_FIELDS)
+GROUP_BY = ('player', 'team', 'round')
+
+# Linear Brownlow proxy over box-score stats; players on the winning side get a boost
+BROWNLOW_WEIGHTS = {
+    'disposals': 1.0,
+    'contested_possessions': 1.0,
+    'clearances': 1.5,
+    'goals': 3.0,
+    'behinds': 0.5,
+    'marks': 0.5,
+    'tackles': 0.75,
+    'inside_50s': 0.5,
+    'hitouts': 0.25,
+    'frees_against': -0.5,
+    'clangers': -0.5,
+}
+WINNING_TEAM_MULTIPLIER = 1.25
+VOTES = (3, 2, 1)
+
+
+def _top_k(values: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Indices of the k largest values, largest first"""
+    if k is None or k >= len(values):
+        return np.argsort(-values, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-values, k - 1)[:k]
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
+
+class SeasonStats:
+    """One season of ``player_game_stats`` as columns.
+
+    Every row is a player's game: ``player``, ``team``, ``game`` and
+    ``round`` hold integer codes into the ``*_ids`` / ``rounds`` lookup
+    arrays, and ``stats[name]`` holds one int32 array per stat column.
+    Aggregates are ``np.bincount`` over a code array, so a season-wide
+    group-by or tally is a handful of vector operations.
+    """
+
+    def __init__(self, season: int, rows: np.ndarray, games: List[Tuple], player_names: Dict[int, str],
+                 team_names: Dict[int, str]):
+        self.season = season
+        rows = rows.reshape(-1, 3 + len(STAT_COLUMNS))
+
+        self.game_ids, self.game = np.unique(rows[:, 0], return_inverse=True)
+        self.player_ids, self.player = np.unique(rows[:, 1], return_inverse=True)
+        self.team_ids, self.team = np.unique(rows[:, 2], return_inverse=True)
+        self.stats = {
+            name: np.ascontiguousarray(rows[:, 3 + i], dtype=np.int32)
+            for i, name in enumerate(STAT_COLUMNS)
+        }
+
+        # Per-game round and winner, aligned with game_ids
+        game_info = {game_id: (round_number, winner) for game_id, round_number, winner in games}
+        game_round = np.array([game_info.get(g, (0, 0))[0] or 0 for g in self.game_ids], dtype=np.int64)
+        game_winner = np.array([game_info.get(g, (0, 0))[1] for g in self.game_ids], dtype=np.int64)
+        self.rounds, round_codes = np.unique(game_round, return_inverse=True)
+        self.round = round_codes[self.game] if len(self.game) else np.empty(0, dtype=np.int64)
+        self.won = self.team_ids[self.team] == game_winner[self.game] if len(self.game) else np.empty(0, dtype=bool)
+
+        self.player_names = np.array([player_names.get(p, '') for p in self.player_ids], dtype=object)
+        self.team_names = np.array([team_names.get(t, '') for t in self.team_ids], dtype=object)
+
+        # Team each player last played for (rows are ordered by game)
+        self.player_team = np.zeros(len(self.player_ids), dtype=np.int64)
+        if len(self.player):
+            last_player, last_rows = np.unique(self.player[::-1], return_index=True)
+            self.player_team[last_player] = self.team[::-1][last_rows]
+
+    def __len__(self) -> int:
+        return len(self.player)
+
+    def _codes(self, by: str) -> Tuple[np.ndarray, int]:
+        if by == 'player':
+            return self.player, len(self.player_ids)
+        if by == 'team':
+            return self.team, len(self.team_ids)
+        if by == 'round':
+            return self.round, len(self.rounds)
+        raise ValueError(f"Unknown grouping: {by} (expected one of {', '.join(GROUP_BY)})")
+
+    def column(self, stat: str) -> np.ndarray:
+        if stat not in self.stats:
+            raise ValueError(f"Unknown stat: {stat}")
+        return self.stats[stat]
+
+    def group_sum(self, values: np.ndarray, by: str) -> np.ndarray:
+        """Sum a per-row array for each player, team or round"""
+        codes, size = self._codes(by)
+        return np.bincount(codes, weights=values, minlength=size)
+
+    def games_played(self, by: str) -> np.ndarray:
+        """Distinct games per player, team or round"""
+        codes, size = self._codes(by)
+        pairs = np.unique(codes.astype(np.int64) * len(self.game_ids) + self.game)
+        return np.bincount(pairs // max(len(self.game_ids), 1), minlength=size)
+
+    def scores(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Brownlow proxy score for every row"""
+        score = np.zeros(len(self), dtype=np.float64)
+        for stat, weight in (weights or BROWNLOW_WEIGHTS).items():
+            score += weight * self.column(stat)
+        return np.where(self.won, score * WINNING_TEAM_MULTIPLIER, score)
+
+    def brownlow_votes(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """3-2-1 votes per row: the top three scores of each game"""
+        n = len(self)
+        votes = np.zeros(n, dtype=np.int32)
+        if not n:
+            return votes
+        order = np.lexsort((-self.scores(weights), self.game))
+        sorted_games = self.game[order]
+        starts = np.flatnonzero(np.r_[True, sorted_games[1:] != sorted_games[:-1]])
+        rank = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+        ranked = rank < len(VOTES)
+        votes[order[ranked]] = np.asarray(VOTES)[rank[ranked]]
+        return votes
+
+    def leaderboard(self, stat: str, by: str = 'player', top: Optional[int] = 10,
+                    per_game: bool = False) -> List[Dict]:
+        """Highest totals (or per-game averages) of a stat"""
+        totals = self.group_sum(self.column(stat), by)
+        games = self.games_played(by)
+        values = np.divide(totals, games, out=np.zeros_like(totals), where=games > 0) if per_game else totals
+        return [self._row(by, i, games[i], **{'total': int(totals[i]), 'value': round(float(values[i]), 2)})
+                for i in _top_k(values, top)]
+
+    def brownlow_tally(self, top: Optional[int] = 20, team: Optional[str] = None,
+                       weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """Season vote count per player, most votes first"""
+        votes = self.brownlow_votes(weights)
+        totals = np.bincount(self.player, weights=votes, minlength=len(self.player_ids))
+        polled = np.bincount(self.player, weights=votes > 0, minlength=len(self.player_ids))
+        games = self.games_played('player')
+
+        if team is not None:
+            keep = np.flatnonzero(self.team_names[self.player_team] == team)
+            indices = keep[_top_k(totals[keep], top)]
+        else:
+            indices = _top_k(totals, top)
+        return [self._row('player', i, games[i], votes=int(totals[i]), games_polled=int(polled[i]))
+                for i in indices]
+
+    def _row(self, by: str, index: int, games: int, **values) -> Dict:
+        if by == 'player':
+            row = {
+                'player_id': int(self.player_ids[index]),
+                'player_name': self.player_names[index],
+                'team': self.team_names[self.player_team[index]]
+            }
+        elif by == 'team':
+            row = {'team_id': int(self.team_ids[index]), 'team': self.team_names[index]}
+        else:
+            row = {'round': int(self.rounds[index])}
+        row['games'] = int(games)
+        row.update(values)
+        return row
+
+
+class PlayerStatsStore:
+    """Process-wide cache of ``SeasonStats``, one per season.
+
+    A season is loaded with one query over its stat rows. After
+    ``refresh_seconds`` the next lookup compares the season's row count,
+    highest row id and latest stat and game update times with the loaded
+    copy and reloads only if they moved, so stats ingested (or corrected)
+    by backfill workers in other processes are picked up without
+    reloading on every request. Ingestion in this process invalidates
+    the season directly.
+    """
+
+    def __init__(self, refresh_seconds: Optional[int] = None, max_seasons: int = 8):
+        self.refresh_seconds = settings.player_stats_refresh_seconds if refresh_seconds is None else refresh_seconds
+        self.max_seasons = max(1, max_seasons)
+        self._seasons: "OrderedDict[int, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def season(self, db: Session, season: int) -> SeasonStats:
+        """Columnar stats for a season, loading or refreshing if needed"""
+        with self._lock:
+            entry = self._seasons.get(season)
+            if entry is not None:
+                self._seasons.move_to_end(season)
+        now = time.monotonic()
+        if entry is not None and now - entry['checked_at'] < self.refresh_seconds:
+            return entry['stats']
+
+        signature = self._signature(db, season)
+        if entry is not None and entry['signature'] == signature:
+            entry['checked_at'] = now
+            return entry['stats']
+
+        stats = self._load(db, season)
+        with self._lock:
+            self._seasons[season] = {'stats': stats, 'signature': signature, 'checked_at': now}
+            self._seasons.move_to_end(season)
+            while len(self._seasons) > self.max_seasons:
+                self._seasons.popitem(last=False)
+            self.loads += 1
+        return stats
+
+    def invalidate(self, season: Optional[int] = None) -> None:
+        with self._lock:
+            if season is None:
+                self._seasons.clear()
+            else:
+                self._seasons.pop(season, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'seasons': {season: len(entry['stats']) for season, entry in self._seasons.items()},
+                'loads': self.loads
+            }
+
+    @staticmethod
+    def _signature(db: Session, season: int) -> Tuple:
+        return tuple(db.execute(
+            select(func.count(PlayerGameStats.id), func.max(PlayerGameStats.id),
+                   func.max(PlayerGameStats.updated_at), func.max(Game.updated_at))
+            .join(Game, PlayerGameStats.game_id == Game.id)
+            .where(Game.season == season)
+        ).one())
+
+    @staticmethod
+    def _load(db: Session, season: int) -> SeasonStats:
+        start_time = time.time()
+        rows = db.execute(
+            select(
+                PlayerGameStats.game_id, PlayerGameStats.player_id,
+                func.coalesce(PlayerGameStats.team_id, 0),
+                *[func.coalesce(getattr(PlayerGameStats, name), 0) for name in STAT_COLUMNS]
+            )
+            .join(Game, PlayerGameStats.game_id == Game.id)
+            .where(Game.season == season)
+            .order_by(PlayerGameStats.game_id, PlayerGameStats.id)
+        ).all()
+        data = np.array(rows, dtype=np.int64)
+
+        games = []
+        for game_id, round_number, home_id, away_id, home_score, away_score in db.execute(
+            select(Game.id, Game.round_number, Game.home_team_id, Game.away_team_id,
+                   Game.home_score, Game.away_score).where(Game.season == season)
+        ):
+            winner = 0
+            if home_score is not None and away_score is not None and home_score != away_score:
+                winner = home_id if home_score > away_score else away_id
+            games.append((game_id, round_number, winner))
+
+        player_ids = np.unique(data[:, 1]).tolist() if len(data) else []
+        player_names = dict(db.execute(select(Player.id, Player.name).where(Player.id.in_(player_ids))).all()) if player_ids else {}
+        team_names = dict(db.execute(select(Team.id, Team.name)).all())
+
+        stats = SeasonStats(season, data, games, player_names, team_names)
+        logger.info(f"Loaded {len(stats)} player stat rows for {season} in {time.time() - start_time:.2f}s")
+        return stats
+
+
+# Shared by the player analytics routes
+player_stats_store = PlayerStatsStore()
@@ -0,0 +1,56 @@
+from typing import Dict
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import aliased
+
+from app.models.game import Game
+from app.models.prediction import Prediction
+from app.models.team import Team
+
+# Column projections for the games and predictions endpoints. Each statement
+# selects exactly the response fields (labelled with the response field names)
+# and joins team names through aliases, so a page is one query whatever its size.
+
+
+def game_rows() -> Select:
+    """Select GameResponse fields; filter, order and limit on ``Game`` columns"""
+    home, away = aliased(Team), aliased(Team)
+    return (
+        select(
+            Game.id, Game.season, Game.round_number, Game.game_number,
+            home.name.label('home_team_name'), away.name.label('away_team_name'),
+            Game.venue, Game.game_date, Game.is_finished,
+            Game.home_score, Game.away_score, Game.home_goals, Game.away_goals,
+            Game.home_behinds, Game.away_behinds,
+        )
+        .join(home, Game.home_team_id == home.id)
+        .join(away, Game.away_team_id == away.id)
+    )
+
+
+def prediction_rows() -> Select:
+    """Select PredictionResponse fields; filter, order and limit on ``Prediction``/``Game`` columns"""
+    home, away, winner = aliased(Team), aliased(Team), aliased(Team)
+    return (
+        select(
+            Prediction.id, Prediction.game_id,
+            home.name.label('home_team_name'), away.name.label('away_team_name'),
+            func.coalesce(winner.name, '').label('predicted_winner_name'),
+            Prediction.confidence_score, Prediction.predicted_home_score, Prediction.predicted_away_score,
+            Prediction.reasoning, Prediction.factors_considered,
+            Prediction.recommended_bet, Prediction.bet_confidence,
+            Prediction.model_version, Prediction.prediction_date, Prediction.is_correct,
+        )
+        .join(Game, Prediction.game_id == Game.id)
+        .join(home, Game.home_team_id == home.id)
+        .join(away, Game.away_team_id == away.id)
+        .outerjoin(winner, Prediction.predicted_winner_id == winner.id)
+    )
+
+
+def prediction_fields(row) -> Dict:
+    """Response fields of a ``prediction_rows`` row (factors are stored comma-separated)"""
+    fields = dict(row)
+    factors = fields['factors_considered']
+    fields['factors_considered'] = factors.split(',') if factors else []
+    return fields
@@ -3,9 +3,14 @@ from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
+from app.core.response_cache import response_cache
 from app.scrapers.afltables_upcoming import AFLTablesUpcomingScraper
 from app.scrapers.afltables_results import AFLTablesResultsScraper
 from app.ai.predictor import AFLPredictor
+from app.services.analytics_rollup_service import analytics_rollup_service
+from app.services.backfill_service import backfill_service
+from app.services.export_service import export_service
+from app.services.tip_service import tip_service
 from app.models.game import Game
 from app.models.prediction import Prediction
 import logging
@@ -73,6 +78,24 @@ class SchedulerService:
             replace_existing=True
         )
         
+        # Catch-up refresh of analytics rollups - every hour at :15
+        self.scheduler.add_job(
+            func=self._refresh_analytics_rollups,
+            trigger=CronTrigger(minute=15),
+            id='refresh_analytics_rollups',
+            name='Refresh Analytics Rollups',
+            replace_existing=True
+        )
+        
+        # Restart queued or stalled backfill jobs (e.g. after an instance restart) - every 10 minutes
+        self.scheduler.add_job(
+            func=self._resume_backfill_jobs,
+            trigger=CronTrigger(minute='*/10'),
+            id='resume_backfill_jobs',
+            name='Resume Stalled Backfill Jobs',
+            replace_existing=True
+        )
+        
         # Daily health check - every day at 7:00 AM
         self.scheduler.add_job(
             func=self._daily_health_check,
@@ -101,7 +124,8 @@ class SchedulerService:
                 
                 if result['success']:
                     logger.info(f"Successfully processed {result['total_processed']} upcoming games. "
-                              f"Saved: {result['saved_count']}, Updated: {result['updated_count']}")
+                              f"Saved: {result['saved_count']}, Updated: {result['updated_count']}, "
+                              f"Unchanged: {result['unchanged_count']}")
                     
                     if result['errors']:
                         logger.warning(f"Encountered {len(result['errors'])} errors: {result['errors']}")
@@ -132,7 +156,16 @@ class SchedulerService:
                 
                 if result['success']:
                     logger.info(f"Successfully processed {result['total_processed']} recent results. "
-                              f"Updated: {result['updated_count']}")
+                              f"Saved: {result['saved_count']}, Updated: {result['updated_count']}, "
+                              f"Unchanged: {result['unchanged_count']}")
+                    
+                    # Evaluate predictions for games that just became final
+                    finished_ids = result['changeset']['finished_ids']
+                    if finished_ids:
+                        accuracy = scraper.update_prediction_accuracy(db, game_ids=finished_ids)
+                        if not accuracy['success']:
+                            logger.error(f"Failed to update prediction accuracy: {accuracy['error']}")
+                        self._refresh_game_exports(db, finished_ids)
                     
                     if result['errors']:
                         logger.warning(f"Encountered {len(result['errors'])} errors: {result['errors']}")
@@ -146,6 +179,13 @@ class SchedulerService:
         finally:
             db.close()
     
+    def _refresh_game_exports(self, db: Session, game_ids):
+        """Re-export the seasons of newly finished games so the predictor's context includes them"""
+        seasons = [season for (season,) in db.query(Game.season).filter(Game.id.in_(game_ids)).distinct()]
+        result = export_service.export(db, 'games', seasons=seasons)
+        if not result['success']:
+            logger.error(f"Failed to export games for seasons {seasons}: {result['error']}")
+    
     def _generate_weekly_tips(self):
         """Automated task to generate tips for upcoming games"""
         logger.info("Starting automated weekly tip generation")
@@ -183,6 +223,9 @@ class SchedulerService:
                     predictions_saved += 1
             
             db.commit()
+            if predictions_saved:
+                response_cache.invalidate('predictions')
+                tip_service.build_snapshots(db)
             
             logger.info(f"Generated and saved {predictions_saved} new predictions for {len(upcoming_games)} upcoming games")
             
@@ -212,6 +255,32 @@ class SchedulerService:
         finally:
             db.close()
     
+    def _refresh_analytics_rollups(self):
+        """Automated task to refresh analytics rollups for newly evaluated predictions"""
+        db = SessionLocal()
+        try:
+            result = analytics_rollup_service.refresh_pending(db)
+            if not result['success']:
+                logger.error(f"Failed to refresh analytics rollups: {result['error']}")
+                
+        except Exception as e:
+            logger.error(f"Error in automated analytics rollup refresh: {str(e)}")
+        finally:
+            db.close()
+    
+    def _resume_backfill_jobs(self):
+        """Automated task to start workers for queued or stalled backfill jobs"""
+        db = SessionLocal()
+        try:
+            job_ids = backfill_service.resume_stale_jobs(db)
+            if job_ids:
+                logger.info(f"Started workers for backfill jobs: {job_ids}")
+                
+        except Exception as e:
+            logger.error(f"Error resuming backfill jobs: {str(e)}")
+        finally:
+            db.close()
+    
     def _daily_health_check(self):
         """Daily health check of the system"""
         logger.info("Performing daily health check")
@@ -263,6 +332,10 @@ class SchedulerService:
                 self._generate_weekly_tips()
             elif job_id == 'update_prediction_accuracy':
                 self._update_prediction_accuracy()
+            elif job_id == 'refresh_analytics_rollups':
+                self._refresh_analytics_rollups()
+            elif job_id == 'resume_backfill_jobs':
+                self._resume_backfill_jobs()
             elif job_id == 'daily_health_check':
                 self._daily_health_check()
             else:
@@ -0,0 +1,185 @@
+import logging
+import re
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.team import Team
+
+logger = logging.getLogger(__name__)
+
+# afltables team names (as stored in teams.name) and the other spellings scrapers meet
+TEAM_ALIASES = {
+    'Adelaide': ['Adelaide Crows', 'Crows', 'ADE'],
+    'Brisbane Lions': ['Brisbane', 'Lions', 'BL', 'BRI'],
+    'Carlton': ['Blues', 'CAR'],
+    'Collingwood': ['Magpies', 'COL'],
+    'Essendon': ['Bombers', 'ESS'],
+    'Fremantle': ['Dockers', 'FRE'],
+    'Geelong': ['Geelong Cats', 'Cats', 'GEE'],
+    'Gold Coast': ['Gold Coast Suns', 'Suns', 'GC', 'GCS'],
+    'Greater Western Sydney': ['GWS', 'GWS Giants', 'GW Sydney', 'Giants'],
+    'Hawthorn': ['Hawks', 'HAW'],
+    'Melbourne': ['Demons', 'MEL'],
+    'North Melbourne': ['Kangaroos', 'North', 'NM', 'NTH'],
+    'Port Adelaide': ['Power', 'Port', 'PA', 'PTA'],
+    'Richmond': ['Tigers', 'RIC'],
+    'St Kilda': ['Saints', 'STK'],
+    'Sydney': ['Sydney Swans', 'Swans', 'South Melbourne', 'SYD'],
+    'West Coast': ['West Coast Eagles', 'Eagles', 'WC', 'WCE'],
+    'Western Bulldogs': ['Bulldogs', 'Footscray', 'WB', 'WBD'],
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_team_name(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace ("St. Kilda" -> "st kilda")"""
+    return _SPACES.sub(' ', _NON_WORD.sub('', (text or '').lower())).strip()
+
+
+_CANONICAL = {}
+for _name, _aliases in TEAM_ALIASES.items():
+    for _alias in [_name, *_aliases]:
+        _CANONICAL[normalize_team_name(_alias)] = _name
+
+
+def canonical_team_name(text: str) -> Optional[str]:
+    """afltables name for a known spelling, or None (exact match, never a substring)"""
+    return _CANONICAL.get(normalize_team_name(text))
+
+
+class TeamAliasIndex:
+    """In-memory map from any known team spelling to its ``teams.id``.
+
+    Built once from the teams table (name, abbreviation and the aliases of
+    the team's canonical name); lookups are a dict hit. A miss reloads the
+    table at most every ``reload_interval`` seconds, so teams created by
+    another process are picked up without a query per unknown row.
+
+    Teams created in this process are only indexed once their transaction
+    commits (``add_on_commit``), so a rolled back insert never leaves an id
+    behind for a row that doesn't exist.
+    """
+
+    _PENDING_KEY = 'team_alias_pending'
+
+    def __init__(self, reload_interval: int = 60):
+        self.reload_interval = reload_interval
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        """(Re)build the index from the teams table"""
+        rows = db.execute(select(Team.id, Team.name, Team.abbreviation)).all()
+        ids = {}
+        self._index(ids, rows)
+        names = {team_id: name for team_id, name, _ in rows}
+
+        with self._lock:
+            self._ids = ids
+            self._names = names
+            self._loaded_at = time.monotonic()
+        logger.info(f"Team alias index loaded: {len(names)} teams, {len(ids)} spellings")
+
+    def resolve(self, db: Session, team_name: str) -> Optional[int]:
+        """Team id for a scraped team string, or None if it is not a known team"""
+        key = normalize_team_name(team_name)
+        if self._loaded_at is None:
+            self.load(db)
+        team_id = self._ids.get(key)
+        if team_id is None and db.info.get(self._PENDING_KEY):
+            # Created earlier in this (still open) transaction
+            pending = {}
+            self._index(pending, db.info[self._PENDING_KEY])
+            team_id = pending.get(key)
+        if team_id is None and time.monotonic() - self._loaded_at >= self.reload_interval:
+            self.load(db)
+            team_id = self._ids.get(key)
+        return team_id
+
+    def get_team(self, db: Session, team_name: str) -> Optional[Team]:
+        """The ``Team`` row for a scraped team string, reloading once if the indexed id is gone"""
+        team_id = self.resolve(db, team_name)
+        if team_id is None:
+            return None
+        team = db.get(Team, team_id)
+        if team is None:
+            logger.warning(f"Team {team_id} ({team_name}) no longer exists, reloading team alias index")
+            self.load(db)
+            team_id = self._ids.get(normalize_team_name(team_name))
+            team = db.get(Team, team_id) if team_id is not None else None
+        return team
+
+    def resolve_many(self, db: Session, team_names: Iterable[str]) -> Dict[str, int]:
+        """Map each resolvable name to its team id; unknown names are logged and left out"""
+        team_ids = {}
+        for team_name in set(team_names):
+            team_id = self.resolve(db, team_name)
+            if team_id is None:
+                logger.warning(f"Unknown team: {team_name}")
+            else:
+                team_ids[team_name] = team_id
+        return team_ids
+
+    def name_for(self, team_id: int) -> Optional[str]:
+        return self._names.get(team_id)
+
+    def add_on_commit(self, db: Session, team: Team) -> None:
+        """Register a team inserted on ``db`` once the session's transaction commits"""
+        pending = db.info.get(self._PENDING_KEY)
+        if pending is None:
+            pending = db.info[self._PENDING_KEY] = []
+            event.listen(db, 'after_commit', self._add_pending)
+            event.listen(db, 'after_rollback', self._drop_pending)
+        pending.append((team.id, team.name, team.abbreviation))
+
+    def _add_pending(self, db: Session) -> None:
+        pending = db.info.get(self._PENDING_KEY)
+        while pending:
+            self.add(*pending.pop())
+
+    def _drop_pending(self, db: Session) -> None:
+        db.info.get(self._PENDING_KEY, []).clear()
+
+    def add(self, team_id: int, name: str, abbreviation: Optional[str] = None) -> None:
+        """Register a committed team created in this process"""
+        with self._lock:
+            ids = dict(self._ids)
+            self._index(ids, [(team_id, name, abbreviation)])
+            self._ids = ids
+            self._names = {**self._names, team_id: name}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def stats(self) -> Dict:
+        return {
+            'teams': len(self._names),
+            'spellings': len(self._ids),
+            'loaded': self._loaded_at is not None
+        }
+
+    @staticmethod
+    def _index(ids: Dict[str, int], rows) -> None:
+        # Stored names and abbreviations win over aliases
+        for team_id, name, abbreviation in rows:
+            for spelling in (name, abbreviation):
+                if spelling:
+                    ids[normalize_team_name(spelling)] = team_id
+        for team_id, name, _ in rows:
+            canonical = canonical_team_name(name)
+            if canonical:
+                for spelling in [canonical, *TEAM_ALIASES[canonical]]:
+                    ids.setdefault(normalize_team_name(spelling), team_id)
+
+
+# Shared by every scraper and ingestion path in the process
+team_alias_index = TeamAliasIndex()
@@ -0,0 +1,194 @@
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+
+from app.models.game import Game
+from app.models.team_stats import TeamSeasonStats, FORM_LENGTH
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = [
+    'games_played', 'wins', 'losses', 'draws', 'points_for', 'points_against',
+    'home_games', 'home_wins', 'home_points_for', 'home_points_against',
+    'away_games', 'away_wins', 'away_points_for', 'away_points_against',
+]
+
+
+class TeamStatsService:
+    """Maintains the team_season_stats table from finished games."""
+
+    def record_result(self, db: Session, game: Game, was_finished: bool = False) -> bool:
+        """Apply a newly finished game to both teams' season rows (caller commits).
+
+        If the game was already finished (a score correction) or arrives out of
+        date order, the affected rows are recomputed from games instead.
+        """
+        if not self._is_complete(game):
+            return False
+
+        try:
+            for team_id in (game.home_team_id, game.away_team_id):
+                row = self._get_or_create(db, team_id, game.season)
+                out_of_order = (
+                    row.last_game_date is not None and game.game_date is not None
+                    and game.game_date < row.last_game_date
+                )
+                if was_finished or out_of_order:
+                    self.refresh_team_season(db, team_id, game.season)
+                else:
+                    self._apply_game(row, game, team_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error recording result for game {game.id}: {e}")
+            raise
+
+    def refresh_team_season(self, db: Session, team_id: int, season: int) -> TeamSeasonStats:
+        """Recompute one team's season row from its finished games"""
+        # Pending score/finish changes must be visible to the query below
+        db.flush()
+        games = db.query(Game).filter(
+            (Game.home_team_id == team_id) | (Game.away_team_id == team_id),
+            Game.season == season,
+            Game.is_finished == True
+        ).order_by(Game.game_date, Game.round_number, Game.id).all()
+
+        row = self._get_or_create(db, team_id, season)
+        self._reset(row)
+        for game in games:
+            if self._is_complete(game):
+                self._apply_game(row, game, team_id)
+        return row
+
+    def rebuild(self, db: Session, season: Optional[int] = None) -> Dict:
+        """Rebuild the table (or one season of it) from the games table"""
+        try:
+            delete_query = db.query(TeamSeasonStats)
+            games_query = db.query(Game).filter(
+                Game.is_finished == True,
+                Game.home_score.isnot(None),
+                Game.away_score.isnot(None)
+            )
+            if season is not None:
+                delete_query = delete_query.filter(TeamSeasonStats.season == season)
+                games_query = games_query.filter(Game.season == season)
+
+            delete_query.delete(synchronize_session=False)
+
+            rows: Dict[tuple, TeamSeasonStats] = {}
+            games_processed = 0
+            for game in games_query.order_by(Game.season, Game.game_date, Game.round_number, Game.id).yield_per(1000):
+                for team_id in (game.home_team_id, game.away_team_id):
+                    key = (team_id, game.season)
+                    if key not in rows:
+                        rows[key] = TeamSeasonStats(team_id=team_id, season=game.season)
+                        self._reset(rows[key])
+                    self._apply_game(rows[key], game, team_id)
+                games_processed += 1
+
+            db.add_all(rows.values())
+            db.commit()
+
+            logger.info(f"Rebuilt {len(rows)} team season rows from {games_processed} games")
+            return {
+                'success': True,
+                'rows': len(rows),
+                'games_processed': games_processed,
+                'season': season
+            }
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error rebuilding team season stats: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def get_team_season(self, db: Session, team_id: int, season: int) -> Optional[TeamSeasonStats]:
+        """Look up a single team's season row"""
+        return db.query(TeamSeasonStats).filter(
+            TeamSeasonStats.team_id == team_id,
+            TeamSeasonStats.season == season
+        ).first()
+
+    def get_summaries(self, db: Session, team_ids: Iterable[int], from_season: int) -> Dict[int, Dict]:
+        """Sum season rows from ``from_season`` onwards into one record per team"""
+        rows = db.query(TeamSeasonStats).filter(
+            TeamSeasonStats.team_id.in_(list(team_ids)),
+            TeamSeasonStats.season >= from_season
+        ).all()
+
+        totals: Dict[int, Dict] = defaultdict(lambda: {field: 0 for field in COUNTER_FIELDS})
+        for row in rows:
+            for field in COUNTER_FIELDS:
+                totals[row.team_id][field] += getattr(row, field) or 0
+
+        summaries = {}
+        for team_id, total in totals.items():
+            games_played = total['games_played']
+            total['avg_score_for'] = total['points_for'] / games_played if games_played else 0
+            total['avg_score_against'] = total['points_against'] / games_played if games_played else 0
+            summaries[team_id] = total
+        return summaries
+
+    def _get_or_create(self, db: Session, team_id: int, season: int) -> TeamSeasonStats:
+        row = self.get_team_season(db, team_id, season)
+        if row is None:
+            row = TeamSeasonStats(team_id=team_id, season=season)
+            self._reset(row)
+            db.add(row)
+            # Flush so a later game in the same batch finds this row
+            db.flush()
+        return row
+
+    @staticmethod
+    def _is_complete(game: Game) -> bool:
+        return bool(game.is_finished) and game.home_score is not None and game.away_score is not None
+
+    @staticmethod
+    def _reset(row: TeamSeasonStats):
+        for field in COUNTER_FIELDS:
+            setattr(row, field, 0)
+        row.recent_form = ""
+        row.last_game_date = None
+
+    @staticmethod
+    def _apply_game(row: TeamSeasonStats, game: Game, team_id: int):
+        is_home = game.home_team_id == team_id
+        score_for = game.home_score if is_home else game.away_score
+        score_against = game.away_score if is_home else game.home_score
+
+        row.games_played += 1
+        row.points_for += score_for
+        row.points_against += score_against
+
+        if score_for > score_against:
+            result = 'W'
+            row.wins += 1
+        elif score_for < score_against:
+            result = 'L'
+            row.losses += 1
+        else:
+            result = 'D'
+            row.draws += 1
+
+        if is_home:
+            row.home_games += 1
+            row.home_points_for += score_for
+            row.home_points_against += score_against
+            if result == 'W':
+                row.home_wins += 1
+        else:
+            row.away_games += 1
+            row.away_points_for += score_for
+            row.away_points_against += score_against
+            if result == 'W':
+                row.away_wins += 1
+
+        row.recent_form = ((row.recent_form or "") + result)[-FORM_LENGTH:]
+        if game.game_date and (row.last_game_date is None or game.game_date > row.last_game_date):
+            row.last_game_date = game.game_date
+
+
+# Shared instance for scrapers and jobs
+team_stats_service = TeamStatsService()
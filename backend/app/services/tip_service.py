@@ -1,63 +1,78 @@
-from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.orm import Session, aliased
+from typing import Iterable, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+import json
+import threading
+from app.core.config import settings
 from app.models.prediction import Prediction
 from app.models.game import Game
 from app.models.team import Team
-from app.ai.predictor import AFLPredictor
+from app.models.tip_snapshot import TipSnapshot
+from app.core.response_cache import response_cache
+from app.services.response_queries import game_rows
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Old snapshot versions kept per round/week for inspection and rollback
+SNAPSHOT_VERSIONS_KEPT = 3
+
+# Parsed documents by snapshot id (rows are never modified, only superseded)
+_documents: Dict[int, Dict] = {}
+_documents_lock = threading.Lock()
+
+
+def round_key(season: int, round_number: int) -> str:
+    return f"{season}-R{round_number}"
+
+
+def week_key(when: datetime) -> str:
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
 class TipService:
-    """Service for managing and formatting AI-generated tips for users"""
+    """Service for managing and formatting AI-generated tips for users.
+
+    Tips are built in bulk (one games query, one predictions query) and
+    materialized as versioned ``TipSnapshot`` documents, one per round and
+    one for the upcoming weeks, whenever predictions are saved. The read
+    endpoints serve the latest snapshot and only build tips live when no
+    snapshot covers the request.
+    """
+    
+    def __init__(self, predictor=None):
+        self._predictor = predictor
     
-    def __init__(self):
-        self.predictor = AFLPredictor()
+    @property
+    def predictor(self):
+        # Only generation needs the model; read paths never construct it
+        if self._predictor is None:
+            from app.ai.predictor import AFLPredictor
+            self._predictor = AFLPredictor()
+        return self._predictor
     
     def get_weekly_tips(self, db: Session, weeks_ahead: int = 1) -> Dict:
         """Get formatted tips for upcoming games in the next week(s)"""
         try:
-            # Calculate date range
             start_date = datetime.now()
             end_date = start_date + timedelta(weeks=weeks_ahead)
+            tips, snapshot = self._window_tips(db, start_date, end_date)
             
-            # Get upcoming games with predictions
-            upcoming_games_query = db.query(Game).filter(
-                Game.is_finished == False,
-                Game.game_date > start_date,
-                Game.game_date <= end_date
-            ).order_by(Game.game_date)
-            
-            upcoming_games = upcoming_games_query.all()
-            
-            if not upcoming_games:
-                return {
-                    'success': True,
-                    'tips': [],
-                    'message': 'No upcoming games found for the specified period',
-                    'week_range': {
-                        'start': start_date.strftime('%Y-%m-%d'),
-                        'end': end_date.strftime('%Y-%m-%d')
-                    }
-                }
-            
-            # Format tips for each game
-            formatted_tips = []
-            for game in upcoming_games:
-                tip = self._format_game_tip(db, game)
-                if tip:
-                    formatted_tips.append(tip)
-            
-            return {
+            result = {
                 'success': True,
-                'tips': formatted_tips,
-                'total_games': len(formatted_tips),
+                'tips': tips,
+                'total_games': len(tips),
                 'week_range': {
                     'start': start_date.strftime('%Y-%m-%d'),
                     'end': end_date.strftime('%Y-%m-%d')
-                }
+                },
+                'snapshot': snapshot
             }
+            if not tips:
+                result['message'] = 'No upcoming games found for the specified period'
+            return result
             
         except Exception as e:
             logger.error(f"Error getting weekly tips: {str(e)}")
@@ -66,19 +81,50 @@ class TipService:
                 'error': str(e)
             }
     
+    def get_upcoming_tips(self, db: Session, days_ahead: int = 7) -> Dict:
+        """Get tips for games in the next specified days"""
+        try:
+            start_date = datetime.now()
+            end_date = start_date + timedelta(days=days_ahead)
+            tips, snapshot = self._window_tips(db, start_date, end_date)
+            
+            result = {
+                'success': True,
+                'tips': tips,
+                'total_games': len(tips),
+                'date_range': {
+                    'start': start_date.strftime('%Y-%m-%d'),
+                    'end': end_date.strftime('%Y-%m-%d')
+                },
+                'snapshot': snapshot
+            }
+            if not tips:
+                result['message'] = f'No upcoming games found in the next {days_ahead} days'
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error getting upcoming tips: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def get_round_tips(self, db: Session, round_number: int, season: int = None) -> Dict:
         """Get tips for a specific round"""
         try:
             if not season:
                 season = datetime.now().year
             
-            # Get games for the specified round
-            round_games = db.query(Game).filter(
-                Game.round == round_number,
-                Game.season == season
-            ).order_by(Game.game_date).all()
+            snapshot = self._latest_snapshot(db, 'round', round_key(season, round_number))
+            if snapshot:
+                tips = snapshot['document']['tips']
+            else:
+                tips = self._build_tips(db, game_rows().where(
+                    Game.round_number == round_number,
+                    Game.season == season
+                ).order_by(Game.game_date))
             
-            if not round_games:
+            if not tips:
                 return {
                     'success': True,
                     'tips': [],
@@ -87,19 +133,13 @@ class TipService:
                     'season': season
                 }
             
-            # Format tips for each game
-            formatted_tips = []
-            for game in round_games:
-                tip = self._format_game_tip(db, game)
-                if tip:
-                    formatted_tips.append(tip)
-            
             return {
                 'success': True,
-                'tips': formatted_tips,
-                'total_games': len(formatted_tips),
+                'tips': tips,
+                'total_games': len(tips),
                 'round': round_number,
-                'season': season
+                'season': season,
+                'snapshot': snapshot['info'] if snapshot else None
             }
             
         except Exception as e:
@@ -109,35 +149,196 @@ class TipService:
                 'error': str(e)
             }
     
+    def build_snapshots(self, db: Session, weeks_ahead: Optional[int] = None,
+                        rounds: Optional[Iterable[Tuple[int, int]]] = None) -> Dict:
+        """Materialize tips for the upcoming weeks and every round they touch.
+
+        ``rounds`` adds (season, round_number) pairs to rebuild even when none
+        of their games is upcoming, e.g. rounds a fixture sync changed.
+        Each document is stored as a new version; readers always take the
+        latest, so the commit swaps all of them in at once.
+        """
+        try:
+            weeks_ahead = weeks_ahead or settings.tip_snapshot_weeks
+            now = datetime.now()
+            end_date = now + timedelta(weeks=weeks_ahead)
+            
+            upcoming = self._build_tips(db, game_rows().where(
+                Game.is_finished == False,
+                Game.game_date > now,
+                Game.game_date <= end_date
+            ).order_by(Game.game_date))
+            
+            documents = {
+                ('week', week_key(now)): {
+                    'document': {
+                        'window': {'start': now.isoformat(), 'end': end_date.isoformat()},
+                        'tips': upcoming
+                    },
+                    'season': now.year,
+                    'round_number': None
+                }
+            }
+            
+            rounds = {(tip['season'], tip['round']) for tip in upcoming if tip['round'] is not None} | {
+                (season, round_number) for season, round_number in rounds or () if round_number is not None
+            }
+            if rounds:
+                round_tips = self._build_tips(db, game_rows().where(or_(*[
+                    and_(Game.season == season, Game.round_number == round_number)
+                    for season, round_number in rounds
+                ])).order_by(Game.game_date))
+                for season, round_number in rounds:
+                    documents[('round', round_key(season, round_number))] = {
+                        'document': {
+                            'tips': [tip for tip in round_tips
+                                     if tip['season'] == season and tip['round'] == round_number]
+                        },
+                        'season': season,
+                        'round_number': round_number
+                    }
+            
+            versions = dict(
+                ((scope, key), version) for scope, key, version in db.execute(
+                    select(TipSnapshot.scope, TipSnapshot.scope_key, func.max(TipSnapshot.version))
+                    .where(TipSnapshot.scope_key.in_([key for _, key in documents]))
+                    .group_by(TipSnapshot.scope, TipSnapshot.scope_key)
+                )
+            )
+            
+            built_at = datetime.utcnow()
+            for (scope, key), entry in documents.items():
+                version = versions.get((scope, key), 0) + 1
+                document = dict(entry['document'], built_at=built_at.isoformat(), version=version)
+                db.add(TipSnapshot(
+                    scope=scope,
+                    scope_key=key,
+                    season=entry['season'],
+                    round_number=entry['round_number'],
+                    version=version,
+                    document=json.dumps(document, default=str),
+                    games_count=len(document['tips']),
+                    built_at=built_at
+                ))
+                db.execute(delete(TipSnapshot).where(
+                    TipSnapshot.scope == scope,
+                    TipSnapshot.scope_key == key,
+                    TipSnapshot.version <= version - SNAPSHOT_VERSIONS_KEPT
+                ))
+            
+            db.commit()
+            response_cache.invalidate('tips')
+            
+            logger.info(f"Built tip snapshots: {len(upcoming)} upcoming games, {len(rounds)} rounds")
+            return {
+                'success': True,
+                'snapshots': len(documents),
+                'upcoming_games': len(upcoming),
+                'rounds': sorted(rounds)
+            }
+            
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error building tip snapshots: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _window_tips(self, db: Session, start_date: datetime, end_date: datetime) -> Tuple[List[Dict], Optional[Dict]]:
+        """Upcoming tips in a date range, from the latest week snapshot when it covers the range"""
+        snapshot = self._latest_snapshot(db, 'week')
+        if snapshot and datetime.fromisoformat(snapshot['document']['window']['end']) >= end_date:
+            tips = [
+                tip for tip in snapshot['document']['tips']
+                if tip['game_date'] and start_date < datetime.fromisoformat(tip['game_date']) <= end_date
+            ]
+            return tips, snapshot['info']
+        
+        tips = self._build_tips(db, game_rows().where(
+            Game.is_finished == False,
+            Game.game_date > start_date,
+            Game.game_date <= end_date
+        ).order_by(Game.game_date))
+        return tips, None
+    
+    def _latest_snapshot(self, db: Session, scope: str, scope_key: Optional[str] = None) -> Optional[Dict]:
+        query = select(TipSnapshot.id, TipSnapshot.scope_key, TipSnapshot.version, TipSnapshot.built_at).where(
+            TipSnapshot.scope == scope
+        )
+        if scope_key is not None:
+            query = query.where(TipSnapshot.scope_key == scope_key)
+        latest = db.execute(
+            query.order_by(TipSnapshot.built_at.desc(), TipSnapshot.version.desc()).limit(1)
+        ).first()
+        if latest is None:
+            return None
+        
+        document = _documents.get(latest.id)
+        if document is None:
+            document = json.loads(db.execute(
+                select(TipSnapshot.document).where(TipSnapshot.id == latest.id)
+            ).scalar_one())
+            with _documents_lock:
+                if len(_documents) >= 64:
+                    _documents.clear()
+                _documents[latest.id] = document
+        
+        return {
+            'document': document,
+            'info': {
+                'key': latest.scope_key,
+                'version': latest.version,
+                'built_at': latest.built_at.isoformat() if latest.built_at else None
+            }
+        }
+    
+    def _build_tips(self, db: Session, games_query) -> List[Dict]:
+        """Tips for every game selected by a ``game_rows()`` query, in two queries total"""
+        games = db.execute(games_query).mappings().all()
+        if not games:
+            return []
+        
+        # Latest prediction per game, with the winner's name joined in
+        winner = aliased(Team)
+        latest = {}
+        for prediction, winner_name in db.execute(
+            select(Prediction, winner.name)
+            .outerjoin(winner, Prediction.predicted_winner_id == winner.id)
+            .where(Prediction.game_id.in_([game['id'] for game in games]))
+            .order_by(Prediction.game_id, Prediction.prediction_date, Prediction.id)
+        ):
+            latest[prediction.game_id] = (prediction, winner_name)
+        
+        tips = []
+        for game in games:
+            tip = self._game_tip(game, *latest.get(game['id'], (None, None)))
+            if tip:
+                tips.append(tip)
+        return tips
+    
     def _format_game_tip(self, db: Session, game: Game) -> Optional[Dict]:
         """Format a single game into a user-friendly tip"""
+        tips = self._build_tips(db, game_rows().where(Game.id == game.id))
+        return tips[0] if tips else None
+    
+    def _game_tip(self, game, prediction: Optional[Prediction], predicted_winner_name: Optional[str]) -> Optional[Dict]:
+        """Format a ``game_rows()`` row and its latest prediction into a tip"""
         try:
-            # Get the latest prediction for this game
-            prediction = db.query(Prediction).filter(
-                Prediction.game_id == game.id
-            ).order_by(Prediction.prediction_date.desc()).first()
-            
             # Basic game info
             tip = {
-                'game_id': game.id,
-                'home_team': game.home_team,
-                'away_team': game.away_team,
-                'venue': game.venue,
-                'game_date': game.game_date.isoformat() if game.game_date else None,
-                'round': game.round,
-                'season': game.season,
-                'match_title': f"{game.home_team} vs {game.away_team}",
+                'game_id': game['id'],
+                'home_team': game['home_team_name'],
+                'away_team': game['away_team_name'],
+                'venue': game['venue'],
+                'game_date': game['game_date'].isoformat() if game['game_date'] else None,
+                'round': game['round_number'],
+                'season': game['season'],
+                'match_title': f"{game['home_team_name']} vs {game['away_team_name']}",
                 'has_prediction': prediction is not None
             }
             
             if prediction:
-                # Get predicted winner team name
-                predicted_winner_name = None
-                if prediction.predicted_winner_id:
-                    winner_team = db.query(Team).filter(Team.id == prediction.predicted_winner_id).first()
-                    if winner_team:
-                        predicted_winner_name = winner_team.name
-                
                 # Format the prediction
                 tip.update({
                     'prediction': {
@@ -292,6 +493,9 @@ class TipService:
                 predictions_saved += 1
             
             db.commit()
+            if predictions_saved:
+                response_cache.invalidate('predictions')
+                self.build_snapshots(db)
             
             return {
                 'success': True,
@@ -354,4 +558,8 @@ class TipService:
             return {
                 'success': False,
                 'error': str(e)
-            } 
\ No newline at end of file
+            }
+
+
+# Shared instance used by the tips routes and the scheduler
+tip_service = TipService()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark the afltables parser backends (BeautifulSoup html.parser vs lxml).
+
+Parses saved season and game stats pages with every backend, checks the
+outputs are identical and prints per-page timings. Season pages are timed
+twice: as the fixture/results scrapers read them and as the backfill does
+(games with their match stats links). Pages come from the
+scrapers' HTTP cache, a directory of saved .html files, or (when neither
+is given) synthetic pages shaped like afltables.
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import random
+import sqlite3
+import statistics
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.scrapers.constants import DEFAULT_BASE_URL
+from app.scrapers.parsing import PARSER_BACKENDS, get_parser
+import argparse
+
+SEASON_URL = re.compile(r'seas[/_](\d{4})\.html?$')
+STATS_URL = re.compile(r'stats[/_]games[/_](\d{4})[/_][^/]+\.html?$')
+PAGE_KINDS = ('season', 'backfill', 'stats')
+
+def pages_from_cache(cache_dir: str):
+    """(kind, season, name, content) for season and stats pages in the HTTP cache"""
+    index = Path(cache_dir) / 'index.sqlite3'
+    if not index.exists():
+        return []
+    conn = sqlite3.connect(str(index))
+    try:
+        rows = conn.execute("SELECT url, content_hash FROM http_pages").fetchall()
+    finally:
+        conn.close()
+    pages = []
+    for url, content_hash in rows:
+        blob = Path(cache_dir) / 'blobs' / content_hash[:2] / content_hash
+        page = classify(url, blob)
+        if page:
+            pages.append(page)
+    return pages
+
+def pages_from_dir(pages_dir: str):
+    """Saved pages named like seas_2024.html or stats_games_2024_123.html (or mirrored paths)"""
+    pages = []
+    for path in sorted(Path(pages_dir).rglob('*.htm*')):
+        page = classify(path.relative_to(pages_dir).as_posix(), path)
+        if page:
+            pages.append(page)
+    return pages
+
+def classify(name: str, path: Path):
+    season_match = SEASON_URL.search(name)
+    if season_match:
+        return ('season', int(season_match.group(1)), name, path.read_bytes())
+    stats_match = STATS_URL.search(name)
+    if stats_match:
+        return ('stats', int(stats_match.group(1)), name, path.read_bytes())
+    return None
+
+def synthetic_season_page(season: int, rng: random.Random) -> bytes:
+    """A season page with afltables' layout: round tables followed by two-row game tables"""
+    teams = ['Adelaide', 'Brisbane Lions', 'Carlton', 'Collingwood', 'Essendon', 'Fremantle',
+             'Geelong', 'Gold Coast', 'GWS', 'Hawthorn', 'Melbourne', 'North Melbourne',
+             'Port Adelaide', 'Richmond', 'St Kilda', 'Sydney', 'West Coast', 'Western Bulldogs']
+    venues = ['M.C.G.', 'Docklands', 'Adelaide Oval', 'Gabba', 'S.C.G.', 'Perth Stadium']
+    parts = ['<html><head><title>AFL Tables</title></head><body><center>']
+    for round_number in range(1, 24):
+        parts.append(f'<table border="2"><tr><td colspan="2"><b>Round: {round_number}</b></td></tr>'
+                     f'<tr><td><b>Round {round_number}</b></td></tr></table>')
+        rng.shuffle(teams)
+        for i in range(0, len(teams), 2):
+            home, away = teams[i], teams[i + 1]
+            day = 1 + (round_number * 7 + i) % 28
+            month = ['Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug'][round_number // 4]
+            hg, hb, ag, ab = rng.randint(6, 20), rng.randint(4, 16), rng.randint(6, 20), rng.randint(4, 16)
+            parts.append(
+                f'<table style="font: 12px Verdana;" border="1" width="100%">'
+                f'<tr><td width="16%"><a href="../teams/{home.lower()}_idx.html">{home}</a></td>'
+                f'<td width="17%"><tt>{rng.randint(1, 6)}.{rng.randint(0, 5)}&nbsp;</tt></td>'
+                f'<td width="5%">{hg}.{hb}.{hg * 6 + hb}</td>'
+                f'<td rowspan="2" width="45%"><font size="1">Sat {day:02d}-{month}-{season} 7:25 PM '
+                f'Att: {rng.randint(15000, 90000):,} Venue: <a href="../venues/{rng.randint(1, 99)}.html">'
+                f'{rng.choice(venues)}</a></font></td></tr>'
+                f'<tr><td width="16%"><a href="../teams/{away.lower()}_idx.html">{away}</a></td>'
+                f'<td width="17%"><tt>{rng.randint(1, 6)}.{rng.randint(0, 5)}&nbsp;</tt></td>'
+                f'<td width="5%">{ag}.{ab}.{ag * 6 + ab}</td>'
+                f'<td width="33%">{home} won by {rng.randint(1, 60)} pts '
+                f'[<a href="../stats/games/{season}/{season}{round_number:02d}{i:02d}.html">Match stats</a>]'
+                f'</td></tr></table><br>'
+            )
+    parts.append('</center></body></html>')
+    return ''.join(parts).encode('latin-1')
+
+def synthetic_stats_page(season: int, rng: random.Random) -> bytes:
+    """A game stats page: the score table plus one sortable player table per team"""
+    home, away = 'Richmond', 'Carlton'
+    parts = [
+        '<html><body><center><table style="font: 12px Verdana;" border="1">',
+        f'<tr><td colspan="5">Round: {rng.randint(1, 23)} Venue: <a href="../../venues/mcg.html">M.C.G.</a> '
+        f'Date: Sat, 22-Mar-{season} 7:25 PM Attendance: {rng.randint(20000, 95000)}</td></tr>'
+    ]
+    for team in (home, away):
+        quarters = ''.join(f'<td>{q}.{q + 1}.{q * 6 + q + 1}</td>' for q in range(2, 6))
+        parts.append(f'<tr><td><a href="../../teams/{team.lower()}_idx.html">{team}</a></td>{quarters}</tr>')
+    parts.append('</table>')
+    for team in (home, away):
+        parts.append(f'<table class="sortable" border="1"><thead><tr><th colspan="25">{team} Match Statistics '
+                     f'[<a href="#">Game by game</a>]</th></tr></thead><tbody>')
+        for number in range(1, 23):
+            stats = ''.join(f'<td>{rng.choice(["&nbsp;", rng.randint(0, 30)])}</td>' for _ in range(23))
+            parts.append(f'<tr><td>{number}</td><td align="left"><a href="../../players/{team[0]}/Player_{team}_{number}.html">'
+                         f'Player {team} {number}</a></td>{stats}</tr>')
+        parts.append('</tbody></table><br>')
+    parts.append('</center></body></html>')
+    return ''.join(parts).encode('latin-1')
+
+def parse(backend, page):
+    kind, season, _, content = page
+    if kind == 'season':
+        return backend.parse_season_page(content, season)
+    if kind == 'backfill':
+        return backend.parse_season_games(content, season, DEFAULT_BASE_URL)
+    return backend.parse_game_stats(content)
+
+def time_it(fn, repeats: int):
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark afltables parser backends')
+    parser.add_argument('--cache-dir', default=None,
+                       help='HTTP cache directory to read saved pages from (scraper_cache_dir)')
+    parser.add_argument('--pages-dir', default=None,
+                       help='Directory of saved season/stats .html pages')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Timed runs per page and backend (default: 5)')
+    parser.add_argument('--show-mismatch', action='store_true',
+                       help='Print both outputs for the first mismatching page')
+
+    args = parser.parse_args()
+
+    pages = []
+    if args.cache_dir:
+        pages.extend(pages_from_cache(args.cache_dir))
+    if args.pages_dir:
+        pages.extend(pages_from_dir(args.pages_dir))
+    if not pages:
+        print("No saved pages given, using synthetic afltables pages")
+        rng = random.Random(42)
+        pages = [('season', 2024, 'synthetic seas/2024.html', synthetic_season_page(2024, rng))]
+        pages += [('stats', 2024, f'synthetic stats/games/2024/{i}.html', synthetic_stats_page(2024, rng))
+                  for i in range(5)]
+    pages += [('backfill', season, f"{name} (backfill)", content)
+              for kind, season, name, content in pages if kind == 'season']
+
+    reference = get_parser('soup')
+    backends = [get_parser(name) for name in PARSER_BACKENDS if name != reference.name]
+
+    totals = {name: {kind: [] for kind in PAGE_KINDS} for name in [reference.name] + [backend.name for backend in backends]}
+    all_match = True
+    shown = False
+
+    for page in pages:
+        kind, _, name, _ = page
+        expected, reference_ms = time_it(lambda: parse(reference, page), args.repeats)
+        totals[reference.name][kind].append(reference_ms)
+        line = f"{name[-40:]:>40}: {reference.name} {reference_ms:8.2f} ms"
+        for backend in backends:
+            result, backend_ms = time_it(lambda: parse(backend, page), args.repeats)
+            totals[backend.name][kind].append(backend_ms)
+            match = result == expected
+            all_match = all_match and match
+            line += f" | {backend.name} {backend_ms:8.2f} ms ({reference_ms / backend_ms:4.1f}x, match: {match})"
+            if not match and args.show_mismatch and not shown:
+                shown = True
+                print(json.dumps({'expected': expected, 'actual': result}, default=str, indent=2)[:5000])
+        print(line)
+
+    print("\n📊 Median per page:")
+    for kind in PAGE_KINDS:
+        if not totals[reference.name][kind]:
+            continue
+        reference_ms = statistics.median(totals[reference.name][kind])
+        summary = f"  {kind:>8} pages ({len(totals[reference.name][kind])}): {reference.name} {reference_ms:.2f} ms"
+        for backend in backends:
+            backend_ms = statistics.median(totals[backend.name][kind])
+            summary += f" | {backend.name} {backend_ms:.2f} ms ({reference_ms / backend_ms:.1f}x faster)"
+        print(summary)
+
+    print(f"{'✅' if all_match else '❌'} Outputs identical across backends: {all_match}")
+    return all_match
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark /analytics/team-performance: per-team Python tallies vs the
+single grouped SQL query in AnalyticsService.
+
+Seeds a throwaway database with several seasons of synthetic results,
+runs both implementations, checks they agree and prints timings.
+"""
+
+import sys
+import os
+import time
+import random
+import statistics
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.game import Game
+from app.models.team import Team
+from app.services.analytics_service import AnalyticsService
+import argparse
+
+def seed(db, seasons: int, teams: int = 18, rounds: int = 23, seed_value: int = 42):
+    """Insert teams and a full fixture of finished games per season"""
+    rng = random.Random(seed_value)
+    team_rows = [Team(name=f"Team {i + 1}", abbreviation=f"T{i + 1}") for i in range(teams)]
+    db.add_all(team_rows)
+    db.flush()
+    
+    strength = {team.id: rng.gauss(0, 12) for team in team_rows}
+    games = []
+    for season in range(2025 - seasons + 1, 2026):
+        for round_number in range(1, rounds + 1):
+            ids = [team.id for team in team_rows]
+            rng.shuffle(ids)
+            for i in range(0, len(ids) - 1, 2):
+                home_id, away_id = ids[i], ids[i + 1]
+                margin = strength[home_id] - strength[away_id] + 6 + rng.gauss(0, 30)
+                games.append(Game(
+                    season=season,
+                    round_number=round_number,
+                    home_team_id=home_id,
+                    away_team_id=away_id,
+                    home_score=max(20, int(85 + margin / 2)),
+                    away_score=max(20, int(85 - margin / 2)),
+                    game_date=datetime(season, 3, 14) + timedelta(days=7 * round_number),
+                    is_finished=True
+                ))
+    db.add_all(games)
+    db.commit()
+    return len(games)
+
+def legacy_team_performance(db, season=None, limit=18):
+    """The previous implementation: one query per team, tallied in Python"""
+    query = db.query(Team).join(Game, or_(Game.home_team_id == Team.id, Game.away_team_id == Team.id))
+    if season:
+        query = query.filter(Game.season == season)
+    teams = query.distinct().all()
+    
+    results = []
+    for team in teams:
+        team_games = db.query(Game).filter(
+            or_(Game.home_team_id == team.id, Game.away_team_id == team.id),
+            Game.is_finished == True
+        )
+        if season:
+            team_games = team_games.filter(Game.season == season)
+        team_games = team_games.all()
+        if not team_games:
+            continue
+        
+        wins = losses = draws = score_for = score_against = 0
+        for game in team_games:
+            is_home = game.home_team_id == team.id
+            team_score = game.home_score if is_home else game.away_score
+            opponent_score = game.away_score if is_home else game.home_score
+            score_for += team_score
+            score_against += opponent_score
+            if team_score > opponent_score:
+                wins += 1
+            elif team_score < opponent_score:
+                losses += 1
+            else:
+                draws += 1
+        
+        total = len(team_games)
+        results.append({
+            'team_name': team.name,
+            'total_games': total,
+            'wins': wins,
+            'losses': losses,
+            'draws': draws,
+            'win_percentage': wins / total * 100,
+            'avg_score_for': score_for / total,
+            'avg_score_against': score_against / total
+        })
+    
+    results.sort(key=lambda x: (-x['win_percentage'], x['team_name']))
+    return results[:limit]
+
+def time_it(fn, repeats: int):
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+def same_results(a, b) -> bool:
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        for key in x:
+            if isinstance(x[key], float):
+                if abs(x[key] - y[key]) > 1e-6:
+                    return False
+            elif x[key] != y[key]:
+                return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark team performance aggregation')
+    parser.add_argument('--seasons', type=int, default=10,
+                       help='Seasons of synthetic games to seed (default: 10)')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Timed runs per implementation (default: 5)')
+    parser.add_argument('--database-url', default='sqlite:///:memory:',
+                       help='Empty database to seed (default: in-memory SQLite)')
+    
+    args = parser.parse_args()
+    
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine, tables=[Team.__table__, Game.__table__])
+    db = sessionmaker(bind=engine)()
+    
+    try:
+        games = seed(db, args.seasons)
+        print(f"Seeded {games} games over {args.seasons} seasons")
+        
+        service = AnalyticsService()
+        latest = 2025
+        scenarios = [("all seasons", None), (f"season {latest}", latest)]
+        
+        all_match = True
+        for label, season in scenarios:
+            legacy, legacy_ms = time_it(lambda: legacy_team_performance(db, season), args.repeats)
+            grouped, grouped_ms = time_it(lambda: service.team_performance(db, season=season), args.repeats)
+            match = same_results(legacy, grouped)
+            all_match = all_match and match
+            print(f"{label:>14}: legacy {legacy_ms:8.2f} ms | grouped {grouped_ms:8.2f} ms | "
+                  f"speedup {legacy_ms / grouped_ms:5.1f}x | results match: {match}")
+        
+        return all_match
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
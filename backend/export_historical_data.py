@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Historical AFL data export
+
+Streams games and player game stats from the database into season-partitioned
+NDJSON (and Parquet, with pyarrow installed) files under settings.export_dir.
+The predictor reads the latest games partition in place of the old
+hand-written afl_*_games_with_stats_*.json snapshots.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.services.export_service import ExportService, DATASETS, EXPORT_FORMATS
+import argparse
+import logging
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description='Export historical AFL data')
+    parser.add_argument('--dataset', choices=[*DATASETS, 'all'], default='all',
+                       help='Dataset to export (default: all)')
+    parser.add_argument('--seasons', type=int, nargs='+', default=None,
+                       help='Only export these seasons (default: every season)')
+    parser.add_argument('--format', dest='formats', choices=EXPORT_FORMATS, nargs='+', default=['ndjson'],
+                       help='Output formats (default: ndjson)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                       help='Export directory (default: settings.export_dir)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help='Rows fetched per cursor chunk (default: settings.export_chunk_size)')
+
+    args = parser.parse_args()
+
+    print("🏈 AFL Historical Data Export")
+    print("=" * 50)
+
+    exporter = ExportService(export_dir=args.output_dir, chunk_size=args.chunk_size)
+    datasets = list(DATASETS) if args.dataset == 'all' else [args.dataset]
+
+    db = SessionLocal()
+    try:
+        success = True
+        for dataset in datasets:
+            print(f"\n📦 Exporting {dataset} ({', '.join(args.formats)})...")
+            start_time = time.time()
+            result = exporter.export(db, dataset, seasons=args.seasons, formats=args.formats)
+
+            if not result['success']:
+                print(f"❌ {result['error']}")
+                success = False
+                continue
+
+            for season, rows in result['partitions'].items():
+                print(f"  📅 {season}: {rows:,} rows")
+            print(f"✅ {result['rows']:,} rows in {len(result['partitions'])} partitions "
+                  f"({time.time() - start_time:.1f}s) -> {result['output_dir']}")
+
+        return success
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
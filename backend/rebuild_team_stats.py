@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rebuild the team_season_stats table from the games table.
+
+Use after a historical backfill or any bulk change to game results;
+day-to-day updates happen incrementally as results are ingested.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.services.team_stats_service import TeamStatsService
+import argparse
+import logging
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild team season stats')
+    parser.add_argument('--season', type=int, default=None,
+                       help='Only rebuild this season (default: all seasons)')
+    
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        result = TeamStatsService().rebuild(db, season=args.season)
+    finally:
+        db.close()
+    
+    if not result['success']:
+        print(f"❌ Rebuild failed: {result['error']}")
+        return False
+    
+    scope = f"season {args.season}" if args.season else "all seasons"
+    print(f"✅ Rebuilt {result['rows']} team season rows from {result['games_processed']} games ({scope})")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
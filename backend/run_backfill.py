@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Resumable AFL backfill worker
+
+Queues and runs checkpointed multi-season backfills (see BackfillService).
+Run it as a one-off job for a season range, to resume a job by id, or as a
+long-lived worker that picks up jobs queued through the API.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.scrapers.afl_scraper import AFLScraper
+from app.scrapers.constants import USER_AGENT
+from app.scrapers.fetcher import ConcurrentFetcher
+from app.services.backfill_service import backfill_service
+import argparse
+import logging
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def print_job(job):
+    print(f"  #{job['id']} {job['start_season']}-{job['end_season']}: {job['status']} "
+          f"{job['units_done']}/{job['units_total']} units ({job['percent_complete']}%), "
+          f"{job['units_failed']} failed")
+    if job.get('error'):
+        print(f"     {job['error']}")
+
+def run(job_id, scraper):
+    print(f"🚀 Running backfill job {job_id}...")
+    result = backfill_service.run_job(job_id, scraper)
+    if 'job' not in result:
+        print(f"❌ {result['error']}")
+        return False
+    print_job(result['job'])
+    print("✅ Backfill complete!" if result['success'] else "⚠️  Backfill did not complete; resume to continue")
+    return result['success']
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumable AFL backfill')
+    parser.add_argument('--start-season', type=int, default=None,
+                       help='Queue and run a new job starting at this season')
+    parser.add_argument('--end-season', type=int, default=None,
+                       help='Last season of the new job (default: start season)')
+    parser.add_argument('--job-id', type=int, default=None,
+                       help='Resume an existing job from its last checkpoint')
+    parser.add_argument('--worker', action='store_true',
+                       help='Keep running queued and stalled jobs')
+    parser.add_argument('--poll-seconds', type=int, default=30,
+                       help='Worker polling interval (default: 30)')
+    parser.add_argument('--list', action='store_true',
+                       help='List recent jobs and exit')
+    parser.add_argument('--base-url', type=str, default=None,
+                       help='afltables base URL (default: https://afltables.com/afl)')
+    parser.add_argument('--cache-mode', choices=['default', 'replay', 'refresh'], default=None,
+                       help='HTTP cache mode; "replay" runs fully offline from cached pages')
+
+    args = parser.parse_args()
+
+    print("🏈 AFL Backfill Worker")
+    print("=" * 50)
+
+    db = SessionLocal()
+    try:
+        if args.list:
+            for job in backfill_service.list_jobs(db):
+                print_job(job)
+            return True
+
+        scraper = AFLScraper(
+            base_url=args.base_url,
+            fetcher=ConcurrentFetcher(user_agent=USER_AGENT, cache_mode=args.cache_mode)
+        )
+
+        if args.start_season:
+            job = backfill_service.create_job(db, args.start_season, args.end_season or args.start_season)
+            return run(job.id, scraper)
+
+        if args.job_id:
+            result = backfill_service.requeue_job(db, args.job_id)
+            if not result['success']:
+                print(f"❌ {result['error']}")
+                return False
+            return run(args.job_id, scraper)
+
+        if args.worker:
+            print(f"👷 Waiting for backfill jobs (polling every {args.poll_seconds}s)...")
+            while True:
+                job_ids = backfill_service.claimable_jobs(db)
+                db.commit()  # Don't hold a read transaction while idle
+                for job_id in job_ids:
+                    run(job_id, scraper)
+                time.sleep(args.poll_seconds)
+
+        parser.print_help()
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -11,6 +11,8 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.scrapers.afl_scraper import AFLScraper
+from app.scrapers.constants import USER_AGENT
+from app.scrapers.fetcher import ConcurrentFetcher
 from app.core.database import SessionLocal, engine
 from app.models.game import Game
 from app.models.player import Player, PlayerGameStats
@@ -34,15 +36,30 @@ def main():
                        help='Run without saving to database')
     parser.add_argument('--test-only', action='store_true',
                        help='Test with just one round of current year')
+    parser.add_argument('--base-url', type=str, default=None,
+                       help='afltables base URL, e.g. a local fixture server (default: https://afltables.com/afl)')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                       help='Concurrent page requests (default: scraper_max_in_flight setting)')
+    parser.add_argument('--requests-per-second', type=float, default=None,
+                       help='Global request rate limit (default: scraper_requests_per_second setting)')
+    parser.add_argument('--cache-mode', choices=['default', 'replay', 'refresh'], default=None,
+                       help='HTTP cache mode; "replay" runs fully offline from cached pages')
     
     args = parser.parse_args()
     
     print("🏈 AFL Comprehensive Scraping Tool")
     print("=" * 50)
     
+    fetcher = ConcurrentFetcher(
+        max_in_flight=args.max_in_flight,
+        requests_per_second=args.requests_per_second,
+        user_agent=USER_AGENT,
+        cache_mode=args.cache_mode
+    )
+    
     if args.test_only:
         print("🧪 Running test mode (one round of current year)...")
-        scraper = AFLScraper()
+        scraper = AFLScraper(base_url=args.base_url, fetcher=fetcher)
         result = scraper.test_small_scrape(season=2024, rounds=1)
         
         if result['success']:
@@ -78,7 +95,7 @@ def main():
         return False
     
     # Run comprehensive scraping
-    scraper = AFLScraper()
+    scraper = AFLScraper(base_url=args.base_url, fetcher=fetcher)
     
     save_to_db = not args.dry_run
     if args.dry_run:
@@ -6,7 +6,6 @@ Production script to scrape 5 years of AFL data (2020-2025) and save to database
 import sys
 import os
 import time
-import re
 from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -14,9 +13,19 @@ from app.scrapers.afl_scraper import AFLScraper
 from app.core.database import SessionLocal, engine
 from app.models.game import Game
 from app.models.team import Team
-from app.models.player import Player, PlayerGameStats
+from app.core.config import settings
+from app.services.ingestion_service import ingestion_service
+from app.services.team_alias_service import canonical_team_name, team_alias_index
+from app.services.team_stats_service import team_stats_service
 from sqlalchemy.orm import sessionmaker
 
+def ingest_player_stats(db, batch):
+    """Bulk write a batch of (game id, stats result) pairs; returns (players created, stats rows)"""
+    result = ingestion_service.ingest_player_stats(db, batch)
+    if not result['success']:
+        raise Exception(result['error'])
+    return result['players_created'], result['player_stats_written']
+
 def scrape_afl_data_to_database():
     """Scrape last 5 years (2020-2025) and save to database in AI-friendly format"""
     print("🏈 AFL Data Collection - Production Run")
@@ -84,17 +93,19 @@ def scrape_afl_data_to_database():
             for game in completed_games:
                 for team_name in [game['home_team'], game['away_team']]:
                     if team_name not in teams_cache:
-                        team = db.query(Team).filter(Team.name == team_name).first()
+                        team = team_alias_index.get_team(db, team_name)
                         if not team:
-                            team = Team(name=team_name)
+                            team = Team(name=canonical_team_name(team_name) or team_name)
                             db.add(team)
                             db.flush()  # Get the ID
+                            team_alias_index.add_on_commit(db, team)
                             total_teams_saved += 1
-                            print(f"    🏆 Created new team: {team_name}")
+                            print(f"    🏆 Created new team: {team.name}")
                         teams_cache[team_name] = team
             
             # Save games and fetch player stats
             games_with_stats = 0
+            stats_jobs = {}
             for i, game_data in enumerate(completed_games):
                 if i % 10 == 0:  # Progress update every 10 games
                     print(f"  📝 Processing game {i+1}/{len(completed_games)}: {game_data['home_team']} vs {game_data['away_team']}")
@@ -110,11 +121,13 @@ def scrape_afl_data_to_database():
                 if existing_game:
                     # Update existing game
                     game_record = existing_game
+                    was_finished = bool(game_record.is_finished)
                     game_record.home_score = game_data['home_score']
                     game_record.away_score = game_data['away_score']
                     game_record.venue = game_data.get('venue')
                     game_record.game_date = game_data.get('game_date')
                     game_record.is_finished = True
+                    team_stats_service.record_result(db, game_record, was_finished)
                 else:
                     # Create new game
                     game_record = Game(
@@ -130,75 +143,33 @@ def scrape_afl_data_to_database():
                     )
                     db.add(game_record)
                     db.flush()  # Get the ID
+                    team_stats_service.record_result(db, game_record)
                     total_games_saved += 1
                 
-                # Fetch player statistics if available
-                if game_data.get('stats_link'):
-                    stats_link = game_data['stats_link']
-                    if '/stats/games/' in stats_link:
-                        game_id_match = re.search(r'/stats/games/\d+/(\d+)\.html', stats_link)
-                        if game_id_match:
-                            game_id = game_id_match.group(1)
-                            
-                            # Fetch player statistics
-                            stats_result = scraper.parse_game_stats(game_id, season)
-                            if stats_result['success']:
-                                games_with_stats += 1
-                                
-                                # Save player statistics
-                                for team_name, players in stats_result['player_stats'].items():
-                                    team_record = teams_cache[team_name]
-                                    
-                                    for player_data in players:
-                                        # Get or create player
-                                        player_name = player_data['name']
-                                        player = db.query(Player).filter(Player.name == player_name).first()
-                                        
-                                        if not player:
-                                            player = Player(
-                                                name=player_name,
-                                                current_team_id=team_record.id
-                                            )
-                                            db.add(player)
-                                            db.flush()
-                                            total_players_saved += 1
-                                        
-                                        # Create player game stats
-                                        stats = player_data['stats']
-                                        
-                                        # Check if stats already exist for this player in this game
-                                        existing_stats = db.query(PlayerGameStats).filter(
-                                            PlayerGameStats.game_id == game_record.id,
-                                            PlayerGameStats.player_id == player.id
-                                        ).first()
-                                        
-                                        if not existing_stats:
-                                            player_stats = PlayerGameStats(
-                                                game_id=game_record.id,
-                                                player_id=player.id,
-                                                team_id=team_record.id,
-                                                goals=stats.get('goals', 0),
-                                                behinds=stats.get('behinds', 0),
-                                                kicks=stats.get('kicks', 0),
-                                                handballs=stats.get('handballs', 0),
-                                                marks=stats.get('marks', 0),
-                                                tackles=stats.get('tackles', 0),
-                                                hitouts=stats.get('hit_outs', 0),
-                                                frees_for=stats.get('free_kicks_for', 0),
-                                                frees_against=stats.get('free_kicks_against', 0),
-                                                disposals=stats.get('disposals', 0),
-                                                contested_possessions=stats.get('contested_possessions', 0),
-                                                uncontested_possessions=stats.get('uncontested_possessions', 0),
-                                                inside_50s=stats.get('inside_50s', 0),
-                                                rebound_50s=stats.get('rebound_50s', 0),
-                                                clearances=stats.get('clearances', 0),
-                                                clangers=stats.get('clangers', 0)
-                                            )
-                                            db.add(player_stats)
-                                            total_player_stats_saved += 1
-                
-                # Add a small delay to be respectful to the server
-                time.sleep(0.3)
+                # Queue player statistics pages for the concurrent fetch below
+                stats_id = scraper.stats_game_id(game_data)
+                if stats_id:
+                    stats_jobs[stats_id] = game_record.id
+            
+            # Games are committed before the stats pages are fetched
+            db.commit()
+            
+            # Fetch player statistics concurrently; results arrive as each page is parsed
+            # and are written in bulk, one commit per batch of games
+            batch = []
+            for game_id, stats_result in scraper.fetch_game_stats(season, list(stats_jobs)):
+                if stats_result['success']:
+                    games_with_stats += 1
+                    batch.append((stats_jobs[game_id], stats_result))
+                if len(batch) >= settings.ingest_batch_games:
+                    players_saved, stats_saved = ingest_player_stats(db, batch)
+                    total_players_saved += players_saved
+                    total_player_stats_saved += stats_saved
+                    batch = []
+            if batch:
+                players_saved, stats_saved = ingest_player_stats(db, batch)
+                total_players_saved += players_saved
+                total_player_stats_saved += stats_saved
             
             season_time = time.time() - season_start_time
             print(f"  ⏱️  {season} season completed in {season_time:.2f} seconds")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Regression check: the games and predictions endpoints issue a constant
+number of SQL statements per request, whatever the page size.
+
+Seeds a throwaway database with teams, games and predictions, calls each
+list and detail endpoint at limit=5 and limit=100 while counting
+before_cursor_execute events, and fails if the counts differ.
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.game import Game
+from app.models.prediction import Prediction
+from app.models.team import Team
+from app.api.routes import games, predictions
+import argparse
+
+def seed(db, count: int = 150):
+    """Teams plus upcoming games, each with a prediction (every tenth without a winner)"""
+    teams = [Team(name=f"Team {i + 1}", abbreviation=f"T{i + 1}") for i in range(18)]
+    db.add_all(teams)
+    db.flush()
+
+    now = datetime.now()
+    game_rows = []
+    for i in range(count):
+        game_rows.append(Game(
+            season=now.year,
+            round_number=i // 9 + 1,
+            game_number=i + 1,
+            home_team_id=teams[(2 * i) % 18].id,
+            away_team_id=teams[(2 * i + 1) % 18].id,
+            venue="MCG",
+            game_date=now + timedelta(hours=i + 1),
+            is_finished=False
+        ))
+    db.add_all(game_rows)
+    db.flush()
+
+    for i, game in enumerate(game_rows):
+        db.add(Prediction(
+            game_id=game.id,
+            predicted_winner_id=None if i % 10 == 0 else game.home_team_id,
+            confidence_score=0.6,
+            predicted_home_score=85,
+            predicted_away_score=75,
+            reasoning="Seeded",
+            factors_considered="form,venue",
+            recommended_bet="home",
+            bet_confidence=0.5,
+            model_version="check",
+            prediction_date=now
+        ))
+    db.commit()
+    return game_rows[0].id
+
+def count_statements(engine, call) -> int:
+    """Statements executed while awaiting one route coroutine"""
+    executed = []
+    listener = lambda *args: executed.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        asyncio.run(call())
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(executed)
+
+def main():
+    parser = argparse.ArgumentParser(description='Check per-request query counts of the games and predictions endpoints')
+    parser.add_argument('--database-url', default='sqlite:///:memory:',
+                       help='Empty database to seed (default: in-memory SQLite)')
+
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    try:
+        game_id = seed(db)
+        prediction_id = db.query(Prediction.id).filter(Prediction.game_id == game_id).scalar()
+
+        checks = [
+            ("GET /games", lambda limit: games.get_games(
+                season=None, round_number=None, upcoming=False, limit=limit, db=db)),
+            ("GET /games?upcoming", lambda limit: games.get_games(
+                season=None, round_number=None, upcoming=True, limit=limit, db=db)),
+            ("GET /games/upcoming", lambda limit: games.get_upcoming_games(days=limit, db=db)),
+            ("GET /games/{id}", lambda limit: games.get_game(game_id=game_id, db=db)),
+            ("GET /predictions", lambda limit: predictions.get_predictions(
+                game_id=None, season=None, limit=limit, db=db)),
+            ("GET /predictions/upcoming", lambda limit: predictions.get_upcoming_predictions(days=limit, db=db)),
+            ("GET /predictions/{id}", lambda limit: predictions.get_prediction(prediction_id=prediction_id, db=db)),
+        ]
+
+        all_constant = True
+        for label, route in checks:
+            small = count_statements(engine, lambda: route(5))
+            large = count_statements(engine, lambda: route(100))
+            constant = small == large
+            all_constant = all_constant and constant
+            status = "✅" if constant else "❌"
+            print(f"{status} {label:<26} limit=5: {small} queries | limit=100: {large} queries")
+
+        if all_constant:
+            print("✅ Query count is independent of page size")
+        else:
+            print("❌ Query count grows with page size")
+        return all_constant
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)